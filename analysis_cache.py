@@ -0,0 +1,284 @@
+"""
+Strat de analiză memorizat pentru dashboard
+
+Fiecare mișcare a unui slider din sidebar rulează din nou tot scriptul Streamlit.
+Funcțiile de aici normalizează parametrii din sidebar într-o cheie hashable și păstrează
+rezultatele într-un cache LRU limitat, astfel încât pozițiile deja vizitate ale slider-elor
+se returnează instant.
+"""
+import copy
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from calculations import (
+    get_scenario_analysis,
+    compare_scenarios,
+    calculate_campaign_scale,
+    get_financial_forecast_summary
+)
+from competitor_analysis import get_social_media_summary
+from social_metrics import get_social_metrics_version
+from simulation import simulate_all_scenarios, simulation_config, DEFAULT_TRIALS
+from population import raster_cache_key
+
+
+# Numărul maxim de combinații de parametri păstrate în cache (eviction LRU)
+ANALYSIS_CACHE_SIZE = 256
+
+# Precizia folosită la normalizarea valorilor (evită chei diferite pentru 0.1 vs 0.1000000001)
+KEY_PRECISION = 9
+
+
+def normalize_distribution(subscription_distribution: Dict[str, float]) -> Tuple[Tuple[str, float], ...]:
+    """
+    Transformă distribuția serviciilor într-un tuplu hashable, păstrând ordinea cheilor
+    """
+    return tuple(
+        (sub_type, round(float(pct), KEY_PRECISION))
+        for sub_type, pct in subscription_distribution.items()
+    )
+
+
+def _normalize_rate(value: float) -> float:
+    return round(float(value), KEY_PRECISION)
+
+
+def _normalize_raster(population_raster: Optional[str]) -> Optional[Tuple[str, int, int]]:
+    # Cheia include data modificării, deci un raster actualizat nu returnează rezultate vechi
+    return raster_cache_key(population_raster) if population_raster else None
+
+
+@lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+def _scenario_analysis(
+    scenario: str,
+    distribution_key: Tuple[Tuple[str, float], ...],
+    participation_rate: float,
+    population_density: float,
+    conversion_rate: float,
+    coverage_rate: float,
+    raster_key: Optional[Tuple[str, int, int]] = None
+) -> Dict:
+    return get_scenario_analysis(
+        scenario,
+        dict(distribution_key),
+        participation_rate,
+        population_density,
+        conversion_rate,
+        coverage_rate,
+        raster_key[0] if raster_key else None
+    )
+
+
+@lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+def _compare_scenarios(
+    distribution_key: Tuple[Tuple[str, float], ...],
+    participation_rate: float,
+    population_density: float,
+    conversion_rate: float,
+    coverage_rate: float,
+    raster_key: Optional[Tuple[str, int, int]] = None
+) -> pd.DataFrame:
+    return compare_scenarios(
+        dict(distribution_key),
+        participation_rate,
+        population_density,
+        conversion_rate,
+        coverage_rate,
+        raster_key[0] if raster_key else None
+    )
+
+
+@lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+def _simulation_bands(
+    distribution_key: Tuple[Tuple[str, float], ...],
+    participation_rate: float,
+    population_density: float,
+    conversion_rate: float,
+    coverage_rate: float,
+    trials: int,
+    seed: int,
+    raster_key: Optional[Tuple[str, int, int]] = None
+) -> pd.DataFrame:
+    config = simulation_config(participation_rate, population_density, conversion_rate, coverage_rate)
+    population_raster = raster_key[0] if raster_key else None
+    return simulate_all_scenarios(dict(distribution_key), config, trials, seed, population_raster=population_raster)
+
+
+@lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+def _campaign_scale(
+    total_clients_needed: int,
+    participation_rate: float,
+    population_density: float,
+    conversion_rate: float,
+    coverage_rate: float,
+    raster_key: Optional[Tuple[str, int, int]] = None
+) -> Dict:
+    return calculate_campaign_scale(
+        total_clients_needed,
+        participation_rate,
+        population_density,
+        conversion_rate,
+        coverage_rate,
+        population_raster=raster_key[0] if raster_key else None
+    )
+
+
+@lru_cache(maxsize=1)
+def _financial_forecast_summary() -> Dict:
+    return get_financial_forecast_summary()
+
+
+@lru_cache(maxsize=1)
+def _social_media_summary(metrics_version: Tuple) -> Dict:
+    return get_social_media_summary()
+
+
+def cached_scenario_analysis(
+    scenario: str,
+    subscription_distribution: Dict[str, float],
+    participation_rate: float = 0.10,
+    population_density: float = 1000,
+    conversion_rate: float = 0.05,
+    coverage_rate: float = 0.50,
+    population_raster: Optional[str] = None
+) -> Dict:
+    """
+    Variantă memorizată a `get_scenario_analysis`
+
+    Returnează o copie, ca modificările făcute de apelant să nu altereze intrarea din cache.
+    """
+    result = _scenario_analysis(
+        scenario,
+        normalize_distribution(subscription_distribution),
+        _normalize_rate(participation_rate),
+        _normalize_rate(population_density),
+        _normalize_rate(conversion_rate),
+        _normalize_rate(coverage_rate),
+        _normalize_raster(population_raster)
+    )
+    return copy.deepcopy(result)
+
+
+def cached_compare_scenarios(
+    subscription_distribution: Dict[str, float],
+    participation_rate: float = 0.10,
+    population_density: float = 1000,
+    conversion_rate: float = 0.05,
+    coverage_rate: float = 0.50,
+    population_raster: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Variantă memorizată a `compare_scenarios`
+    """
+    result = _compare_scenarios(
+        normalize_distribution(subscription_distribution),
+        _normalize_rate(participation_rate),
+        _normalize_rate(population_density),
+        _normalize_rate(conversion_rate),
+        _normalize_rate(coverage_rate),
+        _normalize_raster(population_raster)
+    )
+    return result.copy()
+
+
+def cached_campaign_scale(
+    total_clients_needed: int,
+    participation_rate: float = 0.10,
+    population_density: float = 1000,
+    conversion_rate: float = 0.05,
+    coverage_rate: float = 0.50,
+    population_raster: Optional[str] = None
+) -> Dict:
+    """
+    Variantă memorizată a `calculate_campaign_scale`
+    """
+    return dict(_campaign_scale(
+        int(total_clients_needed),
+        _normalize_rate(participation_rate),
+        _normalize_rate(population_density),
+        _normalize_rate(conversion_rate),
+        _normalize_rate(coverage_rate),
+        _normalize_raster(population_raster)
+    ))
+
+
+def cached_simulation_bands(
+    subscription_distribution: Dict[str, float],
+    participation_rate: float = 0.10,
+    population_density: float = 1000,
+    conversion_rate: float = 0.05,
+    coverage_rate: float = 0.50,
+    trials: int = DEFAULT_TRIALS,
+    seed: int = 42,
+    population_raster: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Benzile Monte Carlo (P5/P50/P95) pentru toate scenariile, memorizate pe parametrii din sidebar
+    
+    Seed-ul fix face rezultatul determinist, deci poate fi reutilizat din cache.
+    """
+    result = _simulation_bands(
+        normalize_distribution(subscription_distribution),
+        _normalize_rate(participation_rate),
+        _normalize_rate(population_density),
+        _normalize_rate(conversion_rate),
+        _normalize_rate(coverage_rate),
+        int(trials),
+        int(seed),
+        _normalize_raster(population_raster)
+    )
+    return result.copy()
+
+
+def cached_financial_forecast_summary() -> Dict:
+    """
+    Variantă memorizată a `get_financial_forecast_summary` (nu depinde de sidebar)
+    """
+    return copy.deepcopy(_financial_forecast_summary())
+
+
+def cached_social_media_summary() -> Dict:
+    """
+    Variantă memorizată a `get_social_media_summary` (nu depinde de sidebar)
+
+    Cheia include versiunea datelor concurenților și dimensiunea fișierului de snapshot-uri, deci
+    o modificare a datelor sau un snapshot nou invalidează rezultatul.
+    """
+    return copy.deepcopy(_social_media_summary(get_social_metrics_version()))
+
+
+def clear_analysis_cache() -> None:
+    """
+    Golește toate cache-urile (ex: după modificarea constantelor din calculations)
+    """
+    _scenario_analysis.cache_clear()
+    _compare_scenarios.cache_clear()
+    _campaign_scale.cache_clear()
+    _simulation_bands.cache_clear()
+    _financial_forecast_summary.cache_clear()
+    _social_media_summary.cache_clear()
+
+
+def get_analysis_cache_info() -> Dict[str, Dict[str, int]]:
+    """
+    Returnează statisticile de utilizare ale cache-urilor (hits, misses, dimensiune)
+    """
+    caches = {
+        'scenario_analysis': _scenario_analysis,
+        'compare_scenarios': _compare_scenarios,
+        'campaign_scale': _campaign_scale,
+        'simulation_bands': _simulation_bands,
+        'financial_forecast_summary': _financial_forecast_summary,
+        'social_media_summary': _social_media_summary
+    }
+    return {
+        name: {
+            'hits': func.cache_info().hits,
+            'misses': func.cache_info().misses,
+            'size': func.cache_info().currsize,
+            'max_size': func.cache_info().maxsize
+        }
+        for name, func in caches.items()
+    }
@@ -0,0 +1,332 @@
+"""
+Serviciu HTTP local (JSON) peste motorul de calcul
+
+Alte aplicații (sistemul de rezervări, planificatorul de marketing) pot cere veniturile,
+clienții și dimensiunea campaniei fără interfața Streamlit. Serverul folosește doar asyncio
+din biblioteca standard; calculele rulează într-un pool de fire de execuție, iar rezultatele
+trec prin cache-urile din analysis_cache.py (aceleași ca în dashboard).
+
+Cererile identice sosite simultan sunt coalescate: doar prima pornește calculul, celelalte
+așteaptă același rezultat.
+
+Utilizare:
+    python api_server.py --port 8765
+
+Endpoint-uri (GET cu parametri în query string sau POST cu corp JSON):
+    GET  /health
+    GET  /api/scenario?scenario=medium&participation_rate=0.1&clase_miscare=50&fitness_access=20
+    GET  /api/compare?population_density=1500
+    GET  /api/campaign?total_clients_needed=433&conversion_rate=0.05
+    GET  /api/financial-forecast
+    GET  /api/stats
+"""
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from analysis_cache import (
+    cached_scenario_analysis,
+    cached_compare_scenarios,
+    cached_campaign_scale,
+    cached_financial_forecast_summary,
+    get_analysis_cache_info,
+    normalize_distribution
+)
+from calculations import OCCUPANCY_SCENARIOS, SUBSCRIPTION_TYPES, DEFAULT_SUBSCRIPTION_DISTRIBUTION
+from population import find_population_raster
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Fire de execuție pentru calcule (NumPy eliberează GIL-ul în operațiile mari)
+COMPUTE_THREADS = 4
+
+MAX_BODY_BYTES = 64 * 1024
+KEEP_ALIVE_SECONDS = 15
+
+RATE_PARAMETERS = {
+    'participation_rate': 0.10,
+    'population_density': 1000.0,
+    'conversion_rate': 0.05,
+    'coverage_rate': 0.50
+}
+
+# Parametrii care sunt fracțiuni (0-1); densitatea populației nu are limită superioară
+FRACTION_PARAMETERS = ('participation_rate', 'conversion_rate', 'coverage_rate')
+
+
+class RequestError(ValueError):
+    """Parametri invalizi într-o cerere (răspuns 400)"""
+
+
+def _json_default(value):
+    # Rezultatele conțin tipuri NumPy (np.int64, np.float64, vectori)
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Tip neserializabil: {type(value).__name__}")
+
+
+def _number(params: Dict, name: str, default: float, maximum: Optional[float] = None) -> float:
+    value = params.get(name, default)
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise RequestError(f"Parametrul '{name}' trebuie să fie numeric")
+    if not np.isfinite(value) or value < 0:
+        raise RequestError(f"Parametrul '{name}' trebuie să fie un număr pozitiv")
+    if maximum is not None and value > maximum:
+        raise RequestError(f"Parametrul '{name}' trebuie să fie cel mult {maximum:g}")
+    return value
+
+
+def parse_parameters(params: Dict) -> Dict:
+    """
+    Normalizează parametrii unei cereri (valori implicite ca în sidebar)
+
+    Distribuția serviciilor vine din 'subscription_distribution' (dict, în corpul JSON) sau din
+    parametri cu cheile din SUBSCRIPTION_TYPES; se normalizează la 1. Rasterul de populație se
+    activează cu use_raster=1 și este doar cel găsit local (find_population_raster), nu o cale
+    primită din cerere.
+    """
+    distribution = params.get('subscription_distribution')
+    if distribution is None:
+        given = {key: params[key] for key in SUBSCRIPTION_TYPES if key in params}
+        distribution = given or DEFAULT_SUBSCRIPTION_DISTRIBUTION
+    if not isinstance(distribution, dict) or set(distribution) - set(SUBSCRIPTION_TYPES):
+        raise RequestError(f"Distribuția serviciilor acceptă doar cheile {list(SUBSCRIPTION_TYPES)}")
+    distribution = {key: _number(distribution, key, 0) for key in distribution}
+    total = sum(distribution.values())
+    if total <= 0:
+        raise RequestError("Distribuția serviciilor trebuie să aibă cel puțin o valoare pozitivă")
+
+    use_raster = str(params.get('use_raster', '0')).lower() in ('1', 'true', 'da')
+    population_raster = find_population_raster() if use_raster else None
+    if use_raster and population_raster is None:
+        raise RequestError("Nu există un raster de populație local")
+
+    return {
+        'subscription_distribution': {key: value / total for key, value in distribution.items()},
+        **{
+            name: _number(params, name, default, maximum=1.0 if name in FRACTION_PARAMETERS else None)
+            for name, default in RATE_PARAMETERS.items()
+        },
+        'population_raster': population_raster
+    }
+
+
+def _rates(parsed: Dict) -> Tuple:
+    return tuple(parsed[name] for name in RATE_PARAMETERS)
+
+
+def _request_key(route: str, parsed: Dict, *extra) -> Tuple:
+    # Cheia de coalescare; rasterul contează doar prin cale (cache-urile verifică și versiunea fișierului)
+    return (route, *extra, normalize_distribution(parsed['subscription_distribution']), _rates(parsed), parsed['population_raster'])
+
+
+def _scenario(params: Dict) -> Tuple[Tuple, Callable, Tuple]:
+    scenario = params.get('scenario', 'medium')
+    if not isinstance(scenario, str) or scenario not in OCCUPANCY_SCENARIOS:
+        raise RequestError(f"Scenariu necunoscut: {scenario} (disponibile: {list(OCCUPANCY_SCENARIOS)})")
+    parsed = parse_parameters(params)
+    args = (scenario, parsed['subscription_distribution'], *_rates(parsed), parsed['population_raster'])
+    return _request_key('scenario', parsed, scenario), cached_scenario_analysis, args
+
+
+def _compare_records(*args) -> list:
+    return cached_compare_scenarios(*args).to_dict(orient='records')
+
+
+def _compare(params: Dict) -> Tuple[Tuple, Callable, Tuple]:
+    parsed = parse_parameters(params)
+    args = (parsed['subscription_distribution'], *_rates(parsed), parsed['population_raster'])
+    return _request_key('compare', parsed), _compare_records, args
+
+
+def _campaign(params: Dict) -> Tuple[Tuple, Callable, Tuple]:
+    if 'total_clients_needed' not in params:
+        raise RequestError("Lipsește parametrul 'total_clients_needed'")
+    total_clients = int(_number(params, 'total_clients_needed', 0))
+    parsed = parse_parameters(params)
+    args = (total_clients, *_rates(parsed), parsed['population_raster'])
+    # Campania nu depinde de distribuția serviciilor
+    return ('campaign', total_clients, _rates(parsed), parsed['population_raster']), cached_campaign_scale, args
+
+
+def _financial_forecast(params: Dict) -> Tuple[Tuple, Callable, Tuple]:
+    return ('financial_forecast',), cached_financial_forecast_summary, ()
+
+
+# Ruta → funcție care transformă parametrii în (cheie de coalescare, calcul, argumente)
+ROUTES = {
+    '/api/scenario': _scenario,
+    '/api/compare': _compare,
+    '/api/campaign': _campaign,
+    '/api/financial-forecast': _financial_forecast
+}
+
+
+def create_state(compute_threads: int = COMPUTE_THREADS) -> Dict:
+    """
+    Starea serverului: pool-ul de calcul, cererile în curs (pentru coalescare) și contoarele
+    """
+    return {
+        'executor': ThreadPoolExecutor(max_workers=compute_threads, thread_name_prefix='api-compute'),
+        'in_flight': {},
+        'started': time.time(),
+        'stats': {'requests': 0, 'computed': 0, 'coalesced': 0, 'errors': 0}
+    }
+
+
+async def coalesce(state: Dict, key: Tuple, func: Callable, args: Tuple):
+    """
+    Rulează `func(*args)` în pool o singură dată per cheie; cererile simultane așteaptă același rezultat
+    """
+    future = state['in_flight'].get(key)
+    if future is None:
+        state['stats']['computed'] += 1
+        future = asyncio.get_running_loop().run_in_executor(state['executor'], func, *args)
+        state['in_flight'][key] = future
+        future.add_done_callback(lambda _: state['in_flight'].pop(key, None))
+    else:
+        state['stats']['coalesced'] += 1
+    # shield: o conexiune închisă nu anulează calculul pentru celelalte cereri
+    return await asyncio.shield(future)
+
+
+async def dispatch(state: Dict, method: str, target: str, body: bytes) -> Tuple[int, Dict]:
+    """
+    Răspunsul (status HTTP, corp JSON) pentru o cerere
+    """
+    url = urlsplit(target)
+    path = url.path.rstrip('/') or '/'
+    if path == '/health':
+        return HTTPStatus.OK, {'status': 'ok', 'uptime_s': round(time.time() - state['started'], 1)}
+    if path == '/api/stats':
+        return HTTPStatus.OK, {**state['stats'], 'in_flight': len(state['in_flight']), 'caches': get_analysis_cache_info()}
+    if path not in ROUTES:
+        return HTTPStatus.NOT_FOUND, {'error': f"Ruta necunoscută: {path}", 'routes': ['/health', '/api/stats', *ROUTES]}
+    if method not in ('GET', 'POST'):
+        return HTTPStatus.METHOD_NOT_ALLOWED, {'error': f"Metoda {method} nu este acceptată"}
+
+    params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+    if body:
+        try:
+            payload = json.loads(body)
+        except json.JSONDecodeError:
+            return HTTPStatus.BAD_REQUEST, {'error': "Corpul cererii nu este JSON valid"}
+        if not isinstance(payload, dict):
+            return HTTPStatus.BAD_REQUEST, {'error': "Corpul cererii trebuie să fie un obiect JSON"}
+        params.update(payload)
+
+    try:
+        key, func, args = ROUTES[path](params)
+    except RequestError as error:
+        return HTTPStatus.BAD_REQUEST, {'error': str(error)}
+    return HTTPStatus.OK, await coalesce(state, key, func, args)
+
+
+def _response(status: int, payload: Dict, keep_alive: bool) -> bytes:
+    body = json.dumps(payload, ensure_ascii=False, default=_json_default).encode('utf-8')
+    head = (
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+        f"Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode('latin-1') + body
+
+
+async def handle_connection(state: Dict, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """
+    Servește cererile HTTP/1.1 de pe o conexiune (cu keep-alive)
+    """
+    try:
+        while True:
+            try:
+                request_line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                break
+            if not request_line.strip():
+                break
+            parts = request_line.decode('latin-1').split()
+            if len(parts) != 3:
+                writer.write(_response(HTTPStatus.BAD_REQUEST, {'error': "Cerere HTTP invalidă"}, False))
+                break
+            method, target, version = parts
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+            try:
+                length = int(headers.get('content-length', 0) or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                writer.write(_response(HTTPStatus.BAD_REQUEST, {'error': "Antetul Content-Length este invalid"}, False))
+                break
+            if length > MAX_BODY_BYTES:
+                writer.write(_response(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': "Corpul cererii este prea mare"}, False))
+                break
+            body = await reader.readexactly(length) if length else b''
+
+            state['stats']['requests'] += 1
+            try:
+                status, payload = await dispatch(state, method, target, body)
+            except Exception as error:  # eroare de calcul: răspuns 500, serverul continuă
+                status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(error)}
+            if status >= 400:
+                state['stats']['errors'] += 1
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, compute_threads: int = COMPUTE_THREADS) -> None:
+    """
+    Pornește serverul și rulează până la oprire (Ctrl+C)
+    """
+    state = create_state(compute_threads)
+    server = await asyncio.start_server(lambda r, w: handle_connection(state, r, w), host, port)
+    print(f"API Mobilis Vita pe http://{host}:{port} (rute: /health, /api/stats, {', '.join(ROUTES)})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        state['executor'].shutdown(wait=False)
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serviciu HTTP JSON peste calculele dashboard-ului Mobilis Vita")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="Adresa (implicit doar local)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--threads', type=int, default=COMPUTE_THREADS, help="Fire de execuție pentru calcule")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.threads))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,12 +8,9 @@ import plotly.graph_objects as go
 import folium
 from folium import plugins
 from streamlit_folium import st_folium
-import math
-import base64
 import os
+import time
 from calculations import (
-    get_scenario_analysis,
-    compare_scenarios,
     OCCUPANCY_SCENARIOS,
     SUBSCRIPTION_TYPES,
     DESIRED_MONTHLY_REVENUE,
@@ -21,8 +18,8 @@ from calculations import (
     COMPETITORS,
     CAPACITY_PER_HOUR,
     COMPETITOR_LOCATIONS,
-    get_financial_forecast_summary,
-    get_financial_forecast_by_space
+    get_financial_forecast_by_space,
+    solve_min_occupancy
 )
 from competitor_analysis import (
     get_competitive_positioning,
@@ -33,12 +30,48 @@ from competitor_analysis import (
     simulate_new_redgym_impact,
     calculate_profitability_comparison,
     COMFORT_THRESHOLDS,
-    get_all_extended_competitors,
     get_competitors_by_category,
     get_all_competitor_locations,
-    get_social_media_summary,
-    get_competitor_detailed_info
+    get_competitor_detailed_info,
+    get_competitors_with_instagram,
+    get_social_media_trends
 )
+from assets import image_data_uri
+from population import find_population_raster
+from export_to_excel import export_analysis_to_bytes
+from capture import get_capture_surface, CAPTURE_BANDS
+from spatial_index import competitors_within, nearest_competitors, competitor_density_per_block, DEFAULT_DENSITY_RADIUS_KM
+from optimizer import optimize_subscription_mix, efficient_frontier
+from sensitivity import sensitivity_analysis, tornado_data
+from geo import (
+    get_participation_blocks,
+    blocks_to_records,
+    blocks_to_geojson,
+    DEFAULT_BLOCK_SIZE_KM,
+    DEFAULT_GRID_SIZE
+)
+from analysis_cache import (
+    cached_scenario_analysis,
+    cached_compare_scenarios,
+    cached_simulation_bands,
+    cached_financial_forecast_summary,
+    cached_social_media_summary
+)
+from render_timing import (
+    configure_logging,
+    new_timing_store,
+    start_run,
+    record_timing,
+    timed,
+    timed_function,
+    untimed_functions,
+    timing_summary,
+    TIMINGS_KEY
+)
+
+# Lățimi de afișare pentru imaginile mari (variantele sunt redimensionate la aceste valori)
+HEADER_IMAGE_WIDTH = 1400
+TOC_BACKGROUND_WIDTH = 900
 
 # Configurare pagină
 st.set_page_config(
@@ -48,31 +81,75 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Cronometrarea randării: timpii se păstrează în sesiune, cu percentile pe ultimele rerun-uri
+configure_logging()
+render_timings = st.session_state.setdefault(TIMINGS_KEY, new_timing_store())
+start_run(render_timings)
+rerun_start = time.perf_counter()
+# Apelurile de calcul cronometrate (cache-uri, grile, simulări, optimizări, export)
+cached_scenario_analysis = timed_function(cached_scenario_analysis, render_timings, 'analysis_cache.cached_scenario_analysis')
+cached_compare_scenarios = timed_function(cached_compare_scenarios, render_timings, 'analysis_cache.cached_compare_scenarios')
+cached_simulation_bands = timed_function(cached_simulation_bands, render_timings, 'analysis_cache.cached_simulation_bands')
+cached_financial_forecast_summary = timed_function(cached_financial_forecast_summary, render_timings, 'analysis_cache.cached_financial_forecast_summary')
+cached_social_media_summary = timed_function(cached_social_media_summary, render_timings, 'analysis_cache.cached_social_media_summary')
+get_financial_forecast_by_space = timed_function(get_financial_forecast_by_space, render_timings, 'calculations.get_financial_forecast_by_space')
+solve_min_occupancy = timed_function(solve_min_occupancy, render_timings, 'calculations.solve_min_occupancy')
+get_competitive_positioning = timed_function(get_competitive_positioning, render_timings, 'competitor_analysis.get_competitive_positioning')
+get_competitors_comparison = timed_function(get_competitors_comparison, render_timings, 'competitor_analysis.get_competitors_comparison')
+calculate_market_position = timed_function(calculate_market_position, render_timings, 'competitor_analysis.calculate_market_position')
+get_layout_comparison = timed_function(get_layout_comparison, render_timings, 'competitor_analysis.get_layout_comparison')
+get_recommended_layout = timed_function(get_recommended_layout, render_timings, 'competitor_analysis.get_recommended_layout')
+get_competitors_by_category = timed_function(get_competitors_by_category, render_timings, 'competitor_analysis.get_competitors_by_category')
+get_all_competitor_locations = timed_function(get_all_competitor_locations, render_timings, 'competitor_analysis.get_all_competitor_locations')
+get_competitor_detailed_info = timed_function(get_competitor_detailed_info, render_timings, 'competitor_analysis.get_competitor_detailed_info')
+get_competitors_with_instagram = timed_function(get_competitors_with_instagram, render_timings, 'competitor_analysis.get_competitors_with_instagram')
+calculate_profitability_comparison = timed_function(calculate_profitability_comparison, render_timings, 'competitor_analysis.calculate_profitability_comparison')
+simulate_new_redgym_impact = timed_function(simulate_new_redgym_impact, render_timings, 'competitor_analysis.simulate_new_redgym_impact')
+get_social_media_trends = timed_function(get_social_media_trends, render_timings, 'competitor_analysis.get_social_media_trends')
+get_participation_blocks = timed_function(get_participation_blocks, render_timings, 'geo.get_participation_blocks')
+blocks_to_geojson = timed_function(blocks_to_geojson, render_timings, 'geo.blocks_to_geojson')
+get_capture_surface = timed_function(get_capture_surface, render_timings, 'capture.get_capture_surface')
+competitors_within = timed_function(competitors_within, render_timings, 'spatial_index.competitors_within')
+nearest_competitors = timed_function(nearest_competitors, render_timings, 'spatial_index.nearest_competitors')
+competitor_density_per_block = timed_function(competitor_density_per_block, render_timings, 'spatial_index.competitor_density_per_block')
+optimize_subscription_mix = timed_function(optimize_subscription_mix, render_timings, 'optimizer.optimize_subscription_mix')
+efficient_frontier = timed_function(efficient_frontier, render_timings, 'optimizer.efficient_frontier')
+sensitivity_analysis = timed_function(sensitivity_analysis, render_timings, 'sensitivity.sensitivity_analysis')
+tornado_data = timed_function(tornado_data, render_timings, 'sensitivity.tornado_data')
+find_population_raster = timed_function(find_population_raster, render_timings, 'population.find_population_raster')
+export_analysis_to_bytes = timed_function(export_analysis_to_bytes, render_timings, 'export_to_excel.export_analysis_to_bytes')
+# Randarea hărții folium, a graficelor și încărcarea imaginilor (redimensionare + base64)
+st_folium = timed_function(st_folium, render_timings, 'streamlit_folium.st_folium', kind='render')
+image_data_uri = timed_function(image_data_uri, render_timings, 'assets.image_data_uri', kind='render')
+plotly_chart = timed_function(st.plotly_chart, render_timings, 'st.plotly_chart', kind='render')
+# Orice funcție importată din calculations / competitor_analysis trebuie să fie în lista de mai sus
+_untimed = untimed_functions(globals(), ('calculations', 'competitor_analysis'))
+if _untimed:
+    raise RuntimeError(f"Funcții necronometrate în dashboard: {', '.join(_untimed)}")
+
 # Funcție helper pentru încărcarea și afișarea imaginilor
 def load_image(image_path, max_width=800):
     """
-    Încarcă o imagine și o returnează ca base64 pentru afișare în Streamlit
+    Încarcă o imagine redimensionată la max_width și o returnează ca URI data: (base64)
+    
+    Variantele sunt memorizate în memorie și pe disc (vezi assets.py), deci un rerun nu mai
+    recitește și recodifică fișierul original.
     """
-    if os.path.exists(image_path):
-        try:
-            with open(image_path, "rb") as img_file:
-                img_bytes = img_file.read()
-                img_b64 = base64.b64encode(img_bytes).decode('utf-8')
-                return img_b64
-        except Exception as e:
-            st.warning(f"Nu s-a putut încărca imaginea {image_path}: {e}")
-            return None
-    return None
+    try:
+        return image_data_uri(image_path, max_width)
+    except Exception as e:
+        st.warning(f"Nu s-a putut încărca imaginea {image_path}: {e}")
+        return None
 
 def display_image(image_path, caption="", max_width=800):
     """
     Afișează o imagine în Streamlit
     """
-    img_b64 = load_image(image_path)
-    if img_b64:
+    img_src = load_image(image_path, max_width)
+    if img_src:
         st.markdown(f"""
         <div style="text-align: center; margin: 20px 0;">
-            <img src="data:image/png;base64,{img_b64}" style="max-width: {max_width}px; width: 100%; border-radius: 8px; box-shadow: 0 4px 6px rgba(0,0,0,0.1);" />
+            <img src="{img_src}" style="max-width: {max_width}px; width: 100%; border-radius: 8px; box-shadow: 0 4px 6px rgba(0,0,0,0.1);" />
             {f'<p style="margin-top: 10px; color: #666; font-style: italic;">{caption}</p>' if caption else ''}
         </div>
         """, unsafe_allow_html=True)
@@ -297,6 +374,16 @@ population_density = st.sidebar.number_input(
     step=100
 )
 
+# Rasterul de populație (dacă există local) înlocuiește densitatea uniformă pentru rază, populație și blocuri
+population_raster = None
+population_raster_path = find_population_raster()
+if population_raster_path and st.sidebar.checkbox(
+    "🗺️ Populație din raster",
+    value=True,
+    help=f"Folosește rasterul {os.path.basename(population_raster_path)} în locul densității uniforme"
+):
+    population_raster = population_raster_path
+
 # Parametri campanie
 st.sidebar.subheader("Parametri Campanie")
 conversion_rate = st.sidebar.slider(
@@ -310,14 +397,72 @@ coverage_rate = st.sidebar.slider(
     help="Ce procent din populația interesată trebuie atins de campanie"
 ) / 100
 
+# Afișare
+st.sidebar.subheader("Afișare")
+lazy_navigation = st.sidebar.toggle(
+    "⚡ Randare rapidă (doar secțiunea activă)",
+    value=True,
+    help="Rulează doar secțiunea selectată. Dezactivează pentru tab-urile clasice, care randează toate secțiunile la fiecare modificare."
+)
+show_render_timings = st.sidebar.toggle(
+    "⏱️ Timpi de randare (debug)",
+    value=False,
+    help="Afișează percentilele timpilor pe secțiuni, apeluri de calcul, hartă, grafice și imagini"
+)
+
+# Export Excel în flux: fișierul se generează doar la cerere și se păstrează în sesiune
+with st.sidebar.expander("📥 Export Excel"):
+    export_monte_carlo = st.checkbox("Extrageri Monte Carlo", value=False)
+    export_trials = st.select_slider(
+        "Încercări per scenariu",
+        options=[10_000, 50_000, 100_000],
+        value=10_000,
+        format_func=lambda x: f"{x:,}",
+        disabled=not export_monte_carlo
+    )
+    export_blocks = st.checkbox("Grila de blocuri", value=True)
+    export_competitors = st.checkbox("Locații concurenți", value=True)
+    export_key = (
+        selected_scenario, tuple(subscription_distribution.items()), participation_rate, population_density,
+        conversion_rate, coverage_rate, population_raster, export_monte_carlo, export_trials, export_blocks, export_competitors
+    )
+    if st.button("Generează raportul", use_container_width=True):
+        with st.spinner("Se generează fișierul Excel..."):
+            st.session_state['excel_export'] = (export_key, export_analysis_to_bytes(
+                subscription_distribution,
+                participation_rate=participation_rate,
+                population_density=population_density,
+                scenario=selected_scenario,
+                conversion_rate=conversion_rate,
+                coverage_rate=coverage_rate,
+                population_raster=population_raster,
+                include_monte_carlo=export_monte_carlo,
+                trials=export_trials,
+                include_blocks=export_blocks,
+                include_competitors=export_competitors
+            ))
+    excel_export = st.session_state.get('excel_export')
+    if excel_export and excel_export[0] == export_key:
+        st.download_button(
+            "⬇️ Descarcă analiza (.xlsx)",
+            data=excel_export[1],
+            file_name="analiza_fitness_center.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            use_container_width=True
+        )
+    elif excel_export:
+        st.caption("Parametrii s-au schimbat de la ultima generare.")
+
 # Calculează analiza pentru scenariul selectat (inclusiv campania cu conversie și acoperire)
-analysis = get_scenario_analysis(
+# Rezultatele sunt memorizate pe parametrii normalizați din sidebar (vezi analysis_cache.py)
+analysis = cached_scenario_analysis(
     selected_scenario,
     subscription_distribution,
     participation_rate,
     population_density,
     conversion_rate,
-    coverage_rate
+    coverage_rate,
+    population_raster
 )
 
 # Main content
@@ -363,7 +508,7 @@ header_b64 = None
 header_loaded_path = None
 for path in header_paths:
     if os.path.exists(path):
-        header_b64 = load_image(path)
+        header_b64 = load_image(path, max_width=HEADER_IMAGE_WIDTH)
         if header_b64:
             header_loaded_path = path
             break
@@ -372,28 +517,15 @@ for path in header_paths:
 if header_b64:
     st.markdown(f"""
     <div style="text-align: center; margin: 0 0 20px 0; padding: 0;">
-        <img src="data:image/png;base64,{header_b64}" style="max-width: 100%; width: 100%; height: auto; display: block;" />
+        <img src="{header_b64}" style="max-width: 100%; width: 100%; height: auto; display: block;" />
     </div>
     """, unsafe_allow_html=True)
 
 # Locație sub header
 st.markdown(f"### 📍 Locație: {LOCATION['address']}, {LOCATION['city']}")
 
-# Tabs pentru diferite vizualizări
-tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10 = st.tabs([
-    "📊 Rezumat", 
-    "💰 Venituri", 
-    "👥 Clienți & Demografie", 
-    "📈 Comparare Scenarii",
-    "🗺️ Hartă Participare",
-    "🎯 Campanie",
-    "🏆 Analiză Concurențială",
-    "📘 Scopul și Arhitectura Dashboard",
-    "💵 Previziuni Financiare",
-    "📋 Colectare Date"
-])
-
-with tab1:
+def render_summary_section():
+    """Tab Rezumat: metrici principale, galerie și capacitate"""
     st.subheader("Rezumat Analiză")
     
     # Cuprins pentru tab Rezumat
@@ -463,6 +595,13 @@ with tab1:
         st.write(f"**Slot-uri ocupate:** {analysis['occupied_slots']:,} slot-uri")
         st.write(f"**Rata ocupare:** {analysis['occupancy_rate']*100:.1f}%")
         
+        # Ocuparea minimă pentru venitul dorit, calculată exact (bisecție pe slot-uri)
+        target_solution = solve_min_occupancy(DESIRED_MONTHLY_REVENUE, subscription_distribution)
+        if target_solution['feasible']:
+            st.write(f"**Ocupare minimă pentru {DESIRED_MONTHLY_REVENUE:,} RON:** {target_solution['occupancy_rate']*100:.1f}% ({target_solution['occupied_slots']:,} slot-uri)")
+        else:
+            st.write(f"**Ocupare minimă pentru {DESIRED_MONTHLY_REVENUE:,} RON:** neatinsă cu distribuția curentă (maxim {target_solution['revenue']:,} RON la 100%)")
+        
         st.markdown('<div id="distributie-abonamente"></div>', unsafe_allow_html=True)
         st.markdown("### Distribuție Abonamente")
         st.caption("💡 **Notă:** Procentajele sunt normalizate automat la 100% pentru calcule corecte.")
@@ -499,7 +638,7 @@ with tab1:
             color_discrete_map=get_subscription_colors()
         )
         fig_clients.update_layout(showlegend=False, height=300)
-        st.plotly_chart(fig_clients, use_container_width=True)
+        plotly_chart(fig_clients, use_container_width=True)
         
         st.markdown('<div id="raza-influenta"></div>', unsafe_allow_html=True)
         st.markdown("### Raza de Influență")
@@ -680,14 +819,16 @@ with tab1:
         **💡 Pentru mai multe detalii despre modelul de gândire, vezi tab-ul "📘 Scopul și Arhitectura Dashboard"**
         """)
 
-with tab2:
+def render_revenue_section():
+    """Tab Venituri: venituri pe tip de serviciu"""
     st.subheader("Analiză Venituri")
     
     # Cuprins pentru tab Venituri
     toc_items = [
         ("distributie-venituri", "📊 Distribuție Venituri pe Tip Abonament"),
         ("comparatie-venit", "📈 Comparație cu Venitul Dorit"),
-        ("tabel-detaliu", "📋 Tabel Detaliat Venituri")
+        ("tabel-detaliu", "📋 Tabel Detaliat Venituri"),
+        ("mix-optim", "🧮 Mix Optim de Servicii")
     ]
     st.markdown(create_table_of_contents("📑 Cuprins", toc_items), unsafe_allow_html=True)
     
@@ -714,7 +855,7 @@ with tab2:
             color='Tip Abonament',
             color_discrete_map=get_subscription_colors()
         )
-        st.plotly_chart(fig_revenue, use_container_width=True)
+        plotly_chart(fig_revenue, use_container_width=True)
     
     with col2:
         # Comparație cu venitul dorit
@@ -731,7 +872,7 @@ with tab2:
             yaxis_title="Venit (RON)",
             height=400
         )
-        st.plotly_chart(fig_target, use_container_width=True)
+        plotly_chart(fig_target, use_container_width=True)
         
         # Tabel detaliat venituri
         st.markdown('<div id="tabel-detaliu"></div>', unsafe_allow_html=True)
@@ -757,8 +898,41 @@ with tab2:
             total_clients = revenue_detail['Clienți/Sesiuni'].sum()
             revenue_detail.loc[len(revenue_detail)] = ['TOTAL', total_clients, '', revenue_data['total']]
         st.dataframe(revenue_detail, use_container_width=True, hide_index=True)
+    
+    # Mixul optim de servicii sub capacitatea sălilor (vezi optimizer.py)
+    st.markdown('<div id="mix-optim"></div>', unsafe_allow_html=True)
+    with st.expander("🧮 Mix Optim de Servicii (venit maxim per slot)"):
+        st.caption("Evaluează toate distribuțiile cu pas de 5%, respectând capacitatea fiecărei săli (clase / fitness / terapii) și un procent minim pentru Clase de Mișcare, la ocuparea scenariului selectat.")
+        min_primary_share = st.slider("Procent minim Clase de Mișcare (%)", 0, 100, 40, 5) / 100
+        optimal_mix = optimize_subscription_mix(analysis['occupancy_rate'], min_primary_share)
+        if optimal_mix['distribution'] is None:
+            st.warning("⚠️ Nu există o distribuție care să respecte capacitatea sălilor și procentul minim ales.")
+        else:
+            col_opt1, col_opt2, col_opt3 = st.columns(3)
+            with col_opt1:
+                st.metric("Venit Optim (RON)", f"{optimal_mix['revenue']:,.0f}", delta=f"{optimal_mix['revenue'] - revenue_data['total']:,.0f}")
+            with col_opt2:
+                st.metric("Venit/Slot (RON)", f"{optimal_mix['revenue_per_slot']:.2f}")
+            with col_opt3:
+                st.metric("Clienți Totali", f"{optimal_mix['total_clients']:,}")
+            st.dataframe(pd.DataFrame({
+                'Tip Abonament': [SUBSCRIPTION_TYPES[k]['name'] for k in optimal_mix['distribution']],
+                'Procentaj Optim': [f"{v*100:.0f}%" for v in optimal_mix['distribution'].values()],
+                'Procentaj Curent': [f"{subscription_distribution.get(k, 0)*100:.1f}%" for k in optimal_mix['distribution']]
+            }), use_container_width=True, hide_index=True)
+        
+        frontier_df = efficient_frontier(analysis['occupancy_rate'])
+        fig_frontier = px.line(
+            frontier_df,
+            x='Min. Clase Mișcare (%)',
+            y='Venit/Slot (RON)',
+            markers=True,
+            title="Frontiera Eficientă: Venit/Slot vs. Pondere Minimă Clase de Mișcare"
+        )
+        plotly_chart(fig_frontier, use_container_width=True)
 
-with tab3:
+def render_clients_section():
+    """Tab Clienți & Demografie: clienți necesari și zonă de acoperire"""
     st.subheader("Analiză Clienți & Demografie")
     
     # Cuprins pentru tab Clienți & Demografie
@@ -823,7 +997,7 @@ with tab3:
             showlegend=False,
             height=400
         )
-        st.plotly_chart(fig_clients_detailed, use_container_width=True)
+        plotly_chart(fig_clients_detailed, use_container_width=True)
         
         # Tabel detaliat cu sesiuni pentru serviciile per sesiune
         session_based_types = [k for k in active_client_types if SUBSCRIPTION_TYPES[k].get('is_session_based', False)]
@@ -867,16 +1041,18 @@ with tab3:
         **Populație potențial interesată:** {analysis['campaign']['interested_population']:,} oameni
         """)
 
-with tab4:
+def render_scenario_comparison_section():
+    """Tab Comparare Scenarii: tabel, grafice și simulare Monte Carlo"""
     st.subheader("Comparare Scenarii")
     
     # Compară toate scenariile
-    comparison_df = compare_scenarios(
+    comparison_df = cached_compare_scenarios(
         subscription_distribution,
         participation_rate,
         population_density,
         conversion_rate,
-        coverage_rate
+        coverage_rate,
+        population_raster
     )
     
     st.markdown('<div id="tabel-comparare"></div>', unsafe_allow_html=True)
@@ -902,7 +1078,7 @@ with tab4:
             line_color="red",
             annotation_text="Venit Dorit"
         )
-        st.plotly_chart(fig_comp_revenue, use_container_width=True)
+        plotly_chart(fig_comp_revenue, use_container_width=True)
     
     with col2:
         st.markdown('<div id="grafic-raza"></div>', unsafe_allow_html=True)
@@ -916,7 +1092,7 @@ with tab4:
             text='Raza Influență (km)'
         )
         fig_comp_radius.update_traces(texttemplate='%{text:.2f} km', textposition='outside')
-        st.plotly_chart(fig_comp_radius, use_container_width=True)
+        plotly_chart(fig_comp_radius, use_container_width=True)
     
     # Grafic clienți pe scenarii
     fig_comp_clients = px.line(
@@ -926,9 +1102,146 @@ with tab4:
         markers=True,
         title="Evoluție Clienți pe Scenarii"
     )
-    st.plotly_chart(fig_comp_clients, use_container_width=True)
+    plotly_chart(fig_comp_clients, use_container_width=True)
+    
+    # Simulare Monte Carlo: intervalul real al fiecărui scenariu, nu doar mijlocul
+    st.markdown('<div id="simulare-risc"></div>', unsafe_allow_html=True)
+    st.markdown("### 🎲 Simulare Risc (Monte Carlo)")
+    st.caption("Ocuparea este extrasă aleator din intervalul scenariului, mixul de servicii variază în jurul distribuției alese, iar conversia și acoperirea variază ±40% în jurul valorilor din sidebar.")
+    
+    simulation_trials = st.select_slider(
+        "Număr simulări per scenariu",
+        options=[10_000, 50_000, 100_000, 200_000],
+        value=100_000,
+        format_func=lambda x: f"{x:,}"
+    )
+    simulation_df = cached_simulation_bands(
+        subscription_distribution,
+        participation_rate,
+        population_density,
+        conversion_rate,
+        coverage_rate,
+        trials=simulation_trials,
+        population_raster=population_raster
+    )
+    st.dataframe(simulation_df, use_container_width=True, hide_index=True)
+    
+    fig_sim_revenue = go.Figure()
+    for _, row in simulation_df.iterrows():
+        fig_sim_revenue.add_trace(go.Bar(
+            x=[row['Scenariu']],
+            y=[row['Venit P95 (RON)'] - row['Venit P5 (RON)']],
+            base=[row['Venit P5 (RON)']],
+            name=row['Scenariu'],
+            text=[f"P50: {row['Venit P50 (RON)']:,.0f} RON"],
+            textposition='inside'
+        ))
+    fig_sim_revenue.add_hline(
+        y=DESIRED_MONTHLY_REVENUE,
+        line_dash="dash",
+        line_color="red",
+        annotation_text="Venit Dorit"
+    )
+    fig_sim_revenue.update_layout(title="Bandă Venit P5-P95 pe Scenarii", yaxis_title="Venit (RON)", showlegend=False)
+    plotly_chart(fig_sim_revenue, use_container_width=True)
+    
+    # Analiză de sensibilitate (tornado) pentru scenariul selectat
+    st.markdown('<div id="analiza-sensibilitate"></div>', unsafe_allow_html=True)
+    st.markdown("### 🌪️ Analiză Sensibilitate (Tornado)")
+    st.caption(f"Fiecare intrare este variată cu ±10% pentru scenariul **{OCCUPANCY_SCENARIOS[selected_scenario]['name']}**; elasticitatea arată variația relativă a rezultatului la 1% variație a intrării.")
+    
+    sensitivity_df = sensitivity_analysis(
+        selected_scenario,
+        subscription_distribution,
+        participation_rate,
+        population_density,
+        conversion_rate,
+        coverage_rate,
+        population_raster=population_raster
+    )
+    tornado_metric = st.radio("Rezultat analizat", ["Venit", "Clienți", "Rază"], horizontal=True, key="tornado_metric")
+    tornado_df = tornado_data(sensitivity_df, tornado_metric)
+    base_value = tornado_df['Bază'].iloc[0]
+    
+    fig_tornado = go.Figure()
+    fig_tornado.add_trace(go.Bar(
+        y=tornado_df['Parametru'],
+        x=tornado_df['Jos'] - base_value,
+        base=base_value,
+        orientation='h',
+        name='-10%',
+        marker_color='#e74c3c'
+    ))
+    fig_tornado.add_trace(go.Bar(
+        y=tornado_df['Parametru'],
+        x=tornado_df['Sus'] - base_value,
+        base=base_value,
+        orientation='h',
+        name='+10%',
+        marker_color='#2ecc71'
+    ))
+    fig_tornado.update_layout(barmode='overlay', title=f"Sensibilitate {tornado_metric}", height=450)
+    plotly_chart(fig_tornado, use_container_width=True)
+    
+    st.dataframe(
+        sensitivity_df[['Parametru', 'Valoare Bază', 'Elasticitate Venit', 'Elasticitate Clienți', 'Elasticitate Rază']],
+        use_container_width=True,
+        hide_index=True
+    )
+
+# Culoarea markerilor pe categorie, pentru concurenții fără culoare în COMPETITOR_LOCATIONS
+CATEGORY_MARKER_COLORS = {'fitness': 'red', 'kineto': 'cadetblue', 'masaj': 'purple', 'terapii': 'orange'}
+
+# Descrieri pentru punctele din COMPETITOR_LOCATIONS care nu au înregistrare în datele concurenților
+MAP_ONLY_COMPETITOR_INFO = {
+    'gymnastic_club': "<br><b>Tip:</b> Sală locală mică<br><b>Model:</b> Comunitate restrânsă",
+    'pole_fitness': "<br><b>Tip:</b> Specializată (Pole Fitness)<br><b>Model:</b> Nișă specifică"
+}
+
+
+def get_map_competitor_locations():
+    """
+    Locațiile concurenților afișate pe hartă și în link-urile Google Maps
+
+    Toate locațiile din datele concurenților (un concurent nou apare automat pe hartă), plus
+    punctele din COMPETITOR_LOCATIONS care nu au înregistrare în date.
+
+    Returns:
+        Listă de dict-uri cu 'name', 'coordinates', 'color' și 'info' (HTML pentru popup)
+    """
+    map_locations = []
+    stored_ids = set()
+    for location in get_all_competitor_locations():
+        competitor_id = location['competitor_id']
+        stored_ids.add(competitor_id)
+        if competitor_id in COMPETITORS:
+            comp_data = COMPETITORS[competitor_id]
+            info = f"<br><b>Capacitate:</b> {comp_data['capacity_simultaneous']} persoane<br><b>Membri:</b> {comp_data['active_members']}<br><b>Model:</b> {comp_data['model']}"
+        else:
+            info = f"<br><b>Categorie:</b> {location['category']}"
+            if location.get('capacity'):
+                info += f"<br><b>Capacitate:</b> {location['capacity']} persoane"
+            if location.get('area_m2'):
+                info += f"<br><b>Suprafață:</b> {location['area_m2']} m²"
+        legacy = COMPETITOR_LOCATIONS.get(competitor_id, {})
+        map_locations.append({
+            'name': location['location_name'],
+            'coordinates': location['coordinates'],
+            'color': legacy.get('color', CATEGORY_MARKER_COLORS.get(location['category_key'], 'gray')),
+            'info': info
+        })
+    for comp_key, comp_loc in COMPETITOR_LOCATIONS.items():
+        if comp_key not in stored_ids:
+            map_locations.append({
+                'name': comp_loc['name'],
+                'coordinates': comp_loc['coordinates'],
+                'color': comp_loc['color'],
+                'info': MAP_ONLY_COMPETITOR_INFO.get(comp_key, "")
+            })
+    return map_locations
 
-with tab5:
+def render_participation_map_section():
+    """Tab Hartă Participare: harta folium cu blocuri și concurenți"""
     st.subheader("🗺️ Hartă Participare pe Blocuri și Cartiere")
     
     # Cuprins pentru tab Hartă
@@ -940,16 +1253,6 @@ with tab5:
     ]
     st.markdown(create_table_of_contents("📑 Cuprins", toc_items), unsafe_allow_html=True)
     
-    # Funcție pentru calcularea distanței Haversine (în km)
-    def haversine_distance(lat1, lon1, lat2, lon2):
-        """Calculează distanța între două puncte geografice în km"""
-        R = 6371  # Raza Pământului în km
-        dlat = math.radians(lat2 - lat1)
-        dlon = math.radians(lon2 - lon1)
-        a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        return R * c
-    
     # Coordonatele locației
     center_lat, center_lon = LOCATION['coordinates']
     radius_km = analysis['influence_radius_km']
@@ -973,27 +1276,14 @@ with tab5:
         icon=folium.Icon(color='green', icon='home')
     ).add_to(m)
     
-    # Adaugă markeri pentru concurenți
-    for comp_key, comp_loc in COMPETITOR_LOCATIONS.items():
+    # Adaugă markeri pentru concurenți (toate locațiile din datele concurenților)
+    map_competitor_locations = get_map_competitor_locations()
+    for comp_loc in map_competitor_locations:
         comp_lat, comp_lon = comp_loc['coordinates']
-        comp_name = comp_loc['name']
-        
-        # Obține informații despre concurent din COMPETITORS dacă există
-        comp_info = ""
-        if comp_key in COMPETITORS:
-            comp_data = COMPETITORS[comp_key]
-            comp_info = f"<br><b>Capacitate:</b> {comp_data['capacity_simultaneous']} persoane<br><b>Membri:</b> {comp_data['active_members']}<br><b>Model:</b> {comp_data['model']}"
-        elif comp_key == 'gymnastic_club':
-            comp_info = "<br><b>Tip:</b> Sală locală mică<br><b>Model:</b> Comunitate restrânsă"
-        elif comp_key == 'pole_fitness':
-            comp_info = "<br><b>Tip:</b> Specializată (Pole Fitness)<br><b>Model:</b> Nișă specifică"
-        elif comp_key == 'q_fitt':
-            comp_info = "<br><b>Tip:</b> Sală locală<br><b>Model:</b> Comunitate restrânsă"
-        
         folium.Marker(
             [comp_lat, comp_lon],
-            popup=f"<b>🏋️ {comp_name}</b>{comp_info}",
-            tooltip=f"Concurent: {comp_name}",
+            popup=f"<b>🏋️ {comp_loc['name']}</b>{comp_loc['info']}",
+            tooltip=f"Concurent: {comp_loc['name']}",
             icon=folium.Icon(color=comp_loc['color'], icon='info-sign')
         ).add_to(m)
     
@@ -1015,109 +1305,74 @@ with tab5:
     
     total_clients_needed = analysis['total_clients']
     
-    # Creăm o grilă de chenare în jurul locației, aliniată cu structura reală a orașului
-    # Folosim o grilă mai densă pentru a se alinia mai bine cu blocurile reale
-    grid_size = 7  # 7x7 = 49 chenare (mai multe pentru acoperire mai bună)
-    block_size_km = 0.12  # Fiecare chenar are ~0.12 km latime/înălțime (mai mic pentru precizie)
-    
-    # Calculează participarea medie necesară pentru a atinge obiectivul
-    total_area_covered = math.pi * (radius_km ** 2)  # Suprafața totală acoperită
-    total_population_in_radius = int(total_area_covered * population_density)
-    avg_participation_needed = total_clients_needed / total_population_in_radius if total_population_in_radius > 0 else participation_rate
-    
-    for i in range(grid_size):
-        for j in range(grid_size):
-            # Calculează centrul chenarului
-            offset_lat = (i - grid_size/2 + 0.5) * block_size_km / 111  # +0.5 pentru centrare
-            offset_lon = (j - grid_size/2 + 0.5) * block_size_km / (111 * math.cos(math.radians(center_lat)))
-            
-            block_center_lat = center_lat + offset_lat
-            block_center_lon = center_lon + offset_lon
-            
-            # Calculează distanța de la centrul sălii la centrul chenarului
-            distance = haversine_distance(center_lat, center_lon, block_center_lat, block_center_lon)
-            
-            # Skip chenarele care sunt prea departe de raza de influență (doar cele din interiorul razei)
-            if distance > radius_km:
-                continue
-            
-            # Calculează suprafața chenarului (aproximativ)
-            block_area_km2 = block_size_km * block_size_km
-            block_population = int(block_area_km2 * population_density)
-            
-            # Participare necesară bazată pe distanță și necesarul total
-            # Mai aproape = participare mai mare necesară
-            if distance <= radius_km * 0.3:
-                participation_multiplier = 1.3  # Zone apropiate: participare mai mare
-                color = 'green'
-                intensity = 'Ridicată'
-            elif distance <= radius_km * 0.6:
-                participation_multiplier = 1.0  # Zone medii: participare normală
-                color = 'blue'
-                intensity = 'Medie'
-            elif distance <= radius_km * 0.9:
-                participation_multiplier = 0.7  # Zone îndepărtate: participare redusă
-                color = 'orange'
-                intensity = 'Moderată'
-            else:
-                participation_multiplier = 0.5  # Zone la margine: participare scăzută
-                color = 'red'
-                intensity = 'Redusă'
-            
-            # Calculează participarea necesară pentru acest bloc
-            # Participarea este calculată astfel încât suma tuturor blocurilor să dea clienții necesari
-            # Folosim participarea medie necesară ca bază și ajustăm cu multiplicatorul de distanță
-            participation_needed = avg_participation_needed * participation_multiplier
-            
-            # Ajustare: zonele mai apropiate trebuie să contribuie mai mult
-            # Normalizăm astfel încât suma tuturor blocurilor să dea clienții necesari
-            participation_needed = max(0.01, min(participation_needed, 0.30))  # Limitează între 1% și 30%
-            
-            interested_population = int(block_population * participation_needed)
-            
-            # Creează chenarul (poligon rectangular)
-            half_size = block_size_km / 2
-            block_bounds = [
-                [block_center_lat - half_size/111, block_center_lon - half_size/(111 * math.cos(math.radians(center_lat)))],
-                [block_center_lat + half_size/111, block_center_lon - half_size/(111 * math.cos(math.radians(center_lat)))],
-                [block_center_lat + half_size/111, block_center_lon + half_size/(111 * math.cos(math.radians(center_lat)))],
-                [block_center_lat - half_size/111, block_center_lon + half_size/(111 * math.cos(math.radians(center_lat)))],
-                [block_center_lat - half_size/111, block_center_lon - half_size/(111 * math.cos(math.radians(center_lat)))]  # Închide poligonul
-            ]
-            
-            blocks_data.append({
-                'lat': block_center_lat,
-                'lon': block_center_lon,
-                'distance': distance,
-                'participation': participation_needed,
-                'population': block_population,
-                'interested': interested_population,
-                'color': color,
-                'intensity': intensity,
-                'bounds': block_bounds
-            })
-            
-            # Adaugă poligonul (chenar) pentru bloc
-            folium.Polygon(
-                locations=block_bounds,
-                popup=folium.Popup(
-                    f"""
-                    <b>Bloc/Cartier</b><br>
-                    <b>Distanță:</b> {distance:.2f} km<br>
-                    <b>Participare necesară:</b> {participation_needed*100:.1f}% ({intensity})<br>
-                    <b>Populație:</b> {block_population:,} oameni<br>
-                    <b>Populație necesară:</b> {interested_population:,} oameni<br>
-                    <b>Suprafață:</b> {block_area_km2:.2f} km²
-                    """,
-                    max_width=280
-                ),
-                tooltip=f"Participare necesară: {participation_needed*100:.1f}% ({intensity})",
-                color=color,
-                fill=True,
-                fillColor=color,
-                fillOpacity=0.4,
-                weight=2
-            ).add_to(m)
+    # Grila de blocuri este generată vectorizat și memorizată per (centru, rază, bloc, densitate)
+    # Fiecare chenar are ~0.12 km latime/înălțime; 7x7 = 49 chenare în jurul sălii
+    block_size_km = DEFAULT_BLOCK_SIZE_KM
+    blocks = get_participation_blocks(
+        (center_lat, center_lon),
+        radius_km,
+        total_clients_needed,
+        participation_rate,
+        population_density,
+        block_size_km=block_size_km,
+        grid_size=DEFAULT_GRID_SIZE,
+        population_raster=population_raster
+    )
+    
+    # Probabilitatea de captare (model Huff) față de toți concurenții, pentru fiecare bloc
+    capture = get_capture_surface(blocks['lat'], blocks['lon'], (center_lat, center_lon))
+    blocks = {**blocks, 'capture': capture['capture']}
+    block_coloring = st.radio(
+        "Colorare blocuri",
+        ["Participare necesară", "Captare (model Huff)"],
+        horizontal=True,
+        key="block_coloring",
+        help="Captarea ține cont de distanța și capacitatea tuturor concurenților din zonă"
+    )
+    if block_coloring == "Captare (model Huff)":
+        blocks['color'] = capture['color']
+    blocks_data = blocks_to_records(blocks)
+    
+    # Toate blocurile într-un singur strat GeoJSON (culoarea vine din proprietățile fiecărui bloc)
+    folium.GeoJson(
+        blocks_to_geojson(blocks, block_size_km),
+        name="Blocuri/Cartiere",
+        style_function=lambda feature: {
+            'color': feature['properties']['color'],
+            'fillColor': feature['properties']['color'],
+            'fillOpacity': 0.4,
+            'weight': 2
+        },
+        tooltip=folium.GeoJsonTooltip(
+            fields=['participation_pct', 'capture_pct', 'intensity'],
+            aliases=['Participare necesară (%):', 'Captare (%):', 'Intensitate:']
+        ),
+        popup=folium.GeoJsonPopup(
+            fields=['distance_km', 'participation_pct', 'capture_pct', 'intensity', 'population', 'interested', 'area_km2'],
+            aliases=[
+                'Distanță (km):',
+                'Participare necesară (%):',
+                'Captare (model Huff, %):',
+                'Intensitate:',
+                'Populație (oameni):',
+                'Populație necesară (oameni):',
+                'Suprafață (km²):'
+            ],
+            max_width=280
+        )
+    ).add_to(m)
+    
+    # Benzile din legendă urmează modul de colorare ales
+    if block_coloring == "Captare (model Huff)":
+        legend_title = "Captare (model Huff):"
+        legend_bands = [(color, label, f"≥{threshold * 100:.0f}%") for threshold, color, label in CAPTURE_BANDS]
+    else:
+        legend_title = "Participare Necesară:"
+        legend_bands = [('green', 'Ideală', '&lt;10%'), ('blue', 'Bună', '10-20%'), ('orange', 'Medie', '20-30%'), ('red', 'Dificilă', '&gt;30%')]
+    legend_bands_html = f'<p style="margin:10px 0 8px 0; font-weight:bold; font-size:17px; color:#000000;">{legend_title}</p>' + ''.join(
+        f'<p style="margin:5px 0; font-size:16px; line-height:1.6; color:#000000;"><span style="color:{color}; font-size:22px; font-weight:bold; margin-right:8px;">▢</span> <b>{label}</b> ({note})</p>'
+        for color, label, note in legend_bands
+    )
     
     # Adaugă legendă îmbunătățită - mutată în top-right pentru vizibilitate maximă
     legend_html = f'''
@@ -1129,11 +1384,7 @@ with tab5:
                 font-family: Arial, sans-serif;
                 max-height: 85vh; overflow-y: auto;">
     <h4 style="margin-top:0; margin-bottom:15px; font-size:20px; font-weight:bold; color:#1f77b4; border-bottom:3px solid #1f77b4; padding-bottom:8px;">📋 Legendă</h4>
-    <p style="margin:10px 0 8px 0; font-weight:bold; font-size:17px; color:#000000;">Participare Necesară:</p>
-    <p style="margin:5px 0; font-size:16px; line-height:1.6; color:#000000;"><span style="color:green; font-size:22px; font-weight:bold; margin-right:8px;">▢</span> <b>Ideală</b> (&lt;10%)</p>
-    <p style="margin:5px 0; font-size:16px; line-height:1.6; color:#000000;"><span style="color:blue; font-size:22px; font-weight:bold; margin-right:8px;">▢</span> <b>Bună</b> (10-20%)</p>
-    <p style="margin:5px 0; font-size:16px; line-height:1.6; color:#000000;"><span style="color:orange; font-size:22px; font-weight:bold; margin-right:8px;">▢</span> <b>Medie</b> (20-30%)</p>
-    <p style="margin:5px 0; font-size:16px; line-height:1.6; color:#000000;"><span style="color:red; font-size:22px; font-weight:bold; margin-right:8px;">▢</span> <b>Dificilă</b> (&gt;30%)</p>
+    {legend_bands_html}
     <p style="margin:12px 0 8px 0; font-size:13px; color:#666; font-style:italic; border-top:2px solid #ddd; padding-top:10px;">Chenarele reprezintă blocurile/cartierele</p>
     <hr style="margin:12px 0; border:2px solid #ddd;">
     <p style="margin:10px 0 8px 0; font-weight:bold; font-size:17px; color:#000000;">Locații:</p>
@@ -1150,7 +1401,7 @@ with tab5:
     
     try:
         # Salvează harta temporar și o afișează
-        map_data = st_folium(m, width=1200, height=600, returned_objects=[])
+        st_folium(m, width=1200, height=600, returned_objects=[])
     except Exception as e:
         st.error(f"⚠️ Eroare la afișarea hărții Folium: {str(e)}")
         st.info("💡 **Soluții:**\n1. Verifică conexiunea la internet\n2. Reîmprospătează pagina (F5)\n3. Verifică dacă firewall-ul blochează conexiunea")
@@ -1182,7 +1433,7 @@ with tab5:
         
         # Hărți pentru concurenți
         st.markdown("#### 🏋️ Locații Concurenți")
-        for comp_key, comp_loc in COMPETITOR_LOCATIONS.items():
+        for comp_loc in map_competitor_locations:
             comp_lat, comp_lon = comp_loc['coordinates']
             comp_name = comp_loc['name']
             comp_url = f"https://www.google.com/maps?q={comp_lat},{comp_lon}&z=15"
@@ -1191,12 +1442,20 @@ with tab5:
             st.markdown(f"Coordonate: {comp_lat:.4f}, {comp_lon:.4f}")
             st.markdown(f"[🗺️ Deschide în Google Maps]({comp_url})")
             st.markdown("---")
-        
-        # Informații despre hartă
-        st.markdown('<div id="informatii-analiza"></div>', unsafe_allow_html=True)
-        st.markdown("### Informații despre Analiză")
-        st.write(f"**Raza de influență:** {radius_km:.2f} km")
-        st.write(f"**Număr blocuri/cartiere:** {num_blocks}")
+    
+    # Informații despre hartă
+    st.markdown('<div id="informatii-analiza"></div>', unsafe_allow_html=True)
+    st.markdown("### Informații despre Analiză")
+    st.write(f"**Raza de influență:** {radius_km:.2f} km")
+    st.write(f"**Număr blocuri/cartiere:** {num_blocks}")
+    
+    # Interogări pe indexul spațial al concurenților (construit o singură dată per proces)
+    competitors_in_radius = competitors_within(center_lat, center_lon, radius_km)
+    st.write(f"**Locații concurente în rază:** {len(competitors_in_radius)}")
+    for category_key in ('fitness', 'kineto', 'masaj', 'terapii'):
+        nearest = nearest_competitors(center_lat, center_lon, k=1, category=category_key)
+        if nearest:
+            st.write(f"**Cel mai apropiat ({nearest[0]['category']}):** {nearest[0]['location_name']} – {nearest[0]['distance_km']:.2f} km")
     
     # Secțiune alternativă cu Google Maps
     st.markdown("---")
@@ -1216,7 +1475,7 @@ with tab5:
     
     with col_map2:
         st.markdown("### 🏋️ Concurenți - Link-uri Google Maps")
-        for comp_key, comp_loc in COMPETITOR_LOCATIONS.items():
+        for comp_loc in map_competitor_locations:
             comp_lat, comp_lon = comp_loc['coordinates']
             comp_name = comp_loc['name']
             comp_url = f"https://www.google.com/maps?q={comp_lat},{comp_lon}&z=15"
@@ -1232,6 +1491,8 @@ with tab5:
     st.markdown("### Detalii Blocuri și Cartiere")
     
     blocks_df = pd.DataFrame(blocks_data)
+    blocks_df['competitors'] = competitor_density_per_block(blocks['lat'], blocks['lon'], DEFAULT_DENSITY_RADIUS_KM)['count']
+    blocks_df['top_competitor'] = capture['top_competitor_name']
     blocks_df = blocks_df.sort_values('distance')
     blocks_df['Bloc'] = [f"Bloc #{i+1}" for i in range(len(blocks_df))]
     blocks_df['Distanță (km)'] = blocks_df['distance'].round(2)
@@ -1239,8 +1500,11 @@ with tab5:
     blocks_df['Populație'] = blocks_df['population']
     blocks_df['Interesați'] = blocks_df['interested']
     blocks_df['Intensitate'] = blocks_df['intensity']
+    blocks_df[f'Concurenți (≤{DEFAULT_DENSITY_RADIUS_KM:g} km)'] = blocks_df['competitors']
+    blocks_df['Captare (%)'] = (blocks_df['capture'] * 100).round(1)
+    blocks_df['Concurent Principal'] = blocks_df['top_competitor']
     
-    display_df = blocks_df[['Bloc', 'Distanță (km)', 'Participare (%)', 'Populație', 'Interesați', 'Intensitate']]
+    display_df = blocks_df[['Bloc', 'Distanță (km)', 'Participare (%)', 'Populație', 'Interesați', 'Intensitate', f'Concurenți (≤{DEFAULT_DENSITY_RADIUS_KM:g} km)', 'Captare (%)', 'Concurent Principal']]
     st.dataframe(display_df, use_container_width=True, hide_index=True)
     
     # Statistici
@@ -1255,7 +1519,8 @@ with tab5:
         avg_participation = blocks_df['Participare (%)'].mean()
         st.metric("Participare Medie", f"{avg_participation:.1f}%")
 
-with tab6:
+def render_campaign_section():
+    """Tab Campanie: dimensiunea campaniei la nivel de cartier"""
     st.subheader("Analiză Campanie la Nivel de Cartier")
     
     # Cuprins pentru tab Campanie
@@ -1393,7 +1658,7 @@ with tab6:
                          '<extra></extra>'
         )
         
-        st.plotly_chart(fig_funnel, use_container_width=True)
+        plotly_chart(fig_funnel, use_container_width=True)
     
     st.markdown('<div id="recomandari-campanie"></div>', unsafe_allow_html=True)
     st.markdown("### Recomandări Campanie")
@@ -1618,7 +1883,8 @@ with tab6:
     5. **Ziua deschiderii:** Ceremonie de premiere, tururi ghidate ale sălii
     """)
 
-with tab7:
+def render_competitor_analysis_section():
+    """Tab Analiză Concurențială: poziționare, concurenți și social media"""
     st.subheader("🏆 Analiză Concurențială & Poziționare Strategică")
     
     positioning = get_competitive_positioning()
@@ -1637,17 +1903,13 @@ with tab7:
     
     background_image_b64 = ""
     if background_image_path:
-        try:
-            with open(background_image_path, "rb") as img_file:
-                background_image_b64 = base64.b64encode(img_file.read()).decode('utf-8')
-        except Exception as e:
-            st.warning(f"Nu s-a putut încărca imaginea: {e}")
+        background_image_b64 = load_image(background_image_path, max_width=TOC_BACKGROUND_WIDTH) or ""
     
     # Cuprins interactiv cu scroll smooth și imagine de fundal
     st.markdown(f"""
     <style>
     .toc-container {{
-        background-image: url('data:image/png;base64,{background_image_b64}');
+        background-image: url('{background_image_b64}');
         background-size: contain;
         background-position: center;
         background-repeat: no-repeat;
@@ -1821,7 +2083,7 @@ with tab7:
         showlegend=False,
         height=400
     )
-    st.plotly_chart(fig_capacity, use_container_width=True)
+    plotly_chart(fig_capacity, use_container_width=True)
     
     # Tabel detaliat
     display_df = pd.DataFrame({
@@ -1894,7 +2156,7 @@ with tab7:
             names='Zonă',
             title="Distribuție Clienți pe Zone"
         )
-        st.plotly_chart(fig_zones, use_container_width=True)
+        plotly_chart(fig_zones, use_container_width=True)
     
     # Secțiune 6: Layout Comparativ (mp/om)
     st.markdown('<div id="layout-comparativ"></div>', unsafe_allow_html=True)
@@ -1976,7 +2238,7 @@ with tab7:
         showlegend=False,
         height=500
     )
-    st.plotly_chart(fig_m2_per_person, use_container_width=True)
+    plotly_chart(fig_m2_per_person, use_container_width=True)
     
     # Tabel detaliat
     st.dataframe(
@@ -2052,7 +2314,7 @@ with tab7:
             title="Distribuție Spațiu Recomandată",
             hover_data=['Procentaj']
         )
-        st.plotly_chart(fig_layout, use_container_width=True)
+        plotly_chart(fig_layout, use_container_width=True)
     
     # Tabel detaliat layout
     layout_detail_df = pd.DataFrame({
@@ -2189,7 +2451,6 @@ with tab7:
     """)
     
     # Selector de categorie
-    all_competitors_data = get_all_extended_competitors()
     category_names = {
         'fitness': '🏋️ Săli de Fitness',
         'kineto': '🏥 Săli de Kineto / Reabilitare',
@@ -2286,7 +2547,7 @@ with tab7:
     st.markdown('<div id="analiza-social-media"></div>', unsafe_allow_html=True)
     st.markdown("### 📱 Analiză Social Media - Prezența Concurenților pe Instagram")
     
-    social_summary = get_social_media_summary()
+    social_summary = cached_social_media_summary()
     
     col1, col2, col3, col4 = st.columns(4)
     with col1:
@@ -2316,23 +2577,37 @@ with tab7:
         category_social_df = pd.DataFrame(category_social_data)
         st.dataframe(category_social_df, use_container_width=True, hide_index=True)
     
+    # Tendințe din snapshot-urile Instagram datate (data/social_snapshots.jsonl)
+    social_trends = get_social_media_trends(30)
+    trend_rows = [
+        {'Dată': point['date'], 'Categorie': category_names.get(category, category), 'Followers': point['total_followers']}
+        for category, trend in social_trends.items()
+        for point in trend['series']
+    ]
+    if trend_rows:
+        st.markdown("#### 📈 Evoluție Followers (snapshot-uri zilnice)")
+        trend_df = pd.DataFrame(trend_rows).pivot_table(index='Dată', columns='Categorie', values='Followers').ffill()
+        st.line_chart(trend_df)
+        st.caption("Creștere în ultimele 30 de zile: " + ", ".join(
+            f"{category_names.get(category, category)}: {trend['followers_growth']:+,}"
+            for category, trend in social_trends.items() if trend['series']
+        ))
+    
     # Analiză detaliată pentru fiecare competitor
     st.markdown("#### 🔍 Analiză Detaliată per Competitor")
     
     all_competitors = []
-    for category, competitors in all_competitors_data.items():
-        for comp in competitors:
-            social = comp.get('social_media', {}).get('instagram', {})
-            if social:
-                all_competitors.append({
-                    'Competitor': comp['name'],
-                    'Categorie': category_names.get(category, category),
-                    'Instagram Handle': social.get('handle', 'N/A'),
-                    'Followers': social.get('followers', 0),
-                    'Postări/Săptămână': social.get('posts_per_week', 0),
-                    'Engagement Rate (%)': social.get('engagement_rate', 0),
-                    'Tipuri de Conținut': ', '.join(social.get('content_types', []))
-                })
+    for category, comp in get_competitors_with_instagram():
+        social = comp['social_media']['instagram']
+        all_competitors.append({
+            'Competitor': comp['name'],
+            'Categorie': category_names.get(category, category),
+            'Instagram Handle': social.get('handle', 'N/A'),
+            'Followers': social.get('followers', 0),
+            'Postări/Săptămână': social.get('posts_per_week', 0),
+            'Engagement Rate (%)': social.get('engagement_rate', 0),
+            'Tipuri de Conținut': ', '.join(social.get('content_types', []))
+        })
     
     if all_competitors:
         competitors_social_df = pd.DataFrame(all_competitors)
@@ -2349,7 +2624,7 @@ with tab7:
             labels={'Followers': 'Număr Followers', 'Competitor': 'Competitor'}
         )
         fig_followers.update_layout(height=500, xaxis_tickangle=-45)
-        st.plotly_chart(fig_followers, use_container_width=True)
+        plotly_chart(fig_followers, use_container_width=True)
         
         # Grafic engagement rate
         fig_engagement = px.bar(
@@ -2361,23 +2636,21 @@ with tab7:
             labels={'Engagement Rate (%)': 'Engagement Rate (%)', 'Competitor': 'Competitor'}
         )
         fig_engagement.update_layout(height=500, xaxis_tickangle=-45)
-        st.plotly_chart(fig_engagement, use_container_width=True)
+        plotly_chart(fig_engagement, use_container_width=True)
     
     # Postări populare
     st.markdown("#### ⭐ Cele Mai Populare Postări")
     
-    for category, competitors in all_competitors_data.items():
-        for comp in competitors:
-            social = comp.get('social_media', {}).get('instagram', {})
-            top_posts = social.get('top_posts', [])
-            if top_posts:
-                with st.expander(f"**{comp['name']}** - Top {len(top_posts)} Postări"):
-                    for idx, post in enumerate(top_posts, 1):
-                        st.markdown(f"""
-                        **#{idx}** - {post.get('description', 'N/A')}
-                        - 👍 {post.get('likes', 0)} like-uri
-                        - 💬 {post.get('comments', 0)} comentarii
-                        """)
+    for category, comp in get_competitors_with_instagram():
+        top_posts = comp['social_media']['instagram'].get('top_posts', [])
+        if top_posts:
+            with st.expander(f"**{comp['name']}** - Top {len(top_posts)} Postări"):
+                for idx, post in enumerate(top_posts, 1):
+                    st.markdown(f"""
+                    **#{idx}** - {post.get('description', 'N/A')}
+                    - 👍 {post.get('likes', 0)} like-uri
+                    - 💬 {post.get('comments', 0)} comentarii
+                    """)
     
     st.markdown("---")
     st.markdown('<div id="concluzie-strategica"></div>', unsafe_allow_html=True)
@@ -2565,7 +2838,8 @@ with tab7:
     """)
 
 # Tab 8: Scopul și Arhitectura Dashboard
-with tab8:
+def render_architecture_section():
+    """Tab Scopul și Arhitectura Dashboard"""
     st.markdown("""
     # 📘 Scopul și Arhitectura Dashboard
     ## Analiză Potențial Spațiu Fitness & Recuperare - Bacau
@@ -3254,14 +3528,15 @@ with tab8:
     """)
 
 # Tab 9: Previziuni Financiare
-with tab9:
+def render_financial_forecast_section():
+    """Tab Previziuni Financiare: venituri, cheltuieli și profit pe spații"""
     st.markdown("""
     # 💵 Previziuni Financiare - Mobilis Vita
     
     Această secțiune prezintă previziunile financiare bazate pe datele reale ale proiectului.
     """)
     
-    forecast_summary = get_financial_forecast_summary()
+    forecast_summary = cached_financial_forecast_summary()
     forecast_df = get_financial_forecast_by_space()
     
     # Metrici principale
@@ -3320,7 +3595,6 @@ with tab9:
         # Grafic break-even
         occupancy_levels = [0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
         revenues = [r * forecast_summary['total_revenue']['maximum'] for r in occupancy_levels]
-        profits = [r - forecast_summary['total_expenses'] for r in revenues]
         
         fig_break_even = go.Figure()
         fig_break_even.add_trace(go.Scatter(
@@ -3349,7 +3623,7 @@ with tab9:
             yaxis_title="Sumă (RON)",
             height=400
         )
-        st.plotly_chart(fig_break_even, use_container_width=True)
+        plotly_chart(fig_break_even, use_container_width=True)
     
     # Tabel detaliat pe spații
     st.markdown("### 📋 Previziuni pe Spații")
@@ -3389,7 +3663,7 @@ with tab9:
         height=500,
         xaxis_tickangle=-45
     )
-    st.plotly_chart(fig_revenues, use_container_width=True)
+    plotly_chart(fig_revenues, use_container_width=True)
     
     # Detalii cheltuieli
     st.markdown("### 💸 Detalii Cheltuieli")
@@ -3495,7 +3769,8 @@ with tab9:
     """)
 
 # Tab 10: Colectare Date și Metodologie
-with tab10:
+def render_data_collection_section():
+    """Tab Colectare Date: ghid pentru actualizarea datelor"""
     st.markdown("""
     # 📋 Colectare Date și Metodologie
     
@@ -3797,13 +4072,13 @@ with tab10:
     st.markdown("""
     #### 📝 1. Actualizare Date Concurenți
     
-    **Fișier:** `competitor_analysis.py`
+    **Fișier:** `data/competitors.json` (sau o bază SQLite indicată prin variabila de mediu `COMPETITOR_DATA`)
     
-    **Structura:** `EXTENDED_COMPETITOR_DATA`
+    **Structura:** secțiunea `extended` (fostul `EXTENDED_COMPETITOR_DATA`) și `details` (layout)
     
     **Pași:**
-    1. Deschide fișierul `competitor_analysis.py`
-    2. Găsește secțiunea `EXTENDED_COMPETITOR_DATA`
+    1. Deschide fișierul `data/competitors.json`
+    2. Găsește categoria concurentului în secțiunea `extended`
     3. Pentru fiecare competitor, actualizează:
        - `locations` - Adrese și coordonate reale
        - `prices` - Prețuri reale obținute
@@ -3812,21 +4087,23 @@ with tab10:
        - `trainers` / `therapists` / `instructors` - Nume și specializări reale
        - `social_media` - Date reale despre Instagram
     
-    **Exemplu de actualizare:**
-    ```python
-    'social_media': {
-        'instagram': {
-            'handle': '@redgym_bacau',  # Handle real
-            'followers': 3500,  # Număr real de followers
-            'posts_per_week': 4,  # Număr real de postări/săptămână
-            'engagement_rate': 3.2,  # Calculat real: (likes+comments)/followers*100
-            'content_types': ['Workout videos', 'Transformations'],  # Tipuri reale
-            'top_posts': [
-                {'description': 'Post real', 'likes': 450, 'comments': 32}  # Date reale
-            ]
-        }
+    **Exemplu de actualizare** (`engagement_rate` = (likes+comments)/followers×100):
+    ```json
+    "social_media": {
+      "instagram": {
+        "handle": "@redgym_bacau",
+        "followers": 3500,
+        "posts_per_week": 4,
+        "engagement_rate": 3.2,
+        "content_types": ["Workout videos", "Transformations"],
+        "top_posts": [
+          {"description": "Post real", "likes": 450, "comments": 32}
+        ]
+      }
     }
     ```
+    
+    Modificările sunt preluate la următoarea reîncărcare a paginii, fără redeploy.
     """)
     
     st.markdown("""
@@ -3929,6 +4206,40 @@ with tab10:
     Toate datele sunt stocate în fișiere Python (`competitor_analysis.py`, `calculations.py`) și pot fi modificate direct.
     """)
 
+# Secțiunile dashboard-ului (etichetă tab, funcție de randare)
+DASHBOARD_SECTIONS = [
+    ("📊 Rezumat", render_summary_section),
+    ("💰 Venituri", render_revenue_section),
+    ("👥 Clienți & Demografie", render_clients_section),
+    ("📈 Comparare Scenarii", render_scenario_comparison_section),
+    ("🗺️ Hartă Participare", render_participation_map_section),
+    ("🎯 Campanie", render_campaign_section),
+    ("🏆 Analiză Concurențială", render_competitor_analysis_section),
+    ("📘 Scopul și Arhitectura Dashboard", render_architecture_section),
+    ("💵 Previziuni Financiare", render_financial_forecast_section),
+    ("📋 Colectare Date", render_data_collection_section)
+]
+
+if lazy_navigation:
+    # Randare leneșă: rulează doar secțiunea activă (harta, graficele și expanderele
+    # celorlalte secțiuni nu se mai construiesc la fiecare mișcare a unui slider)
+    section_labels = [label for label, _ in DASHBOARD_SECTIONS]
+    active_section = st.radio(
+        "Secțiune",
+        options=section_labels,
+        horizontal=True,
+        key="active_section",
+        label_visibility="collapsed"
+    )
+    with timed(render_timings, active_section):
+        dict(DASHBOARD_SECTIONS)[active_section]()
+else:
+    # Tab-uri clasice: toate secțiunile se randează la fiecare rerun
+    tabs = st.tabs([label for label, _ in DASHBOARD_SECTIONS])
+    for tab, (label, render_section) in zip(tabs, DASHBOARD_SECTIONS):
+        with tab, timed(render_timings, label):
+            render_section()
+
 # Footer
 st.markdown("---")
 st.markdown("""
@@ -3938,3 +4249,21 @@ st.markdown("""
 </div>
 """.format(address=LOCATION['address'], city=LOCATION['city']), unsafe_allow_html=True)
 
+record_timing(render_timings, 'rerun', 'run', time.perf_counter() - rerun_start)
+
+# Panoul de debug: percentilele pe ultimele ROLLING_SAMPLES măsurători per nume
+if show_render_timings:
+    with st.sidebar.expander("⏱️ Timpi de randare", expanded=True):
+        summary = timing_summary(render_timings)
+        st.caption(f"Rerun #{render_timings['runs']} · timpi în ms")
+        if summary:
+            st.dataframe(
+                pd.DataFrame(summary).rename(columns={
+                    'name': 'Nume', 'kind': 'Tip', 'count': 'Nr.', 'last_ms': 'Ultimul',
+                    'p50_ms': 'p50', 'p90_ms': 'p90', 'p99_ms': 'p99'
+                }).round(2),
+                hide_index=True,
+                use_container_width=True
+            )
+        if st.button("Resetează timpii", use_container_width=True):
+            st.session_state[TIMINGS_KEY] = new_timing_store()
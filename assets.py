@@ -0,0 +1,142 @@
+"""
+Pipeline pentru imaginile afișate în dashboard
+
+Imaginile (galeria din `images/`, header-ul, fundalul cuprinsului `harta_sali.png`) sunt inserate
+în HTML ca base64. În loc să citim și să codificăm fișierul PNG original la fiecare rerun,
+generăm variante redimensionate la lățimea afișată (WebP, cu fallback PNG), le păstrăm în memorie
+și pe disc, cheiate pe calea fișierului și data modificării.
+"""
+import base64
+import hashlib
+import io
+import os
+from typing import Dict, Optional
+
+from PIL import Image, features
+
+
+# Directorul cache-ului pe disc (ignorat de Git)
+IMAGE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.image_cache')
+
+# Format implicit: WebP dacă Pillow îl suportă, altfel PNG
+DEFAULT_IMAGE_FORMAT = 'WEBP' if features.check('webp') else 'PNG'
+WEBP_QUALITY = 82
+
+MIME_TYPES = {
+    'WEBP': 'image/webp',
+    'PNG': 'image/png',
+    'JPEG': 'image/jpeg'
+}
+
+# Cache în memorie: cheie -> variantă codificată
+_memory_cache: Dict[tuple, Dict] = {}
+
+
+def _cache_key(image_path: str, max_width: Optional[int], image_format: str) -> tuple:
+    stat = os.stat(image_path)
+    return (os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size, max_width, image_format)
+
+
+def _disk_cache_path(key: tuple) -> str:
+    digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(key[0]))[0]
+    return os.path.join(IMAGE_CACHE_DIR, f"{stem}_{key[3] or 'orig'}_{digest}.{key[4].lower()}")
+
+
+def _encode_variant(image_path: str, max_width: Optional[int], image_format: str) -> bytes:
+    with Image.open(image_path) as img:
+        img.load()
+        if max_width and img.width > max_width:
+            height = max(1, round(img.height * max_width / img.width))
+            img = img.resize((max_width, height), Image.LANCZOS)
+        if image_format == 'JPEG' and img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        buffer = io.BytesIO()
+        if image_format == 'WEBP':
+            img.save(buffer, format='WEBP', quality=WEBP_QUALITY, method=4)
+        elif image_format == 'PNG':
+            img.save(buffer, format='PNG', optimize=True)
+        else:
+            img.save(buffer, format=image_format, quality=WEBP_QUALITY)
+        return buffer.getvalue()
+
+
+def _read_or_build(key: tuple, image_path: str, max_width: Optional[int], image_format: str) -> bytes:
+    cache_path = _disk_cache_path(key)
+    if os.path.exists(cache_path):
+        with open(cache_path, 'rb') as cached:
+            return cached.read()
+
+    data = _encode_variant(image_path, max_width, image_format)
+    try:
+        os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as cached:
+            cached.write(data)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Cache-ul pe disc este opțional (ex: sistem de fișiere read-only pe Streamlit Cloud)
+        pass
+    return data
+
+
+def get_image_variant(
+    image_path: str,
+    max_width: Optional[int] = None,
+    image_format: str = DEFAULT_IMAGE_FORMAT
+) -> Optional[Dict]:
+    """
+    Returnează varianta redimensionată și codificată base64 a unei imagini
+
+    Args:
+        image_path: Calea către imaginea originală
+        max_width: Lățimea maximă afișată (px); None = dimensiunea originală
+        image_format: 'WEBP', 'PNG' sau 'JPEG'
+
+    Returns:
+        Dict cu 'mime', 'b64', 'data_uri' și 'size_bytes', sau None dacă fișierul nu există
+    """
+    if not os.path.exists(image_path):
+        return None
+
+    image_format = image_format.upper()
+    key = _cache_key(image_path, max_width, image_format)
+    variant = _memory_cache.get(key)
+    if variant is None:
+        data = _read_or_build(key, image_path, max_width, image_format)
+        b64 = base64.b64encode(data).decode('utf-8')
+        mime = MIME_TYPES.get(image_format, 'application/octet-stream')
+        variant = {
+            'mime': mime,
+            'b64': b64,
+            'data_uri': f"data:{mime};base64,{b64}",
+            'size_bytes': len(data)
+        }
+        # Variantele vechi ale aceluiași fișier (mtime diferit) nu mai sunt valide
+        for stale in [k for k in _memory_cache if k[0] == key[0] and k[1:3] != key[1:3]]:
+            del _memory_cache[stale]
+        _memory_cache[key] = variant
+    return variant
+
+
+def image_data_uri(
+    image_path: str,
+    max_width: Optional[int] = None,
+    image_format: str = DEFAULT_IMAGE_FORMAT
+) -> Optional[str]:
+    """
+    Returnează direct URI-ul `data:` pentru o imagine (sau None dacă nu există)
+    """
+    variant = get_image_variant(image_path, max_width, image_format)
+    return variant['data_uri'] if variant else None
+
+
+def clear_image_cache(include_disk: bool = False) -> None:
+    """
+    Golește cache-ul din memorie și, opțional, variantele salvate pe disc
+    """
+    _memory_cache.clear()
+    if include_disk and os.path.isdir(IMAGE_CACHE_DIR):
+        for name in os.listdir(IMAGE_CACHE_DIR):
+            os.remove(os.path.join(IMAGE_CACHE_DIR, name))
@@ -0,0 +1,388 @@
+"""
+Rulare batch (fără interfață) a unei grile de parametri
+
+Evaluează mii de combinații de parametri (scenariu, distribuție servicii, participare, densitate,
+conversie, acoperire) pentru una sau mai multe locații. Grila se împarte în bucăți, evaluate pe
+rând de procesul principal; fiecare bucată este evaluată vectorizat, în paralel pe felii cu
+vectorii în memorie partajată (vezi parallel.py), și scrisă într-un fișier parțial, deci o
+rulare întreruptă se reia de la prima bucată lipsă. La final bucățile se concatenează în flux
+în fișierul de ieșire (CSV sau Parquet).
+
+Utilizare:
+    python batch_grid.py grila.json -o rezultate.csv --workers 4
+    python batch_grid.py grila.csv -o rezultate.parquet --chunk-size 20000
+
+Fișierul grilei poate fi:
+    - JSON: {"sites": [...], "distributions": [{...}, ...], "parameters": {"scenario": [...], ...}}
+      Se evaluează produsul cartezian locații × distribuții × valorile fiecărui parametru.
+      Locațiile au formatul din multi_site.DEFAULT_SITES.
+    - CSV: câte un set de parametri pe rând. Coloanele lipsă primesc valorile implicite, iar
+      distribuția serviciilor se dă în coloane cu cheile din SUBSCRIPTION_TYPES.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from calculations import (
+    OCCUPANCY_SCENARIOS,
+    SUBSCRIPTION_TYPES,
+    DESIRED_MONTHLY_REVENUE,
+    DEFAULT_SUBSCRIPTION_DISTRIBUTION,
+    calculate_revenue_batch,
+    calculate_campaign_scale_batch
+)
+from multi_site import DEFAULT_SITES, site_max_capacity
+from parallel import PARALLEL_MIN_ROWS, parallel_map_arrays
+
+
+# O bucată trebuie să aibă cel puțin PARALLEL_MIN_ROWS rânduri ca evaluarea ei să fie paralelă
+DEFAULT_CHUNK_SIZE = PARALLEL_MIN_ROWS
+
+OUTPUT_FORMATS = {'.csv': 'csv', '.parquet': 'parquet'}
+
+# Valorile implicite ale parametrilor (aceleași ca în sidebar)
+DEFAULT_PARAMETERS = {
+    'scenario': 'medium',
+    'occupancy_rate': np.nan,  # NaN = mijlocul intervalului scenariului
+    'participation_rate': 0.10,
+    'population_density': 1000.0,
+    'conversion_rate': 0.05,
+    'coverage_rate': 0.50
+}
+
+SITE_COLUMNS = ('site_id', 'capacity_per_hour', 'site_lat', 'site_lon')
+
+
+def _site_row(site: Dict) -> Dict:
+    return {
+        'site_id': site.get('id', site.get('name', 'site')),
+        'capacity_per_hour': float(site.get('capacity_per_hour', DEFAULT_SITES[0]['capacity_per_hour'])),
+        'site_lat': float(site['coordinates'][0]),
+        'site_lon': float(site['coordinates'][1])
+    }
+
+
+def _normalize_distributions(grid: pd.DataFrame) -> None:
+    # Ca în sidebar: procentajele fiecărui rând se normalizează la 100%
+    keys = list(SUBSCRIPTION_TYPES.keys())
+    totals = grid[keys].sum(axis=1).to_numpy()
+    grid[keys] = grid[keys].to_numpy() / np.where(totals > 0, totals, 1.0)[:, None]
+
+
+def grid_from_spec(spec: Dict) -> pd.DataFrame:
+    """
+    Extinde specificația JSON a grilei în produsul cartezian al valorilor, un rând per combinație
+    """
+    sites = pd.DataFrame([_site_row(site) for site in spec.get('sites') or DEFAULT_SITES])
+    distributions = pd.DataFrame([
+        {key: float(distribution.get(key, 0)) for key in SUBSCRIPTION_TYPES}
+        for distribution in spec.get('distributions') or [DEFAULT_SUBSCRIPTION_DISTRIBUTION]
+    ])
+    parameters = spec.get('parameters', {})
+    unknown = set(parameters) - set(DEFAULT_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Parametri necunoscuți în grilă: {sorted(unknown)} (disponibili: {list(DEFAULT_PARAMETERS)})")
+    values = {
+        name: [np.nan if v is None else v for v in np.atleast_1d(parameters.get(name, [default])).tolist()]
+        for name, default in DEFAULT_PARAMETERS.items()
+    }
+
+    # Produsul cartezian ca indici: locații × distribuții × parametri
+    sizes = [len(sites), len(distributions)] + [len(v) for v in values.values()]
+    positions = np.indices(sizes).reshape(len(sizes), -1)
+    grid = pd.concat([
+        sites.iloc[positions[0]].reset_index(drop=True),
+        distributions.iloc[positions[1]].reset_index(drop=True),
+        pd.DataFrame({
+            name: np.asarray(options, dtype=object if name == 'scenario' else np.float64)[positions[2 + i]]
+            for i, (name, options) in enumerate(values.items())
+        })
+    ], axis=1)
+    return grid
+
+
+def load_parameter_grid(path: str) -> pd.DataFrame:
+    """
+    Citește fișierul grilei (JSON sau CSV) și returnează un DataFrame cu un rând per evaluare
+
+    Returns:
+        DataFrame cu coloanele SITE_COLUMNS, DEFAULT_PARAMETERS și cheile din SUBSCRIPTION_TYPES
+        (distribuția normalizată la 1)
+    """
+    if path.lower().endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as grid_file:
+            grid = grid_from_spec(json.load(grid_file))
+    else:
+        grid = pd.read_csv(path)
+        for column, value in {**_site_row(DEFAULT_SITES[0]), **DEFAULT_PARAMETERS}.items():
+            if column not in grid.columns:
+                grid[column] = value
+        distribution_given = any(key in grid.columns for key in SUBSCRIPTION_TYPES)
+        for key in SUBSCRIPTION_TYPES:
+            if key not in grid.columns:
+                grid[key] = 0.0 if distribution_given else DEFAULT_SUBSCRIPTION_DISTRIBUTION.get(key, 0.0)
+        grid = grid[list(SITE_COLUMNS) + list(SUBSCRIPTION_TYPES) + list(DEFAULT_PARAMETERS)].copy()
+
+    unknown = set(grid['scenario']) - set(OCCUPANCY_SCENARIOS)
+    if unknown:
+        raise ValueError(f"Scenarii necunoscute în grilă: {sorted(unknown)}")
+    _normalize_distributions(grid)
+    return grid
+
+
+def grid_kernel(
+    occupancy_rate: np.ndarray,
+    distribution: np.ndarray,
+    capacity_per_hour: np.ndarray,
+    participation_rate: np.ndarray,
+    population_density: np.ndarray,
+    conversion_rate: np.ndarray,
+    coverage_rate: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Evaluarea vectorizată a N rânduri (doar vectori numerici, pentru parallel.parallel_map_arrays)
+    """
+    revenue_data = calculate_revenue_batch(
+        occupancy_rate, distribution, list(SUBSCRIPTION_TYPES.keys()), max_capacity=site_max_capacity(capacity_per_hour)
+    )
+    campaign = calculate_campaign_scale_batch(
+        revenue_data['total_clients'], participation_rate, population_density, conversion_rate, coverage_rate
+    )
+    return {
+        'occupied_slots': revenue_data['occupied_slots'],
+        'revenue_total': revenue_data['total'],
+        'clients_total': revenue_data['total_clients'],
+        'radius_km': campaign['radius_km'],
+        'total_population': campaign['total_population'],
+        'people_to_reach': campaign['people_to_reach']
+    }
+
+
+def evaluate_grid(grid: pd.DataFrame, population_raster: Optional[str] = None, workers: Optional[int] = 1) -> pd.DataFrame:
+    """
+    Evaluează vectorizat toate rândurile grilei
+
+    Args:
+        workers: Procese pentru evaluare (None = toate nucleele). Grilele mari se împart în felii
+            evaluate în paralel, cu intrările și ieșirile în memorie partajată (vezi parallel.py)
+
+    Returns:
+        Grila plus coloanele rezultat: 'occupied_slots', 'revenue_total', 'clients_total',
+        'radius_km', 'total_population', 'people_to_reach' și 'meets_target' (venit ≥ venitul dorit)
+    """
+    scenario_mid = {name: (cfg['min'] + cfg['max']) / 2 for name, cfg in OCCUPANCY_SCENARIOS.items()}
+    occupancy = grid['occupancy_rate'].to_numpy(dtype=np.float64)
+    occupancy = np.where(np.isnan(occupancy), grid['scenario'].map(scenario_mid).to_numpy(dtype=np.float64), occupancy)
+    inputs = {
+        'occupancy_rate': occupancy,
+        'distribution': grid[list(SUBSCRIPTION_TYPES.keys())].to_numpy(dtype=np.float64),
+        'capacity_per_hour': grid['capacity_per_hour'].to_numpy(dtype=np.float64),
+        **{name: grid[name].to_numpy(dtype=np.float64) for name in ('participation_rate', 'population_density', 'conversion_rate', 'coverage_rate')}
+    }
+
+    outputs = parallel_map_arrays(grid_kernel, inputs, workers=workers)
+    if population_raster is not None:
+        # Curba populației depinde de centru: câte o interogare vectorizată per locație
+        centers = grid[['site_lat', 'site_lon']].to_numpy()
+        for center in np.unique(centers, axis=0):
+            rows = np.flatnonzero((centers == center).all(axis=1))
+            site_campaign = calculate_campaign_scale_batch(
+                outputs['clients_total'][rows],
+                *(inputs[name][rows] for name in ('participation_rate', 'population_density', 'conversion_rate', 'coverage_rate')),
+                population_raster=population_raster,
+                center=(float(center[0]), float(center[1]))
+            )
+            for key in ('radius_km', 'total_population', 'people_to_reach'):
+                outputs[key][rows] = site_campaign[key]
+
+    result = grid.copy()
+    result['occupancy_rate'] = occupancy
+    for name, values in outputs.items():
+        result[name] = values
+    result['meets_target'] = outputs['revenue_total'] >= DESIRED_MONTHLY_REVENUE
+    return result
+
+
+def _part_path(parts_dir: str, chunk: int, output_format: str) -> str:
+    return os.path.join(parts_dir, f"chunk-{chunk:06d}.{output_format}")
+
+
+def _write_frame(df: pd.DataFrame, path: str, output_format: str) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if output_format == 'parquet':
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def _run_chunk(
+    chunk: int,
+    rows: pd.DataFrame,
+    parts_dir: str,
+    output_format: str,
+    population_raster: Optional[str],
+    workers: Optional[int]
+) -> int:
+    _write_frame(evaluate_grid(rows, population_raster, workers=workers), _part_path(parts_dir, chunk, output_format), output_format)
+    return len(rows)
+
+
+def _grid_fingerprint(grid: pd.DataFrame, chunk_size: int, output_format: str, population_raster: Optional[str]) -> str:
+    digest = hashlib.sha256(pd.util.hash_pandas_object(grid, index=False).to_numpy().tobytes())
+    digest.update(json.dumps([chunk_size, output_format, population_raster]).encode())
+    return digest.hexdigest()
+
+
+def _merge_parts(parts_dir: str, chunks: int, output_path: str, output_format: str) -> None:
+    # Concatenare în flux: o singură bucată în memorie la un moment dat
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    if output_format == 'parquet':
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in range(chunks):
+                table = pq.read_table(_part_path(parts_dir, chunk, output_format))
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        with open(tmp_path, 'wb') as output_file:
+            for chunk in range(chunks):
+                with open(_part_path(parts_dir, chunk, output_format), 'rb') as part_file:
+                    if chunk > 0:
+                        part_file.readline()  # antetul apare o singură dată
+                    shutil.copyfileobj(part_file, output_file)
+    os.replace(tmp_path, output_path)
+
+
+def _report_progress(done_chunks: int, total_chunks: int, done_rows: int, started: float, stream=sys.stderr) -> None:
+    elapsed = time.monotonic() - started
+    fraction = done_chunks / total_chunks if total_chunks else 1.0
+    eta = elapsed / fraction - elapsed if fraction > 0 else 0
+    stream.write(
+        f"\r[{done_chunks:>{len(str(total_chunks))}}/{total_chunks}] {fraction * 100:5.1f}% · "
+        f"{done_rows:,} rânduri · {elapsed:.1f}s · ETA {eta:.0f}s"
+    )
+    stream.flush()
+
+
+def run_grid(
+    grid: pd.DataFrame,
+    output_path: str,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    population_raster: Optional[str] = None,
+    restart: bool = False,
+    keep_parts: bool = False,
+    progress: bool = True
+) -> Dict:
+    """
+    Evaluează grila pe bucăți și scrie rezultatul în `output_path`
+
+    Bucățile se evaluează pe rând; fiecare este împărțită între `workers` procese prin
+    memoria partajată din parallel.py (bucățile sub PARALLEL_MIN_ROWS rânduri rulează în procesul
+    curent).
+
+    Bucățile terminate se păstrează în `<output_path>.parts/`; la o nouă rulare cu aceeași grilă
+    se evaluează doar bucățile lipsă. O grilă diferită (sau alți parametri de rulare) necesită
+    `restart=True`.
+
+    Returns:
+        Dict cu 'rows', 'chunks', 'resumed_chunks' (bucăți preluate dintr-o rulare anterioară) și 'seconds'
+    """
+    extension = os.path.splitext(output_path)[1].lower()
+    if extension not in OUTPUT_FORMATS:
+        raise ValueError(f"Format de ieșire necunoscut: {extension} (disponibile: {list(OUTPUT_FORMATS)})")
+    output_format = OUTPUT_FORMATS[extension]
+    parts_dir = f"{output_path}.parts"
+    state_path = os.path.join(parts_dir, 'state.json')
+    fingerprint = _grid_fingerprint(grid, chunk_size, output_format, population_raster)
+
+    if restart and os.path.isdir(parts_dir):
+        shutil.rmtree(parts_dir)
+    if os.path.exists(state_path):
+        with open(state_path, 'r', encoding='utf-8') as state_file:
+            if json.load(state_file)['fingerprint'] != fingerprint:
+                raise ValueError(f"{parts_dir} aparține altei grile sau altor parametri de rulare; folosiți --restart")
+    os.makedirs(parts_dir, exist_ok=True)
+    with open(state_path, 'w', encoding='utf-8') as state_file:
+        json.dump({'fingerprint': fingerprint, 'rows': len(grid), 'chunk_size': chunk_size}, state_file)
+
+    total_chunks = max(1, -(-len(grid) // chunk_size))
+    pending = [chunk for chunk in range(total_chunks) if not os.path.exists(_part_path(parts_dir, chunk, output_format))]
+    resumed = total_chunks - len(pending)
+    done_rows = min(len(grid), resumed * chunk_size)
+    started = time.monotonic()
+    if progress:
+        _report_progress(resumed, total_chunks, done_rows, started)
+
+    def chunk_rows(chunk: int) -> pd.DataFrame:
+        return grid.iloc[chunk * chunk_size:(chunk + 1) * chunk_size]
+
+    done_chunks = resumed
+    for chunk in pending:
+        done_rows += _run_chunk(chunk, chunk_rows(chunk), parts_dir, output_format, population_raster, workers)
+        done_chunks += 1
+        if progress:
+            _report_progress(done_chunks, total_chunks, done_rows, started)
+    if progress:
+        sys.stderr.write("\n")
+
+    _merge_parts(parts_dir, total_chunks, output_path, output_format)
+    if not keep_parts:
+        shutil.rmtree(parts_dir)
+    return {
+        'rows': len(grid),
+        'chunks': total_chunks,
+        'resumed_chunks': resumed,
+        'seconds': time.monotonic() - started
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Evaluează o grilă de parametri pentru dashboard-ul Mobilis Vita")
+    parser.add_argument('grid', help="Fișierul grilei (.json sau .csv)")
+    parser.add_argument('-o', '--output', required=True, help="Fișierul rezultat (.csv sau .parquet)")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="Procese per bucată (implicit: numărul de nuclee)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Rânduri per bucată")
+    parser.add_argument('--population-raster', default=None, help="Raster de populație (vezi population.py)")
+    parser.add_argument('--restart', action='store_true', help="Ignoră bucățile dintr-o rulare anterioară")
+    parser.add_argument('--keep-parts', action='store_true', help="Păstrează bucățile după concatenare")
+    parser.add_argument('-q', '--quiet', action='store_true', help="Fără raport de progres")
+    args = parser.parse_args(argv)
+
+    try:
+        grid = load_parameter_grid(args.grid)
+        summary = run_grid(
+            grid,
+            args.output,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            population_raster=args.population_raster,
+            restart=args.restart,
+            keep_parts=args.keep_parts,
+            progress=not args.quiet
+        )
+    except (OSError, ValueError) as error:
+        print(f"Eroare: {error}", file=sys.stderr)
+        return 1
+
+    resumed = f" ({summary['resumed_chunks']} bucăți reluate)" if summary['resumed_chunks'] else ""
+    print(f"{summary['rows']:,} rânduri în {summary['chunks']} bucăți{resumed} → {args.output} ({summary['seconds']:.1f}s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,499 @@
+"""
+Benchmark-uri pentru căile critice din calculations, competitor_analysis și harta de participare
+
+Fiecare benchmark se rulează pe fixture-uri reproductibile (date sintetice cu seed fix), la trei
+scări: 'small' (un cartier), 'city' (un oraș) și 'country' (o țară). Rezultatele se scriu ca
+JSON și se pot compara cu un baseline salvat anterior; o funcție mai lentă decât baseline-ul cu
+peste pragul dat este raportată ca regresie (cod de ieșire 1, util în CI).
+
+Timpii calculelor sunt pe calea „rece”: înainte de fiecare apel se golesc cache-urile interne
+(grila de blocuri, curbele de populație ale rasterului), altfel s-ar măsura doar căutarea în cache.
+Funcțiile din competitor_analysis rulează pe concurenții generați de fixture (fișier de date și
+snapshot-uri Instagram scrise într-un director temporar); ele măsoară citirea per randare, cu
+datele deja încărcate, iar încărcarea completă are benchmark-uri separate ('[rece]'). Funcțiile
+care nu depind de volumul datelor (SCALE_INDEPENDENT) se măsoară doar pe primul fixture rulat.
+
+Utilizare:
+    python benchmark.py                                   # toate fixture-urile, compară cu baseline-ul
+    python benchmark.py -f small city -o rezultate.json
+    python benchmark.py --save-baseline                   # rezultatele devin noul baseline
+    python benchmark.py -k campaign --threshold 0.5
+
+Baseline-ul depinde de mașină: se generează local (--save-baseline) înainte de modificare și se
+compară după.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+import timeit
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+import competitor_store
+import geo
+import social_metrics
+from calculations import (
+    calculate_clients_needed,
+    calculate_monthly_revenue,
+    calculate_campaign_scale,
+    calculate_clients_batch,
+    calculate_revenue_batch,
+    calculate_campaign_scale_batch,
+    get_scenario_analysis,
+    compare_scenarios,
+    LOCATION,
+    DEFAULT_SUBSCRIPTION_DISTRIBUTION
+)
+from capture import get_capture_surface
+from competitor_analysis import (
+    get_social_media_summary,
+    get_social_media_trends,
+    get_competitive_positioning,
+    calculate_market_position,
+    get_all_competitor_locations
+)
+from geo import get_participation_blocks, blocks_to_records, blocks_to_geojson, DEFAULT_BLOCK_SIZE_KM
+from competitor_store import write_competitor_store
+from population import raster_from_array
+from social_metrics import new_metrics_store, apply_snapshot, append_snapshots, metrics_summary, metrics_trends
+
+
+RESULTS_VERSION = 1
+DEFAULT_BASELINE_PATH = os.path.join('data', 'benchmark_baseline.json')
+
+# Regresie: timpul minim curent depășește minimul din baseline cu peste această fracție
+# (minimul este cel mai puțin afectat de zgomotul altor procese, ca în timeit)
+DEFAULT_THRESHOLD = 0.25
+
+# Repetări per benchmark (se raportează minimul și mediana)
+DEFAULT_REPEAT = 5
+
+FIXTURE_SEED = 20240601
+
+# Scările fixture-urilor: rasterul de populație (celule ~250 m), grila hărții, rândurile
+# funcțiilor vectorizate și volumul de date sociale (concurenți × zile de snapshot-uri)
+FIXTURES = {
+    'small': {
+        'raster_shape': (80, 80),
+        'grid_size': 7,
+        'batch_rows': 1_000,
+        'competitors': 20,
+        'snapshot_days': 14
+    },
+    'city': {
+        'raster_shape': (400, 400),
+        'grid_size': 61,
+        'batch_rows': 100_000,
+        'competitors': 500,
+        'snapshot_days': 60
+    },
+    'country': {
+        'raster_shape': (2400, 3600),
+        'grid_size': 301,
+        'batch_rows': 2_000_000,
+        'competitors': 5_000,
+        'snapshot_days': 60
+    }
+}
+
+# Dimensiunea unei celule de raster în grade (~250 m)
+RASTER_CELL_DEG = 0.0025
+
+BENCHMARK_PARAMETERS = {
+    'participation_rate': 0.10,
+    'population_density': 1000,
+    'conversion_rate': 0.05,
+    'coverage_rate': 0.50
+}
+
+
+def build_fixture(name: str) -> Dict:
+    """
+    Datele sintetice ale unui fixture (deterministe pentru un nume dat)
+
+    Concurenții (cu Instagram și 1-3 locații în jurul sălii) și snapshot-urile lor se scriu în
+    directorul temporar 'data_dir', șters de `remove_fixture`.
+
+    Returns:
+        Dict cu parametrii din FIXTURES plus 'raster' (în memorie, centrat pe sală), vectorii
+        'occupancy', 'distribution', 'total_clients' (câte `batch_rows`), 'snapshots',
+        'competitor_data' și 'snapshot_path'
+    """
+    spec = FIXTURES[name]
+    rng = np.random.default_rng([FIXTURE_SEED, list(FIXTURES).index(name)])
+
+    # Populație log-normală, mai densă spre centru (sala este în mijlocul rasterului)
+    rows, cols = spec['raster_shape']
+    row_offset = (np.arange(rows) - rows / 2)[:, None] / rows
+    col_offset = (np.arange(cols) - cols / 2)[None, :] / cols
+    falloff = np.exp(-8 * (row_offset ** 2 + col_offset ** 2))
+    population = rng.lognormal(mean=3.0, sigma=1.2, size=(rows, cols)) * falloff * 20
+    center_lat, center_lon = LOCATION['coordinates']
+    raster = raster_from_array(
+        population,
+        lat_top=center_lat + rows / 2 * RASTER_CELL_DEG,
+        lon_left=center_lon - cols / 2 * RASTER_CELL_DEG,
+        cell_lat=RASTER_CELL_DEG,
+        cell_lon=RASTER_CELL_DEG
+    )
+
+    batch_rows = spec['batch_rows']
+    distribution = rng.dirichlet(np.ones(len(DEFAULT_SUBSCRIPTION_DISTRIBUTION)), size=batch_rows)
+
+    # Concurenții sunt răspândiți pe toată suprafața rasterului
+    categories = ('fitness', 'kineto', 'masaj', 'terapii')
+    extended = {category: [] for category in categories}
+    for competitor in range(spec['competitors']):
+        category = categories[competitor % len(categories)]
+        locations = [
+            {
+                'name': f"Locația {location + 1}",
+                'address': 'N/A',
+                'coordinates': (
+                    float(center_lat + rng.uniform(-0.5, 0.5) * rows * RASTER_CELL_DEG),
+                    float(center_lon + rng.uniform(-0.5, 0.5) * cols * RASTER_CELL_DEG)
+                ),
+                'area_m2': int(rng.integers(50, 800)),
+                'capacity_simultaneous': int(rng.integers(5, 60))
+            }
+            for location in range(int(rng.integers(1, 4)))
+        ]
+        extended[category].append({
+            'id': f"c{competitor}",
+            'name': f"Concurent {competitor}",
+            'category': category,
+            'locations': locations,
+            'social_media': {'instagram': {
+                'followers': 1000 + competitor * 7,
+                'engagement_rate': float(2 + (competitor % 50) / 10),
+                'posts_per_week': float(1 + competitor % 7)
+            }}
+        })
+
+    start = date(2024, 1, 1)
+    snapshots = [
+        {
+            'competitor_id': f"c{competitor}",
+            'category': categories[competitor % len(categories)],
+            'date': (start + timedelta(days=day)).isoformat(),
+            'followers': int(1000 + competitor * 7 + day * 3),
+            'engagement_rate': float(2 + (competitor % 50) / 10),
+            'posts_per_week': float(1 + competitor % 7)
+        }
+        for day in range(spec['snapshot_days'])
+        for competitor in range(spec['competitors'])
+    ]
+
+    data_dir = tempfile.mkdtemp(prefix=f"benchmark_{name}_")
+    competitor_data = os.path.join(data_dir, 'competitors.json')
+    snapshot_path = os.path.join(data_dir, 'social_snapshots.jsonl')
+    write_competitor_store(competitor_data, extended, {})
+    append_snapshots(snapshots, snapshot_path)
+
+    return {
+        **spec,
+        'name': name,
+        'raster': raster,
+        'occupancy': rng.uniform(0.25, 1.0, batch_rows),
+        'distribution': distribution,
+        'total_clients': rng.integers(50, 2000, batch_rows),
+        'snapshots': snapshots,
+        'data_dir': data_dir,
+        'competitor_data': competitor_data,
+        'snapshot_path': snapshot_path
+    }
+
+
+def remove_fixture(fixture: Dict) -> None:
+    """
+    Șterge fișierele temporare ale unui fixture
+    """
+    shutil.rmtree(fixture['data_dir'], ignore_errors=True)
+
+
+@contextmanager
+def fixture_data(fixture: Dict) -> Iterator[None]:
+    """
+    Datele concurenților și snapshot-urile fixture-ului devin sursa aplicației (COMPETITOR_DATA,
+    SOCIAL_SNAPSHOTS) pe durata blocului `with`
+    """
+    previous = {name: os.environ.get(name) for name in ('COMPETITOR_DATA', 'SOCIAL_SNAPSHOTS')}
+    os.environ['COMPETITOR_DATA'] = fixture['competitor_data']
+    os.environ['SOCIAL_SNAPSHOTS'] = fixture['snapshot_path']
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _cold(fixture: Dict) -> None:
+    # Golește cache-urile interne, pentru timpi pe calea completă de calcul
+    geo._block_grid.cache_clear()
+    fixture['raster']['distance_curves'].clear()
+
+
+def _load_competitors() -> int:
+    # Încărcarea completă a fișierului de concurenți (indexuri, locații aplatizate)
+    competitor_store._load_store.cache_clear()
+    return len(competitor_store.get_competitor_store()['locations'])
+
+
+def _rebuild_social_metrics() -> Dict:
+    # Reconstruirea agregatelor: valorile de pornire plus toate snapshot-urile din fișier
+    social_metrics._LOADED.clear()
+    return get_social_media_summary()
+
+
+def _metrics_store(fixture: Dict) -> Dict:
+    store = new_metrics_store()
+    for snapshot in fixture['snapshots']:
+        apply_snapshot(store, snapshot)
+    return store
+
+
+def _tab5_grid(fixture: Dict) -> int:
+    # Aceeași succesiune ca în secțiunea „Hartă Participare” din app.py (fără desenarea folium)
+    analysis = get_scenario_analysis('medium', DEFAULT_SUBSCRIPTION_DISTRIBUTION, **BENCHMARK_PARAMETERS, population_raster=fixture['raster'])
+    blocks = get_participation_blocks(
+        LOCATION['coordinates'],
+        analysis['influence_radius_km'],
+        analysis['total_clients'],
+        BENCHMARK_PARAMETERS['participation_rate'],
+        BENCHMARK_PARAMETERS['population_density'],
+        block_size_km=DEFAULT_BLOCK_SIZE_KM,
+        grid_size=fixture['grid_size'],
+        population_raster=fixture['raster']
+    )
+    capture = get_capture_surface(blocks['lat'], blocks['lon'], LOCATION['coordinates'])
+    blocks = {**blocks, 'capture': capture['capture']}
+    blocks_to_records(blocks)
+    return len(blocks_to_geojson(blocks, DEFAULT_BLOCK_SIZE_KM)['features'])
+
+
+# Nume → funcție care primește fixture-ul și returnează apelul măsurat (fără argumente)
+BENCHMARKS: Dict[str, Callable[[Dict], Callable[[], object]]] = {
+    'calculations.calculate_clients_needed': lambda f: lambda: calculate_clients_needed(0.75, DEFAULT_SUBSCRIPTION_DISTRIBUTION),
+    'calculations.calculate_monthly_revenue': lambda f: lambda: calculate_monthly_revenue(0.75, DEFAULT_SUBSCRIPTION_DISTRIBUTION),
+    'calculations.calculate_campaign_scale': lambda f: lambda: (
+        _cold(f), calculate_campaign_scale(433, **BENCHMARK_PARAMETERS, population_raster=f['raster'])
+    ),
+    'calculations.calculate_clients_batch': lambda f: lambda: calculate_clients_batch(
+        f['occupancy'], f['distribution'], list(DEFAULT_SUBSCRIPTION_DISTRIBUTION)
+    ),
+    'calculations.calculate_revenue_batch': lambda f: lambda: calculate_revenue_batch(
+        f['occupancy'], f['distribution'], list(DEFAULT_SUBSCRIPTION_DISTRIBUTION)
+    ),
+    'calculations.calculate_campaign_scale_batch': lambda f: lambda: calculate_campaign_scale_batch(
+        f['total_clients'], BENCHMARK_PARAMETERS['participation_rate'], BENCHMARK_PARAMETERS['population_density']
+    ),
+    'calculations.get_scenario_analysis': lambda f: lambda: (
+        _cold(f), get_scenario_analysis('medium', DEFAULT_SUBSCRIPTION_DISTRIBUTION, **BENCHMARK_PARAMETERS, population_raster=f['raster'])
+    ),
+    'calculations.compare_scenarios': lambda f: lambda: (
+        _cold(f), compare_scenarios(DEFAULT_SUBSCRIPTION_DISTRIBUTION, **BENCHMARK_PARAMETERS, population_raster=f['raster'])
+    ),
+    'competitor_analysis.get_social_media_summary': lambda f: get_social_media_summary,
+    'competitor_analysis.get_social_media_trends': lambda f: lambda: get_social_media_trends(30),
+    'competitor_analysis.get_social_media_summary[rece]': lambda f: _rebuild_social_metrics,
+    'competitor_analysis.get_competitive_positioning': lambda f: get_competitive_positioning,
+    'competitor_analysis.calculate_market_position': lambda f: lambda: calculate_market_position(433, 50),
+    'competitor_analysis.get_all_competitor_locations': lambda f: get_all_competitor_locations,
+    'competitor_store.get_competitor_store[rece]': lambda f: _load_competitors,
+    'social_metrics.apply_snapshot': lambda f: lambda: _metrics_store(f),
+    'social_metrics.metrics_summary': lambda f: (lambda store: lambda: (metrics_summary(store), metrics_trends(store, 30)))(_metrics_store(f)),
+    'geo.get_participation_blocks': lambda f: lambda: (
+        _cold(f), get_participation_blocks(
+            LOCATION['coordinates'], 3.0, 433,
+            BENCHMARK_PARAMETERS['participation_rate'], BENCHMARK_PARAMETERS['population_density'],
+            grid_size=f['grid_size'], population_raster=f['raster']
+        )
+    ),
+    'app.tab5_grid': lambda f: lambda: (_cold(f), _tab5_grid(f))
+}
+
+
+# Benchmark-uri care nu citesc datele fixture-ului (constante din calculations / competitor_analysis)
+SCALE_INDEPENDENT = {
+    'calculations.calculate_clients_needed',
+    'calculations.calculate_monthly_revenue',
+    'competitor_analysis.get_competitive_positioning',
+    'competitor_analysis.calculate_market_position'
+}
+
+
+def time_call(func: Callable[[], object], repeat: int = DEFAULT_REPEAT) -> Dict[str, float]:
+    """
+    Măsoară un apel: numărul de apeluri per repetare se alege automat (≥ 0.2 s), ca în timeit
+
+    Returns:
+        Dict cu 'min_s', 'median_s', 'mean_s' (secunde per apel), 'number' și 'repeat'
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    per_call = [total / number for total in timer.repeat(repeat=repeat, number=number)]
+    return {
+        'min_s': min(per_call),
+        'median_s': statistics.median(per_call),
+        'mean_s': statistics.fmean(per_call),
+        'number': number,
+        'repeat': repeat
+    }
+
+
+def run_benchmarks(
+    fixtures: Optional[List[str]] = None,
+    pattern: Optional[str] = None,
+    repeat: int = DEFAULT_REPEAT,
+    progress: Optional[Callable[[str, str, Dict], None]] = None
+) -> Dict:
+    """
+    Rulează benchmark-urile pe fixture-urile date
+
+    Args:
+        fixtures: Numele fixture-urilor (implicit toate din FIXTURES)
+        pattern: Rulează doar benchmark-urile al căror nume conține acest text
+        progress: Apelată după fiecare benchmark cu (fixture, nume, rezultat)
+
+    Returns:
+        Dict cu 'version', 'created_at', 'environment', 'fixtures' (parametrii) și
+        'results' (fixture → nume benchmark → timpi)
+    """
+    fixtures = fixtures or list(FIXTURES)
+    unknown = set(fixtures) - set(FIXTURES)
+    if unknown:
+        raise ValueError(f"Fixture necunoscut: {sorted(unknown)} (disponibile: {list(FIXTURES)})")
+    names = [name for name in BENCHMARKS if not pattern or pattern in name]
+
+    results = {}
+    for position, fixture_name in enumerate(fixtures):
+        fixture = build_fixture(fixture_name)
+        results[fixture_name] = {}
+        try:
+            with fixture_data(fixture):
+                for name in names:
+                    if position > 0 and name in SCALE_INDEPENDENT:
+                        continue
+                    result = time_call(BENCHMARKS[name](fixture), repeat)
+                    results[fixture_name][name] = result
+                    if progress:
+                        progress(fixture_name, name, result)
+        finally:
+            remove_fixture(fixture)
+        del fixture
+
+    return {
+        'version': RESULTS_VERSION,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count()
+        },
+        'fixtures': {name: FIXTURES[name] for name in fixtures},
+        'results': results
+    }
+
+
+def compare_results(current: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """
+    Compară timpii minimi cu baseline-ul, pentru benchmark-urile prezente în ambele
+
+    Returns:
+        Listă de dict-uri cu 'fixture', 'benchmark', 'baseline_s', 'current_s', 'ratio'
+        (curent / baseline) și 'status' ('regresie', 'îmbunătățire' sau 'ok')
+    """
+    rows = []
+    for fixture_name, benchmarks in current['results'].items():
+        for name, result in benchmarks.items():
+            reference = baseline.get('results', {}).get(fixture_name, {}).get(name)
+            if reference is None:
+                continue
+            ratio = result['min_s'] / reference['min_s'] if reference['min_s'] > 0 else float('inf')
+            if ratio > 1 + threshold:
+                status = 'regresie'
+            elif ratio < 1 / (1 + threshold):
+                status = 'îmbunătățire'
+            else:
+                status = 'ok'
+            rows.append({
+                'fixture': fixture_name,
+                'benchmark': name,
+                'baseline_s': reference['min_s'],
+                'current_s': result['min_s'],
+                'ratio': ratio,
+                'status': status
+            })
+    return rows
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('µs', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def _write_json(path: str, data: Dict) -> None:
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(f"{path}.tmp", 'w', encoding='utf-8') as output:
+        json.dump(data, output, ensure_ascii=False, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark-uri pentru calculele și harta dashboard-ului Mobilis Vita")
+    parser.add_argument('-f', '--fixtures', nargs='+', choices=list(FIXTURES), help="Scările rulate (implicit toate)")
+    parser.add_argument('-k', dest='pattern', help="Doar benchmark-urile care conțin acest text")
+    parser.add_argument('-o', '--output', help="Fișierul JSON cu rezultatele")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH, help=f"Baseline-ul de comparat (implicit {DEFAULT_BASELINE_PATH})")
+    parser.add_argument('--save-baseline', action='store_true', help="Salvează rezultatele ca baseline în loc să compare")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="Încetinirea relativă considerată regresie (0.25 = +25%%)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('-q', '--quiet', action='store_true')
+    args = parser.parse_args(argv)
+
+    def progress(fixture_name: str, name: str, result: Dict) -> None:
+        if not args.quiet:
+            print(f"[{fixture_name:>7}] {name:<50} {_format_seconds(result['min_s']):>10}  (mediana {_format_seconds(result['median_s'])})")
+
+    current = run_benchmarks(args.fixtures, args.pattern, args.repeat, progress)
+    if args.output:
+        _write_json(args.output, current)
+
+    if args.save_baseline:
+        _write_json(args.baseline, current)
+        print(f"Baseline salvat în {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"Nu există baseline ({args.baseline}); rulați cu --save-baseline pentru a-l crea")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as baseline_file:
+        baseline = json.load(baseline_file)
+    comparison = compare_results(current, baseline, args.threshold)
+    regressions = [row for row in comparison if row['status'] == 'regresie']
+    for row in comparison:
+        if row['status'] != 'ok' or not args.quiet:
+            print(
+                f"{row['status']:>12}  [{row['fixture']}] {row['benchmark']}: "
+                f"{_format_seconds(row['baseline_s'])} → {_format_seconds(row['current_s'])} (×{row['ratio']:.2f})"
+            )
+    print(f"{len(comparison)} benchmark-uri comparate, {len(regressions)} regresii (prag +{args.threshold:.0%})")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
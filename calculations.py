@@ -3,7 +3,9 @@ Modul pentru calculele de bază ale analizei potențialului spațiului fitness
 """
 import numpy as np
 import pandas as pd
-from typing import Dict, Tuple
+from typing import Dict, Optional, Sequence, Tuple
+
+from population import resolve_raster, radius_for_population, population_at_radius, campaign_scale_from_raster
 
 
 # Configurație spațiu - Mobilis Vita
@@ -64,6 +66,16 @@ SUBSCRIPTION_TYPES = {
     }
 }
 
+# Distribuția implicită a serviciilor (fracțiuni din slot-uri), folosită de export, API, CLI și benchmark
+DEFAULT_SUBSCRIPTION_DISTRIBUTION = {
+    'clase_miscare': 0.5,
+    'fitness_access': 0.2,
+    'complet': 0.15,
+    'family': 0.05,
+    'masaj': 0.05,
+    'kineto': 0.05
+}
+
 # Concurenți
 COMPETITORS = {
     'redgym': {
@@ -173,6 +185,164 @@ def calculate_occupied_slots(occupancy_rate: float) -> int:
     return int(max_capacity * occupancy_rate)
 
 
+def _subscription_arrays(subscription_keys: Sequence[str]) -> Dict[str, np.ndarray]:
+    """
+    Construiește vectorii de parametri (preț, tip sesiune, sesiuni) pentru o listă de chei de servicii
+    
+    Cheile care nu există în SUBSCRIPTION_TYPES primesc valori neutre și sunt marcate ca necunoscute.
+    """
+    known = np.array([key in SUBSCRIPTION_TYPES for key in subscription_keys], dtype=bool)
+    price = np.zeros(len(subscription_keys), dtype=np.int64)
+    is_session = np.zeros(len(subscription_keys), dtype=bool)
+    sessions = np.zeros(len(subscription_keys), dtype=np.float64)
+    
+    for idx, key in enumerate(subscription_keys):
+        sub_info = SUBSCRIPTION_TYPES.get(key)
+        if sub_info is None:
+            continue
+        price[idx] = sub_info['price']
+        is_session[idx] = sub_info.get('is_session_based', False)
+        sessions[idx] = sub_info['sessions'] if sub_info.get('sessions') is not None else 0
+    
+    return {
+        'known': known,
+        'price': price,
+        'is_session': is_session,
+        'unlimited': known & ~is_session & (sessions == 0),
+        'sessions': sessions
+    }
+
+
+def calculate_clients_batch(
+    occupancy_rates,
+    distribution_matrix,
+    subscription_keys: Optional[Sequence[str]] = None,
+    max_capacity=None
+) -> Dict[str, np.ndarray]:
+    """
+    Calculează vectorizat clienții/sesiunile pentru N combinații (ocupare, distribuție)
+    
+    Aceeași logică ca `calculate_clients_needed`, aplicată pe toate rândurile într-o singură trecere NumPy.
+    
+    Args:
+        occupancy_rates: Rate de ocupare (scalar sau vector de lungime N)
+        distribution_matrix: Matrice N×K cu procentajele pe tip de serviciu (sau vector de lungime K)
+        subscription_keys: Cheile coloanelor (default: ordinea din SUBSCRIPTION_TYPES)
+        max_capacity: Capacitatea lunară în slot-uri (scalar sau vector N); default `calculate_max_capacity()`
+    
+    Returns:
+        Dict cu 'occupied_slots' (N), 'clients' (N×K), 'sessions' (N×K), 'total_clients' (N)
+        și 'subscription_keys'. 'total_clients' include și sesiunile, ca în `get_scenario_analysis`.
+    """
+    if subscription_keys is None:
+        subscription_keys = list(SUBSCRIPTION_TYPES.keys())
+    subscription_keys = list(subscription_keys)
+    
+    distribution = np.atleast_2d(np.asarray(distribution_matrix, dtype=np.float64))
+    occupancy = np.asarray(occupancy_rates, dtype=np.float64).reshape(-1)
+    if distribution.shape[1] != len(subscription_keys):
+        raise ValueError(
+            f"Matricea de distribuție are {distribution.shape[1]} coloane, "
+            f"dar au fost date {len(subscription_keys)} chei de servicii"
+        )
+    if max_capacity is None:
+        max_capacity = calculate_max_capacity()
+    capacity = np.asarray(max_capacity, dtype=np.float64).reshape(-1)
+    num_rows = np.broadcast_shapes(occupancy.shape, distribution.shape[:1], capacity.shape)[0]
+    occupancy = np.broadcast_to(occupancy, (num_rows,))
+    capacity = np.broadcast_to(capacity, (num_rows,))
+    distribution = np.broadcast_to(distribution, (num_rows, len(subscription_keys)))
+    
+    params = _subscription_arrays(subscription_keys)
+    
+    # Slot-uri ocupate: int() trunchiază spre zero, la fel ca în calculate_occupied_slots
+    occupied_slots = np.trunc(capacity * occupancy).astype(np.int64)
+    active = (distribution > 0) & params['known']
+    sub_slots = occupied_slots[:, None] * distribution
+    
+    # Servicii per sesiune: 1 slot = 1 sesiune, 5 sesiuni/lună per client
+    avg_sessions_per_client = 5
+    session_count = np.maximum(0, np.round(sub_slots)).astype(np.int64)
+    session_clients = np.maximum(0, np.ceil(session_count / avg_sessions_per_client))
+    
+    # Abonamente nelimitate: 3 vizite pe săptămână per client
+    avg_visits_per_week = 3
+    unlimited_clients = np.maximum(0, np.ceil(sub_slots / WEEKS_PER_MONTH / avg_visits_per_week))
+    
+    # Abonamente cu sesiuni limitate (dacă ar exista)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        limited_clients = np.maximum(0, np.ceil(sub_slots / params['sessions']))
+    
+    clients = np.where(
+        params['is_session'],
+        session_clients,
+        np.where(params['unlimited'], unlimited_clients, limited_clients)
+    )
+    clients = np.where(active, clients, 0).astype(np.int64)
+    sessions = np.where(active & params['is_session'], session_count, 0).astype(np.int64)
+    
+    return {
+        'subscription_keys': subscription_keys,
+        'occupied_slots': occupied_slots,
+        'clients': clients,
+        'sessions': sessions,
+        'total_clients': clients.sum(axis=1) + sessions.sum(axis=1)
+    }
+
+
+def calculate_revenue_batch(
+    occupancy_rates,
+    distribution_matrix,
+    subscription_keys: Optional[Sequence[str]] = None,
+    prices=None,
+    max_capacity=None
+) -> Dict[str, np.ndarray]:
+    """
+    Calculează vectorizat veniturile lunare pentru N combinații (ocupare, distribuție)
+    
+    Args:
+        prices: Prețuri alternative (vector K sau matrice N×K); default prețurile din SUBSCRIPTION_TYPES
+        max_capacity: Capacitatea lunară în slot-uri (scalar sau vector N), ca în `calculate_clients_batch`
+    
+    Returns:
+        Dict-ul din `calculate_clients_batch` plus 'revenue' (N×K) și 'total' (N)
+    """
+    result = calculate_clients_batch(occupancy_rates, distribution_matrix, subscription_keys, max_capacity)
+    params = _subscription_arrays(result['subscription_keys'])
+    price = params['price'] if prices is None else np.asarray(prices)
+    
+    # Serviciile per sesiune se plătesc per sesiune, abonamentele lunar per client
+    billable = np.where(params['is_session'], result['sessions'], result['clients'])
+    revenue = np.where(result['clients'] > 0, billable * price, 0)
+    if prices is None:
+        revenue = revenue.astype(np.int64)
+    
+    result['revenue'] = revenue
+    result['total'] = revenue.sum(axis=1)
+    return result
+
+
+def _clients_row_to_dict(
+    batch: Dict[str, np.ndarray],
+    row: int,
+    subscription_distribution: Dict[str, float]
+) -> Dict[str, int]:
+    """
+    Convertește un rând din rezultatul batch în formatul dict folosit de `calculate_clients_needed`
+    """
+    clients = {}
+    for idx, sub_type in enumerate(batch['subscription_keys']):
+        clients[sub_type] = int(batch['clients'][row, idx])
+        # Pentru serviciile per sesiune stocăm și numărul de sesiuni pentru calculele de venit
+        if (
+            sub_type in SUBSCRIPTION_TYPES
+            and subscription_distribution[sub_type] > 0
+            and SUBSCRIPTION_TYPES[sub_type].get('is_session_based', False)
+        ):
+            clients[f'{sub_type}_sessions'] = int(batch['sessions'][row, idx])
+    return clients
+
+
 def calculate_clients_needed(
     occupancy_rate: float,
     subscription_distribution: Dict[str, float]
@@ -188,44 +358,9 @@ def calculate_clients_needed(
     Returns:
         Dict cu numărul de clienți/sesiuni pentru fiecare tip
     """
-    occupied_slots = calculate_occupied_slots(occupancy_rate)
-    
-    clients = {}
-    
-    # Pentru fiecare tip de serviciu (inclusiv PT)
-    for sub_type, pct in subscription_distribution.items():
-        if pct > 0 and sub_type in SUBSCRIPTION_TYPES:
-            sub_info = SUBSCRIPTION_TYPES[sub_type]
-            # Slot-uri ocupate de acest tip = slot-uri totale × procentaj
-            sub_slots = occupied_slots * pct
-            
-            if sub_info.get('is_session_based', False):
-                # PT/Reabilitare: fiecare slot = 1 sesiune
-                # Numărul de sesiuni = numărul de slot-uri ocupate
-                num_sessions = max(0, int(np.round(sub_slots)))
-                # Pentru a calcula clienți: presupunem că fiecare client face în medie 4-6 sesiuni/lună
-                # Folosim 5 sesiuni/lună per client ca medie pentru reabilitare
-                avg_sessions_per_client = 5
-                num_clients = max(0, int(np.ceil(num_sessions / avg_sessions_per_client)))
-                # Returnăm numărul de clienți, nu sesiuni (pentru consistență cu celelalte servicii)
-                clients[sub_type] = num_clients
-                # Stocăm și numărul de sesiuni pentru calculele de venit
-                clients[f'{sub_type}_sessions'] = num_sessions
-            elif sub_info.get('sessions') is None:
-                # Abonamente nelimitate (standard, basic, premium)
-                # Presupunem 3 vizite pe săptămână per client
-                avg_visits_per_week = 3
-                slots_per_week = sub_slots / WEEKS_PER_MONTH
-                num_clients = max(0, int(np.ceil(slots_per_week / avg_visits_per_week)))
-                clients[sub_type] = num_clients
-            else:
-                # Abonamente cu sesiuni limitate (dacă ar exista)
-                num_clients = max(0, int(np.ceil(sub_slots / sub_info['sessions'])))
-                clients[sub_type] = num_clients
-        else:
-            clients[sub_type] = 0
-    
-    return clients
+    keys = list(subscription_distribution.keys())
+    batch = calculate_clients_batch(occupancy_rate, [[subscription_distribution[k] for k in keys]], keys)
+    return _clients_row_to_dict(batch, 0, subscription_distribution)
 
 
 def calculate_monthly_revenue(
@@ -238,41 +373,147 @@ def calculate_monthly_revenue(
     Returns:
         Dict cu venituri totale și pe tip de serviciu
     """
-    clients = calculate_clients_needed(occupancy_rate, subscription_distribution)
+    keys = list(subscription_distribution.keys())
+    batch = calculate_revenue_batch(occupancy_rate, [[subscription_distribution[k] for k in keys]], keys)
     
-    revenues = {}
-    total_revenue = 0
+    revenues = {sub_type: int(batch['revenue'][0, idx]) for idx, sub_type in enumerate(keys)}
+    revenues['total'] = int(batch['total'][0])
+    revenues['clients'] = _clients_row_to_dict(batch, 0, subscription_distribution)
     
-    # Calculează venituri pentru fiecare tip de abonament
-    for sub_type, num_clients in clients.items():
-        # Ignoră cheile care sunt doar pentru sesiuni (ex: 'pt_session_sessions')
-        if sub_type.endswith('_sessions'):
-            continue
-            
-        if sub_type in SUBSCRIPTION_TYPES and num_clients > 0:
-            sub_info = SUBSCRIPTION_TYPES[sub_type]
-            if sub_info.get('is_session_based', False):
-                # PT/Reabilitare: se plătește per sesiune
-                # Folosim numărul de sesiuni, nu clienți
-                num_sessions = clients.get(f'{sub_type}_sessions', num_clients * 5)  # Fallback: 5 sesiuni per client
-                revenues[sub_type] = num_sessions * sub_info['price']
-            else:
-                # Abonamente lunare
-                revenues[sub_type] = num_clients * sub_info['price']
-            total_revenue += revenues[sub_type]
+    return revenues
+
+
+def _occupancy_for_slots(occupied_slots: int) -> float:
+    """
+    Cea mai mică rată de ocupare pentru care `calculate_occupied_slots` returnează cel puțin `occupied_slots`
+    """
+    max_capacity = calculate_max_capacity()
+    occupancy = occupied_slots / max_capacity
+    # Corecție pentru erorile de rotunjire în virgulă mobilă (int() trunchiază)
+    while int(max_capacity * occupancy) < occupied_slots:
+        occupancy = float(np.nextafter(occupancy, np.inf))
+    return occupancy
+
+
+def revenue_per_slot(subscription_keys: Optional[Sequence[str]] = None) -> Dict[str, float]:
+    """
+    Venitul liniarizat adus de un slot ocupat pentru fiecare tip de serviciu (fără rotunjirile ceil)
+    
+    Serviciile per sesiune aduc prețul întreg per slot; abonamentele nelimitate aduc
+    prețul împărțit la numărul de slot-uri folosite lunar de un client (3 vizite × 4.33 săptămâni).
+    """
+    if subscription_keys is None:
+        subscription_keys = list(SUBSCRIPTION_TYPES.keys())
+    
+    rates = {}
+    for sub_type in subscription_keys:
+        sub_info = SUBSCRIPTION_TYPES[sub_type]
+        if sub_info.get('is_session_based', False):
+            rates[sub_type] = float(sub_info['price'])
+        elif sub_info.get('sessions') is None:
+            rates[sub_type] = sub_info['price'] / (3 * WEEKS_PER_MONTH)
         else:
-            revenues[sub_type] = 0
+            rates[sub_type] = sub_info['price'] / sub_info['sessions']
+    return rates
+
+
+def solve_min_occupancy(
+    target_revenue: float,
+    subscription_distribution: Dict[str, float],
+    max_occupancy: float = 1.0
+) -> Dict:
+    """
+    Găsește ocuparea minimă care atinge venitul țintă pentru o distribuție fixă
     
-    revenues['total'] = total_revenue
-    revenues['clients'] = clients
+    Venitul este o funcție în trepte, nedescrescătoare, de numărul de slot-uri ocupate,
+    deci ocuparea minimă se găsește prin bisecție pe numărul întreg de slot-uri (~12 evaluări).
     
-    return revenues
+    Returns:
+        Dict cu 'feasible', 'occupancy_rate', 'occupied_slots' și 'revenue' (venitul la acea ocupare)
+    """
+    keys = list(subscription_distribution.keys())
+    row = [[subscription_distribution[k] for k in keys]]
+    
+    def total_revenue(slots: int) -> int:
+        return int(calculate_revenue_batch(_occupancy_for_slots(slots), row, keys)['total'][0])
+    
+    low, high = 0, calculate_occupied_slots(max_occupancy)
+    if total_revenue(high) < target_revenue:
+        return {
+            'feasible': False,
+            'occupancy_rate': None,
+            'occupied_slots': None,
+            'revenue': total_revenue(high)
+        }
+    
+    while low < high:
+        mid = (low + high) // 2
+        if total_revenue(mid) >= target_revenue:
+            high = mid
+        else:
+            low = mid + 1
+    
+    return {
+        'feasible': True,
+        'occupancy_rate': _occupancy_for_slots(low),
+        'occupied_slots': low,
+        'revenue': total_revenue(low)
+    }
+
+
+def solve_revenue_target(
+    target_revenue: float = DESIRED_MONTHLY_REVENUE,
+    share_bounds: Optional[Dict[str, Tuple[float, float]]] = None,
+    max_occupancy: float = 1.0
+) -> Dict:
+    """
+    Găsește mixul de servicii și ocuparea minimă necesare pentru un venit țintă
+    
+    Mixul maximizează venitul liniarizat per slot (`revenue_per_slot`) sub limitele min/max
+    pe fiecare serviciu: fiecare serviciu primește minimul, iar restul se alocă serviciilor
+    cu venit per slot cel mai mare (soluția exactă a LP-ului cu constrângeri de tip cutie).
+    Ocuparea minimă pentru acest mix se calculează apoi exact cu `solve_min_occupancy`.
+    
+    Args:
+        target_revenue: Venitul lunar țintă (RON)
+        share_bounds: Dict {tip_serviciu: (procent_min, procent_max)}; serviciile lipsă au (0, 1)
+        max_occupancy: Ocuparea maximă acceptată (0-1)
+    
+    Returns:
+        Dict cu 'feasible', 'distribution', 'occupancy_rate', 'occupied_slots' și 'revenue'
+    """
+    share_bounds = share_bounds or {}
+    unknown = set(share_bounds) - set(SUBSCRIPTION_TYPES)
+    if unknown:
+        raise ValueError(f"Tipuri de servicii necunoscute: {', '.join(sorted(unknown))}")
+    
+    keys = list(SUBSCRIPTION_TYPES.keys())
+    lower = {k: float(share_bounds.get(k, (0.0, 1.0))[0]) for k in keys}
+    upper = {k: float(share_bounds.get(k, (0.0, 1.0))[1]) for k in keys}
+    if any(lower[k] > upper[k] for k in keys) or sum(lower.values()) > 1 + 1e-9 or sum(upper.values()) < 1 - 1e-9:
+        raise ValueError("Limitele de distribuție nu permit o distribuție care să însumeze 100%")
+    
+    rates = revenue_per_slot(keys)
+    distribution = dict(lower)
+    remaining = 1.0 - sum(lower.values())
+    for sub_type in sorted(keys, key=lambda k: rates[k], reverse=True):
+        if remaining <= 0:
+            break
+        extra = min(upper[sub_type] - lower[sub_type], remaining)
+        distribution[sub_type] += extra
+        remaining -= extra
+    
+    result = solve_min_occupancy(target_revenue, distribution, max_occupancy)
+    result['distribution'] = distribution
+    return result
 
 
 def calculate_influence_radius(
     total_clients_needed: int,
     participation_rate: float,
-    population_density: float  # oameni/km²
+    population_density: float,  # oameni/km²
+    population_raster=None,
+    center: Optional[Tuple[float, float]] = None
 ) -> float:
     """
     Calculează raza de influență necesară (în km)
@@ -281,13 +522,20 @@ def calculate_influence_radius(
         total_clients_needed: Numărul total de clienți necesari
         participation_rate: Rata de participare a populației (0-1, ex: 0.10 = 10%)
         population_density: Densitatea populației (oameni/km²)
+        population_raster: Calea sau rasterul de populație (vezi population.py); înlocuiește densitatea uniformă
+        center: Centrul zonei pentru raster (default: LOCATION)
     
     Returns:
         Raza de influență în km
     """
-    if participation_rate == 0 or population_density == 0:
+    if participation_rate == 0 or (population_density == 0 and population_raster is None):
         return 0
     
+    raster = resolve_raster(population_raster)
+    if raster is not None:
+        center = center or LOCATION['coordinates']
+        return float(radius_for_population(raster, center[0], center[1], total_clients_needed / participation_rate))
+    
     # Populația disponibilă per km²
     available_population_per_km2 = population_density * participation_rate
     
@@ -305,7 +553,9 @@ def calculate_campaign_scale(
     participation_rate: float,
     population_density: float,
     conversion_rate: float = 0.05,  # 5% conversie din cei atinși
-    coverage_rate: float = 0.50  # 50% din populația interesată trebuie atinsă
+    coverage_rate: float = 0.50,  # 50% din populația interesată trebuie atinsă
+    population_raster=None,
+    center: Optional[Tuple[float, float]] = None
 ) -> Dict[str, float]:
     """
     Calculează dimensiunea necesară a unei campanii la nivel de cartier
@@ -323,11 +573,15 @@ def calculate_campaign_scale(
         population_density: Densitatea populației (oameni/km²)
         conversion_rate: Rata de conversie a campaniei (0-1) - ce % din cei atinși devin clienți
         coverage_rate: Rata de acoperire (0-1) - ce % din populația interesată trebuie atinsă
+        population_raster: Calea sau rasterul de populație (vezi population.py). Dacă este dat,
+            pașii 4-5 se fac pe populația reală din jurul centrului, nu pe densitatea uniformă
+        center: Centrul campaniei pentru raster (default: LOCATION)
     
     Returns:
         Dict cu informații despre campanie
     """
-    if conversion_rate == 0 or participation_rate == 0 or population_density == 0 or coverage_rate == 0:
+    uniform_density_missing = population_density == 0 and population_raster is None
+    if conversion_rate == 0 or participation_rate == 0 or uniform_density_missing or coverage_rate == 0:
         return {
             'radius_km': 0,
             'area_km2': 0,
@@ -349,6 +603,22 @@ def calculate_campaign_scale(
     # pentru a avea suficienți oameni interesați
     total_population_needed = interested_population_needed / participation_rate
     
+    raster = resolve_raster(population_raster)
+    if raster is not None:
+        # Pașii 4-5 pe raster: raza minimă care cuprinde populația necesară
+        center = center or LOCATION['coordinates']
+        scale = campaign_scale_from_raster(raster, center, total_population_needed, participation_rate)
+        return {
+            'radius_km': float(scale['radius_km']),
+            'area_km2': float(scale['area_km2']),
+            'total_population': int(scale['total_population']),
+            'interested_population': int(scale['interested_population']),
+            'people_to_reach': int(scale['interested_population'] * coverage_rate),
+            'coverage_rate': coverage_rate,
+            'conversion_rate': conversion_rate,
+            'effective_density': float(scale['effective_density'])
+        }
+    
     # Pasul 4: Calculăm suprafața necesară
     area_needed = total_population_needed / population_density
     
@@ -374,13 +644,69 @@ def calculate_campaign_scale(
     }
 
 
+def calculate_campaign_scale_batch(
+    total_clients_needed,
+    participation_rate,
+    population_density,
+    conversion_rate=0.05,
+    coverage_rate=0.50,
+    population_raster=None,
+    center: Optional[Tuple[float, float]] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Variantă vectorizată a `calculate_campaign_scale` pentru vectori de parametri
+    
+    Toate argumentele pot fi scalari sau vectori NumPy de aceeași lungime (broadcasting).
+    Rândurile cu un parametru egal cu 0 primesc rază, suprafață și populație 0, ca în funcția scalară.
+    Cu `population_raster`, raza fiecărui rând se caută binar pe curba populației cumulate a centrului
+    (mii de interogări what-if pe secundă).
+    
+    Returns:
+        Dict cu vectori: 'radius_km', 'area_km2', 'total_population', 'interested_population', 'people_to_reach'
+    """
+    clients, participation, density, conversion, coverage = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (
+            total_clients_needed, participation_rate, population_density, conversion_rate, coverage_rate
+        ))
+    )
+    raster = resolve_raster(population_raster)
+    valid = (participation != 0) & (conversion != 0) & (coverage != 0)
+    if raster is None:
+        valid &= density != 0
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Aceeași succesiune de pași ca în calculate_campaign_scale
+        total_population_needed = clients / conversion / coverage / participation
+        if raster is None:
+            area_needed = total_population_needed / density
+            radius = np.where(valid, np.sqrt(area_needed / np.pi), 0.0)
+    
+    if raster is not None:
+        center = center or LOCATION['coordinates']
+        radius = np.where(valid, radius_for_population(raster, center[0], center[1], np.where(valid, total_population_needed, 0.0)), 0.0)
+        total_population = population_at_radius(raster, center[0], center[1], radius)
+    else:
+        total_population = np.pi * radius ** 2 * density
+    area = np.pi * radius ** 2
+    interested_population = total_population * participation
+    
+    return {
+        'radius_km': radius,
+        'area_km2': area,
+        'total_population': np.trunc(total_population).astype(np.int64),
+        'interested_population': np.trunc(interested_population).astype(np.int64),
+        'people_to_reach': np.trunc(interested_population * coverage).astype(np.int64)
+    }
+
+
 def get_scenario_analysis(
     scenario: str,
     subscription_distribution: Dict[str, float],
     participation_rate: float = 0.10,
     population_density: float = 1000,
     conversion_rate: float = 0.05,
-    coverage_rate: float = 0.50
+    coverage_rate: float = 0.50,
+    population_raster: Optional[str] = None
 ) -> Dict:
     """
     Obține analiza completă pentru un scenariu
@@ -391,6 +717,7 @@ def get_scenario_analysis(
         participation_rate: Rata de participare (default 10%)
         population_density: Densitatea populației (default 1000 oameni/km²)
         conversion_rate: Rata de conversie a campaniei (default 5%)
+        population_raster: Calea rasterului de populație (opțional, înlocuiește densitatea uniformă)
     
     Returns:
         Dict cu toate rezultatele analizei
@@ -407,7 +734,10 @@ def get_scenario_analysis(
     total_clients = sum(revenue_data['clients'].values())
     
     # Calculează dimensiunea campaniei (care include raza corectă calculată cu conversie și acoperire)
-    campaign_data = calculate_campaign_scale(total_clients, participation_rate, population_density, conversion_rate, coverage_rate)
+    campaign_data = calculate_campaign_scale(
+        total_clients, participation_rate, population_density, conversion_rate, coverage_rate,
+        population_raster=population_raster, center=LOCATION['coordinates']
+    )
     
     # Folosim raza din campanie (care este calculată corect ținând cont de conversie)
     radius = campaign_data['radius_km']
@@ -423,7 +753,8 @@ def get_scenario_analysis(
         'influence_radius_km': radius,
         'campaign': campaign_data,
         'participation_rate': participation_rate,
-        'population_density': population_density
+        'population_density': population_density,
+        'population_raster': population_raster
     }
 
 
@@ -432,26 +763,34 @@ def compare_scenarios(
     participation_rate: float = 0.10,
     population_density: float = 1000,
     conversion_rate: float = 0.05,
-    coverage_rate: float = 0.50
+    coverage_rate: float = 0.50,
+    population_raster: Optional[str] = None
 ) -> pd.DataFrame:
     """
     Compară toate scenariile și returnează un DataFrame
+
+    Cele trei scenarii se evaluează într-o singură trecere vectorizată (aceleași valori ca
+    `get_scenario_analysis` pentru fiecare scenariu); pentru grile mari vezi batch_grid.py.
     """
-    results = []
-    
-    for scenario in ['reduced', 'medium', 'high']:
-        analysis = get_scenario_analysis(scenario, subscription_distribution, participation_rate, population_density, conversion_rate, coverage_rate)
-        results.append({
-            'Scenariu': analysis['scenario'],
-            'Ocupare': analysis['occupancy_percentage'],
-            'Venit Total (RON)': analysis['revenue']['total'],
-            'Clienți Totali': analysis['total_clients'],
-            'Raza Influență (km)': round(analysis['influence_radius_km'], 2),
-            'Populație Totală': analysis['campaign']['total_population'],
-            'Populație de Atins': analysis['campaign']['people_to_reach']
-        })
+    scenario_configs = [OCCUPANCY_SCENARIOS[scenario] for scenario in ['reduced', 'medium', 'high']]
+    occupancy = np.array([(config['min'] + config['max']) / 2 for config in scenario_configs])
+    
+    keys = list(subscription_distribution.keys())
+    revenue_data = calculate_revenue_batch(occupancy, [[subscription_distribution[k] for k in keys]], keys)
+    campaign = calculate_campaign_scale_batch(
+        revenue_data['total_clients'], participation_rate, population_density, conversion_rate, coverage_rate,
+        population_raster=population_raster, center=LOCATION['coordinates']
+    )
     
-    return pd.DataFrame(results)
+    return pd.DataFrame({
+        'Scenariu': [config['name'] for config in scenario_configs],
+        'Ocupare': [f"{config['min']*100:.0f}% - {config['max']*100:.0f}%" for config in scenario_configs],
+        'Venit Total (RON)': revenue_data['total'],
+        'Clienți Totali': revenue_data['total_clients'],
+        'Raza Influență (km)': [round(float(radius), 2) for radius in campaign['radius_km']],
+        'Populație Totală': campaign['total_population'],
+        'Populație de Atins': campaign['people_to_reach']
+    })
 
 
 # Previziuni financiare - Mobilis Vita (din fișierul Word)
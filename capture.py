@@ -0,0 +1,157 @@
+"""
+Suprafața de captare (model Huff / gravitațional) pentru blocurile hărții
+
+Harta de participare colorează blocurile doar după distanța față de sală. Modelul Huff ține cont și
+de concurenți: atractivitatea fiecărei săli este capacitate^alpha / distanță^beta, iar probabilitatea
+ca un locuitor al blocului să aleagă sala noastră este atractivitatea noastră împărțită la suma
+atractivităților tuturor sălilor. Calculul se face ca matrice blocuri × concurenți, vectorizat.
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from calculations import LOCATION, CAPACITY_PER_HOUR
+from geo import KM_PER_DEGREE_LAT, km_per_degree_lon
+from spatial_index import get_competitor_index
+
+
+HUFF_ALPHA = 1.0  # exponentul capacității (atractivitate)
+HUFF_BETA = 2.0  # exponentul distanței (frecare)
+
+# Distanța minimă (km) - un bloc lipit de o sală nu dă atractivitate infinită
+MIN_DISTANCE_KM = 0.05
+
+# Benzi de culoare pentru probabilitatea de captare (prag minim, culoare, etichetă)
+CAPTURE_BANDS = [
+    (0.50, 'green', 'Dominantă'),
+    (0.30, 'blue', 'Puternică'),
+    (0.15, 'orange', 'Disputată'),
+    (0.0, 'red', 'Slabă')
+]
+
+
+def huff_capture_probability(
+    block_lat,
+    block_lon,
+    site: Tuple[float, float],
+    site_capacity: float,
+    competitor_lat,
+    competitor_lon,
+    competitor_capacity,
+    alpha: float = HUFF_ALPHA,
+    beta: float = HUFF_BETA,
+    min_distance_km: float = MIN_DISTANCE_KM,
+    return_shares: bool = False
+) -> Dict[str, np.ndarray]:
+    """
+    Probabilitatea de captare a sălii noastre pentru fiecare bloc (model Huff)
+
+    Distanțele folosesc proiecția locală în km a grilei de blocuri (la scara orașului, eroarea
+    față de Haversine este neglijabilă), ca matricea blocuri × concurenți să rămână ieftină.
+
+    Args:
+        block_lat, block_lon: Centrele blocurilor (vectori de lungime n)
+        site: Coordonatele sălii noastre (lat, lon)
+        site_capacity: Capacitatea sălii noastre
+        competitor_lat, competitor_lon, competitor_capacity: Vectori de lungime m
+        return_shares: Returnează și matricea n×m a cotelor concurenților
+
+    Returns:
+        Dict cu 'capture' (n), 'top_competitor' (indicele celui mai atractiv concurent per bloc,
+        -1 dacă nu există) și opțional 'competitor_shares' (n×m)
+    """
+    block_lat = np.asarray(block_lat, dtype=np.float64).ravel()
+    block_lon = np.asarray(block_lon, dtype=np.float64).ravel()
+    competitor_lat = np.asarray(competitor_lat, dtype=np.float64).ravel()
+    competitor_lon = np.asarray(competitor_lon, dtype=np.float64).ravel()
+    competitor_capacity = np.asarray(competitor_capacity, dtype=np.float64).ravel()
+
+    lon_scale = km_per_degree_lon(site[0])
+    block_x = (block_lon - site[1]) * lon_scale
+    block_y = (block_lat - site[0]) * KM_PER_DEGREE_LAT
+    competitor_x = (competitor_lon - site[1]) * lon_scale
+    competitor_y = (competitor_lat - site[0]) * KM_PER_DEGREE_LAT
+
+    # Distanța la puterea beta direct din pătratul distanței (fără sqrt pentru beta = 2)
+    min_squared = min_distance_km ** 2
+    own_squared = np.maximum(block_x ** 2 + block_y ** 2, min_squared)
+    competitor_squared = np.maximum(
+        (block_x[:, None] - competitor_x[None, :]) ** 2 + (block_y[:, None] - competitor_y[None, :]) ** 2,
+        min_squared
+    )
+    half_beta = beta / 2
+    own_attraction = site_capacity ** alpha / own_squared ** half_beta
+    competitor_attraction = competitor_capacity ** alpha / competitor_squared ** half_beta
+
+    total = own_attraction + competitor_attraction.sum(axis=1)
+    result = {
+        'capture': own_attraction / total,
+        'top_competitor': (
+            competitor_attraction.argmax(axis=1) if competitor_attraction.shape[1]
+            else np.full(len(block_lat), -1, dtype=np.int64)
+        )
+    }
+    if return_shares:
+        result['competitor_shares'] = competitor_attraction / total[:, None]
+    return result
+
+
+def get_competitor_arrays(category: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """
+    Coordonatele și capacitatea locațiilor concurente din indexul spațial (opțional o categorie)
+
+    Locațiile fără capacitate declarată primesc capacitatea sălii noastre (atractivitate neutră).
+    """
+    competitor_index = get_competitor_index()
+    locations = competitor_index['locations']
+    members = np.arange(len(locations)) if category is None else competitor_index['by_category'].get(category, (np.array([], dtype=np.int64),))[0]
+    coordinates = np.array([locations[i]['coordinates'] for i in members], dtype=np.float64).reshape(-1, 2)
+    capacity = competitor_index['capacity'][members]
+    return {
+        'lat': coordinates[:, 0],
+        'lon': coordinates[:, 1],
+        'capacity': np.where(capacity > 0, capacity, CAPACITY_PER_HOUR),
+        'names': [locations[i]['location_name'] for i in members]
+    }
+
+
+def classify_capture(capture) -> Dict[str, np.ndarray]:
+    """
+    Culoarea și eticheta benzii de captare pentru fiecare bloc (vezi CAPTURE_BANDS)
+    """
+    thresholds = np.array([band[0] for band in CAPTURE_BANDS])
+    band = np.argmax(np.asarray(capture)[..., None] >= thresholds, axis=-1)
+    return {
+        'color': np.array([b[1] for b in CAPTURE_BANDS], dtype=object)[band],
+        'label': np.array([b[2] for b in CAPTURE_BANDS], dtype=object)[band]
+    }
+
+
+def get_capture_surface(
+    block_lat,
+    block_lon,
+    site: Optional[Tuple[float, float]] = None,
+    site_capacity: float = CAPACITY_PER_HOUR,
+    category: Optional[str] = None,
+    alpha: float = HUFF_ALPHA,
+    beta: float = HUFF_BETA
+) -> Dict[str, np.ndarray]:
+    """
+    Suprafața de captare a sălii față de toți concurenții din EXTENDED_COMPETITOR_DATA
+
+    Returns:
+        Dict cu 'capture', 'color', 'label' și 'top_competitor_name' (per bloc)
+    """
+    site = site or LOCATION['coordinates']
+    competitors = get_competitor_arrays(category)
+    result = huff_capture_probability(
+        block_lat, block_lon, site, site_capacity,
+        competitors['lat'], competitors['lon'], competitors['capacity'],
+        alpha=alpha, beta=beta
+    )
+    names = np.array(competitors['names'] + ['-'], dtype=object)
+    return {
+        'capture': result['capture'],
+        'top_competitor_name': names[result['top_competitor']],
+        **classify_capture(result['capture'])
+    }
@@ -0,0 +1,156 @@
+"""
+Sursa datelor despre concurenți (fișier JSON sau bază SQLite locală)
+
+Datele extinse despre concurenți (EXTENDED_COMPETITOR_DATA) și detaliile de layout
+(COMPETITOR_DETAILS) nu mai sunt literali Python: se citesc din `data/competitors.json`
+(sau din fișierul dat prin variabila de mediu COMPETITOR_DATA, care poate fi și o bază SQLite).
+Fișierul se încarcă o singură dată per versiune (cale, data modificării, dimensiune), iar la
+încărcare se construiesc indexurile id → concurent și categorie → concurenți, deci căutările
+sunt O(1). O modificare a fișierului este preluată la următorul apel, fără redeploy.
+"""
+import json
+import os
+import sqlite3
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_COMPETITOR_DATA_PATH = os.path.join(BASE_DIR, 'data', 'competitors.json')
+
+SQLITE_EXTENSIONS = ('.sqlite', '.sqlite3', '.db')
+
+
+def get_competitor_data_path() -> str:
+    """Calea fișierului cu datele concurenților (variabila de mediu COMPETITOR_DATA are prioritate)"""
+    return os.environ.get('COMPETITOR_DATA', DEFAULT_COMPETITOR_DATA_PATH)
+
+
+def _restore_coordinates(record: Dict) -> Dict:
+    # JSON nu are tupluri; coordonatele rămân (lat, lon) ca în restul aplicației
+    if isinstance(record.get('coordinates'), list):
+        record['coordinates'] = tuple(record['coordinates'])
+    return record
+
+
+def _read_json(path: str) -> Tuple[Dict, Dict]:
+    with open(path, 'r', encoding='utf-8') as data_file:
+        data = json.load(data_file, object_hook=_restore_coordinates)
+    return data.get('extended', {}), data.get('details', {})
+
+
+def _read_sqlite(path: str) -> Tuple[Dict, Dict]:
+    # Un rând per concurent; 'data' este înregistrarea completă în format JSON
+    extended: Dict[str, List[Dict]] = {}
+    details: Dict[str, Dict] = {}
+    with sqlite3.connect(f"file:{path}?mode=ro", uri=True) as connection:
+        for category, data in connection.execute('SELECT category, data FROM competitors ORDER BY position'):
+            extended.setdefault(category, []).append(json.loads(data, object_hook=_restore_coordinates))
+        for key, data in connection.execute('SELECT id, data FROM competitor_details ORDER BY position'):
+            details[key] = json.loads(data, object_hook=_restore_coordinates)
+    return extended, details
+
+
+def write_competitor_store(path: str, extended: Dict[str, List[Dict]], details: Dict[str, Dict]) -> None:
+    """
+    Scrie datele concurenților în format JSON sau SQLite (după extensia fișierului)
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if path.lower().endswith(SQLITE_EXTENSIONS):
+        connection = sqlite3.connect(tmp_path)
+        try:
+            connection.executescript("""
+                CREATE TABLE competitors (id TEXT PRIMARY KEY, category TEXT NOT NULL, position INTEGER NOT NULL, data TEXT NOT NULL);
+                CREATE INDEX competitors_category ON competitors (category, position);
+                CREATE TABLE competitor_details (id TEXT PRIMARY KEY, position INTEGER NOT NULL, data TEXT NOT NULL);
+            """)
+            position = 0
+            for category, competitors in extended.items():
+                for competitor in competitors:
+                    connection.execute(
+                        'INSERT INTO competitors VALUES (?, ?, ?, ?)',
+                        (competitor.get('id'), category, position, json.dumps(competitor, ensure_ascii=False))
+                    )
+                    position += 1
+            for position, (key, detail) in enumerate(details.items()):
+                connection.execute(
+                    'INSERT INTO competitor_details VALUES (?, ?, ?)',
+                    (key, position, json.dumps(detail, ensure_ascii=False))
+                )
+            connection.commit()
+        finally:
+            connection.close()
+    else:
+        with open(tmp_path, 'w', encoding='utf-8') as data_file:
+            json.dump({'extended': extended, 'details': details}, data_file, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _flatten_locations(extended: Dict[str, List[Dict]]) -> List[Dict]:
+    locations = []
+    for category, competitors in extended.items():
+        for competitor in competitors:
+            for location in competitor.get('locations', []):
+                locations.append({
+                    'competitor_id': competitor.get('id'),
+                    'competitor_name': competitor['name'],
+                    'category': competitor['category'],
+                    'category_key': category,
+                    'location_name': location['name'],
+                    'address': location.get('address', 'N/A'),
+                    'coordinates': location.get('coordinates'),
+                    'area_m2': location.get('area_m2', 0),
+                    'capacity': location.get('capacity_simultaneous', 0)
+                })
+    return locations
+
+
+@lru_cache(maxsize=1)
+def _load_store(path: str, mtime_ns: int, size: int) -> Dict:
+    if path.lower().endswith(SQLITE_EXTENSIONS):
+        extended, details = _read_sqlite(path)
+    else:
+        extended, details = _read_json(path)
+
+    by_id = {}
+    category_of = {}
+    with_instagram = []
+    for category, competitors in extended.items():
+        for competitor in competitors:
+            if competitor.get('id') is not None:
+                by_id[competitor['id']] = competitor
+                category_of[competitor['id']] = category
+            if competitor.get('social_media', {}).get('instagram'):
+                with_instagram.append((category, competitor))
+
+    return {
+        'version': (path, mtime_ns, size),
+        'extended': extended,
+        'details': details,
+        'by_id': by_id,
+        'category_of': category_of,
+        'with_instagram': with_instagram,
+        'locations': _flatten_locations(extended)
+    }
+
+
+def get_store_version() -> Tuple[str, int, int]:
+    """
+    Versiunea curentă a fișierului de date: calea absolută, data modificării și dimensiunea
+    """
+    path = os.path.abspath(get_competitor_data_path())
+    stat = os.stat(path)
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+
+def get_competitor_store() -> Dict:
+    """
+    Datele concurenților împreună cu indexurile lor, reîncărcate doar când fișierul se schimbă
+
+    Returns:
+        Dict cu 'version', 'extended' (pe categorii), 'details' (layout), 'by_id' (id → concurent),
+        'category_of' (id → categorie), 'with_instagram' (perechi (categorie, concurent) cu
+        Instagram) și 'locations' (toate locațiile, aplatizate)
+    """
+    return _load_store(*get_store_version())
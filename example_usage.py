@@ -2,6 +2,7 @@
 Exemplu de utilizare a modulului de calcule programatic
 """
 from calculations import (
+    SUBSCRIPTION_TYPES,
     get_scenario_analysis,
     compare_scenarios,
     calculate_monthly_revenue,
@@ -14,9 +15,12 @@ print("EXEMPLU 1: Analiză Scenariu Mediu")
 print("=" * 60)
 
 subscription_distribution = {
-    'economic': 0.4,   # 40% clienți cu abonament economic
-    'standard': 0.5,   # 50% clienți cu abonament standard
-    'premium': 0.1     # 10% clienți cu abonament premium
+    'clase_miscare': 0.50,   # 50% din slot-uri pentru clase de mișcare
+    'fitness_access': 0.20,  # 20% acces sală fitness
+    'complet': 0.15,         # 15% abonament complet
+    'family': 0.05,          # 5% abonament family
+    'masaj': 0.05,           # 5% masaj (per sesiune)
+    'kineto': 0.05           # 5% kineto (per sesiune)
 }
 
 analysis = get_scenario_analysis(
@@ -30,14 +34,12 @@ print(f"\nScenariu: {analysis['scenario']}")
 print(f"Ocupare: {analysis['occupancy_percentage']}")
 print(f"\nVenituri:")
 print(f"  Total: {analysis['revenue']['total']:,.0f} RON")
-print(f"  Economic: {analysis['revenue']['economic']:,.0f} RON")
-print(f"  Standard: {analysis['revenue']['standard']:,.0f} RON")
-print(f"  Premium: {analysis['revenue']['premium']:,.0f} RON")
+for sub_type in subscription_distribution:
+    print(f"  {SUBSCRIPTION_TYPES[sub_type]['name']}: {analysis['revenue'][sub_type]:,.0f} RON")
 print(f"\nClienți:")
 print(f"  Total: {analysis['total_clients']}")
-print(f"  Economic: {analysis['revenue']['clients']['economic']}")
-print(f"  Standard: {analysis['revenue']['clients']['standard']}")
-print(f"  Premium: {analysis['revenue']['clients']['premium']}")
+for sub_type in subscription_distribution:
+    print(f"  {SUBSCRIPTION_TYPES[sub_type]['name']}: {analysis['revenue']['clients'][sub_type]}")
 print(f"\nRaza de influență: {analysis['influence_radius_km']:.2f} km")
 print(f"Populație totală în zonă: {analysis['campaign']['total_population']:,}")
 
@@ -81,6 +83,7 @@ for density in [500, 1000, 2000, 3000]:
     print(f"Densitate {density:,} oameni/km²: Raza = {radius:.2f} km")
 
 print("\n" + "=" * 60)
-print("Analiză completă! Folosește dashboard-ul pentru interacțiune vizuală.")
+print("Analiză completă! Folosește dashboard-ul pentru interacțiune vizuală,")
+print("iar pentru grile mari de parametri: python batch_grid.py grila.json -o rezultate.csv")
 print("=" * 60)
 
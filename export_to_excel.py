@@ -1,100 +1,354 @@
 """
 Script pentru exportarea datelor în Excel
+
+Exportul folosește foi write-only (openpyxl): rândurile se generează pe bucăți de
+EXPORT_CHUNK_ROWS și se scriu direct în fișier, deci memoria rămâne constantă și pentru
+sute de mii de rânduri (extrageri Monte Carlo, grila de blocuri, tabelele concurenților).
 """
+import io
+import os
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
 import pandas as pd
-from calculations import compare_scenarios, OCCUPANCY_SCENARIOS, SUBSCRIPTION_TYPES
+from calculations import (
+    compare_scenarios,
+    get_scenario_analysis,
+    OCCUPANCY_SCENARIOS,
+    SUBSCRIPTION_TYPES,
+    LOCATION,
+    CAPACITY_PER_HOUR,
+    HOURS_PER_DAY,
+    DAYS_PER_WEEK,
+    DESIRED_MONTHLY_REVENUE,
+    DEFAULT_SUBSCRIPTION_DISTRIBUTION
+)
+from competitor_analysis import get_all_competitor_locations
+from geo import get_participation_blocks, DEFAULT_BLOCK_SIZE_KM, DEFAULT_GRID_SIZE
+from simulation import run_monte_carlo, simulation_config, DEFAULT_TRIALS
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.utils.dataframe import dataframe_to_rows
 
-def export_analysis_to_excel(
-    subscription_distribution: dict,
+# Numărul de rânduri generate și scrise odată
+EXPORT_CHUNK_ROWS = 10_000
+
+# Limita de rânduri a unei foi Excel; peste ea datele continuă pe o foaie nouă ("Titlu (2)", ...)
+EXCEL_MAX_ROWS = 1_048_576
+
+HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+HEADER_FONT = Font(bold=True, color="FFFFFF")
+
+
+def _python_value(value):
+    # Celulele Excel acceptă doar tipuri Python (nu np.int64, np.float64, NaN)
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+def iter_dataframe_chunks(df: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[List[list]]:
+    """
+    Rândurile unui DataFrame, pe bucăți de `chunk_rows`
+    """
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        yield [[_python_value(value) for value in row] for row in chunk.itertuples(index=False, name=None)]
+
+
+def iter_column_chunks(columns: Dict[str, np.ndarray], chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[List[list]]:
+    """
+    Rândurile unor vectori de aceeași lungime (o coloană per vector), pe bucăți de `chunk_rows`
+    """
+    length = len(next(iter(columns.values()))) if columns else 0
+    for start in range(0, length, chunk_rows):
+        # .tolist() pe fiecare bucată convertește direct la tipuri Python
+        values = [np.asarray(column[start:start + chunk_rows]).tolist() for column in columns.values()]
+        yield [list(row) for row in zip(*values)]
+
+
+def _start_sheet(workbook: Workbook, sheet: Dict, part: int):
+    title = sheet['title'] if part == 1 else f"{sheet['title'][:26]} ({part})"
+    worksheet = workbook.create_sheet(title[:31])
+    rows = 0
+    if sheet.get('heading'):
+        worksheet.append([sheet['heading']])
+        worksheet.append([])
+        rows = 2
+    header = []
+    for name in sheet['columns']:
+        cell = WriteOnlyCell(worksheet, value=name)
+        cell.fill = HEADER_FILL
+        cell.font = HEADER_FONT
+        cell.alignment = Alignment(horizontal="center")
+        header.append(cell)
+    worksheet.append(header)
+    return worksheet, rows + 1
+
+
+def write_streaming_workbook(target, sheets: Iterable[Dict]) -> int:
+    """
+    Scrie foile în flux într-un workbook write-only
+
+    Args:
+        target: Calea fișierului .xlsx sau un obiect file-like (ex: io.BytesIO)
+        sheets: Foi descrise ca dict cu 'title', 'columns', 'chunks' (iterator de liste de rânduri)
+            și opțional 'heading' (titlul afișat deasupra tabelului)
+
+    Returns:
+        Numărul total de rânduri de date scrise
+    """
+    workbook = Workbook(write_only=True)
+    total_rows = 0
+    for sheet in sheets:
+        worksheet, rows, part = None, EXCEL_MAX_ROWS, 0
+        for chunk in sheet['chunks']:
+            for row in chunk:
+                if rows >= EXCEL_MAX_ROWS:
+                    part += 1
+                    worksheet, rows = _start_sheet(workbook, sheet, part)
+                worksheet.append(row)
+                rows += 1
+            total_rows += len(chunk)
+        if worksheet is None:
+            _start_sheet(workbook, sheet, 1)
+    workbook.save(target)
+    return total_rows
+
+
+def monte_carlo_sheet(
+    subscription_distribution: Dict[str, float],
+    config: Optional[Dict] = None,
+    trials: int = DEFAULT_TRIALS,
+    seed: Optional[int] = 42,
+    scenarios: Optional[List[str]] = None,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+    population_raster: Optional[str] = None
+) -> Dict:
+    """
+    Foaia cu toate extragerile Monte Carlo, generate pe bucăți de `chunk_rows` încercări
+
+    Fiecare bucată este o simulare independentă cu seed derivat din (seed, scenariu, bucată),
+    deci exportul este reproductibil fără să țină toate încercările în memorie. Pentru aceleași
+    valori ca în dashboard, `config` se construiește cu `simulation.simulation_config`.
+    """
+    scenarios = scenarios or list(OCCUPANCY_SCENARIOS.keys())
+
+    def chunks() -> Iterator[List[list]]:
+        for scenario_index, scenario in enumerate(scenarios):
+            for batch, start in enumerate(range(0, trials, chunk_rows)):
+                size = min(chunk_rows, trials - start)
+                batch_seed = None if seed is None else np.random.SeedSequence([seed, scenario_index, batch])
+                draws = run_monte_carlo(
+                    scenario, subscription_distribution, config, size, batch_seed, population_raster=population_raster
+                )['draws']
+                yield from iter_column_chunks({
+                    'scenario': np.full(size, OCCUPANCY_SCENARIOS[scenario]['name'], dtype=object),
+                    'trial': np.arange(start + 1, start + size + 1),
+                    **{key: draws[key] for key in ('occupancy', 'conversion_rate', 'coverage_rate', 'revenue', 'clients', 'radius_km')}
+                }, chunk_rows)
+
+    return {
+        'title': "Simulare Monte Carlo",
+        'columns': ['Scenariu', 'Încercare', 'Ocupare', 'Rata Conversie', 'Rata Acoperire', 'Venit (RON)', 'Clienți', 'Raza (km)'],
+        'chunks': chunks()
+    }
+
+
+def blocks_sheet(
+    scenario: str,
+    subscription_distribution: Dict[str, float],
     participation_rate: float = 0.10,
     population_density: float = 1000,
-    filename: str = "analiza_fitness_center.xlsx"
-):
+    conversion_rate: float = 0.05,
+    coverage_rate: float = 0.50,
+    population_raster: Optional[str] = None,
+    block_size_km: float = DEFAULT_BLOCK_SIZE_KM,
+    grid_size: Optional[int] = DEFAULT_GRID_SIZE,
+    chunk_rows: int = EXPORT_CHUNK_ROWS
+) -> Dict:
     """
-    Exportă analiza completă în Excel
+    Foaia cu grila de blocuri a hărții de participare pentru scenariul dat
     """
-    wb = Workbook()
-    
-    # Sheet 1: Comparare Scenarii
-    ws1 = wb.active
-    ws1.title = "Comparare Scenarii"
-    
+    def chunks() -> Iterator[List[list]]:
+        analysis = get_scenario_analysis(
+            scenario, subscription_distribution, participation_rate, population_density,
+            conversion_rate, coverage_rate, population_raster
+        )
+        blocks = get_participation_blocks(
+            LOCATION['coordinates'],
+            analysis['influence_radius_km'],
+            analysis['total_clients'],
+            participation_rate,
+            population_density,
+            block_size_km=block_size_km,
+            grid_size=grid_size,
+            population_raster=population_raster
+        )
+        yield from iter_column_chunks({
+            **{key: blocks[key] for key in ('lat', 'lon', 'distance', 'population')},
+            'participation_pct': blocks['participation'] * 100,
+            **{key: blocks[key] for key in ('interested', 'color')}
+        }, chunk_rows)
+
+    return {
+        'title': "Grilă Blocuri",
+        'heading': f"Blocuri - Scenariu {OCCUPANCY_SCENARIOS[scenario]['name']}",
+        'columns': ['Latitudine', 'Longitudine', 'Distanță (km)', 'Populație', 'Participare Necesară (%)', 'Clienți Interesați', 'Culoare'],
+        'chunks': chunks()
+    }
+
+
+def competitors_sheet(chunk_rows: int = EXPORT_CHUNK_ROWS) -> Dict:
+    """
+    Foaia cu toate locațiile concurenților
+    """
+    def chunks() -> Iterator[List[list]]:
+        locations = pd.DataFrame(get_all_competitor_locations())
+        if locations.empty:
+            return
+        coordinates = locations['coordinates'].apply(lambda c: c if c else (None, None))
+        locations['lat'] = coordinates.str[0]
+        locations['lon'] = coordinates.str[1]
+        yield from iter_dataframe_chunks(
+            locations[['competitor_name', 'category', 'location_name', 'address', 'lat', 'lon', 'area_m2', 'capacity']],
+            chunk_rows
+        )
+
+    return {
+        'title': "Concurenți",
+        'columns': ['Competitor', 'Categorie', 'Locație', 'Adresă', 'Latitudine', 'Longitudine', 'Suprafață (mp)', 'Capacitate'],
+        'chunks': chunks()
+    }
+
+
+def _analysis_sheets(
+    subscription_distribution: Dict[str, float],
+    participation_rate: float,
+    population_density: float,
+    scenario: str,
+    conversion_rate: float,
+    coverage_rate: float,
+    population_raster: Optional[str],
+    include_monte_carlo: bool,
+    trials: int,
+    seed: Optional[int],
+    include_blocks: bool,
+    include_competitors: bool,
+    chunk_rows: int
+) -> Iterator[Dict]:
     comparison_df = compare_scenarios(
         subscription_distribution,
         participation_rate,
-        population_density
+        population_density,
+        conversion_rate,
+        coverage_rate,
+        population_raster
     )
-    
-    # Adaugă header
-    ws1.append(['Comparare Scenarii de Ocupare'])
-    ws1.append([])
-    
-    # Adaugă datele
-    for r in dataframe_to_rows(comparison_df, index=False, header=True):
-        ws1.append(r)
-    
-    # Formatare header
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF")
-    
-    for cell in ws1[3]:  # Rândul cu header-ul
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal="center")
-    
-    # Sheet 2: Detalii Abonamente
-    ws2 = wb.create_sheet("Detalii Abonamente")
-    
-    ws2.append(['Tipuri de Abonamente Disponibile'])
-    ws2.append([])
-    ws2.append(['Tip', 'Preț (RON)', 'Sesiuni', 'Procentaj Distribuție'])
-    
+    yield {
+        'title': "Comparare Scenarii",
+        'heading': 'Comparare Scenarii de Ocupare',
+        'columns': list(comparison_df.columns),
+        'chunks': iter_dataframe_chunks(comparison_df, chunk_rows)
+    }
+
+    subscriptions = []
     for key, sub_type in SUBSCRIPTION_TYPES.items():
         pct = subscription_distribution.get(key, 0) * 100
         sessions = sub_type['sessions'] if sub_type['sessions'] else 'Nelimitat'
-        ws2.append([sub_type['name'], sub_type['price'], sessions, f"{pct:.1f}%"])
-    
-    # Formatare
-    for cell in ws2[3]:
-        cell.fill = header_fill
-        cell.font = header_font
-    
-    # Sheet 3: Parametri
-    ws3 = wb.create_sheet("Parametri")
-    
-    ws3.append(['Parametri Analiză'])
-    ws3.append([])
-    ws3.append(['Parametru', 'Valoare'])
-    ws3.append(['Rata Participare Populație', f"{participation_rate*100:.1f}%"])
-    ws3.append(['Densitate Populație', f"{population_density:,} oameni/km²"])
-    ws3.append(['Capacitate per Oră', '20 oameni'])
-    ws3.append(['Ore pe Zi', '10 ore'])
-    ws3.append(['Zile pe Săptămână', '7 zile'])
-    ws3.append(['Venit Dorit Lunar', '50,000 RON'])
-    
-    # Formatare
-    for cell in ws3[3]:
-        cell.fill = header_fill
-        cell.font = header_font
-    
-    # Salvează
-    wb.save(filename)
-    print(f"Fișier Excel creat: {filename}")
+        subscriptions.append([sub_type['name'], sub_type['price'], sessions, f"{pct:.1f}%"])
+    yield {
+        'title': "Detalii Abonamente",
+        'heading': 'Tipuri de Abonamente Disponibile',
+        'columns': ['Tip', 'Preț (RON)', 'Sesiuni', 'Procentaj Distribuție'],
+        'chunks': iter([subscriptions])
+    }
+
+    yield {
+        'title': "Parametri",
+        'heading': 'Parametri Analiză',
+        'columns': ['Parametru', 'Valoare'],
+        'chunks': iter([[
+            ['Scenariu', OCCUPANCY_SCENARIOS[scenario]['name']],
+            ['Rata Participare Populație', f"{participation_rate*100:.1f}%"],
+            ['Densitate Populație', f"{population_density:,} oameni/km²"],
+            ['Rata Conversie Campanie', f"{conversion_rate*100:.1f}%"],
+            ['Rata de Acoperire', f"{coverage_rate*100:.1f}%"],
+            ['Raster Populație', os.path.basename(population_raster) if population_raster else 'Nu (densitate uniformă)'],
+            ['Capacitate per Oră', f"{CAPACITY_PER_HOUR} oameni"],
+            ['Ore pe Zi', f"{HOURS_PER_DAY} ore"],
+            ['Zile pe Săptămână', f"{DAYS_PER_WEEK} zile"],
+            ['Venit Dorit Lunar', f"{DESIRED_MONTHLY_REVENUE:,} RON"]
+        ]])
+    }
+
+    if include_monte_carlo:
+        yield monte_carlo_sheet(
+            subscription_distribution,
+            config=simulation_config(participation_rate, population_density, conversion_rate, coverage_rate),
+            trials=trials,
+            seed=seed,
+            chunk_rows=chunk_rows,
+            population_raster=population_raster
+        )
+    if include_blocks:
+        yield blocks_sheet(
+            scenario, subscription_distribution, participation_rate, population_density,
+            conversion_rate, coverage_rate, population_raster, chunk_rows=chunk_rows
+        )
+    if include_competitors:
+        yield competitors_sheet(chunk_rows)
+
+
+def export_analysis_to_excel(
+    subscription_distribution: dict,
+    participation_rate: float = 0.10,
+    population_density: float = 1000,
+    filename: str = "analiza_fitness_center.xlsx",
+    scenario: str = 'medium',
+    conversion_rate: float = 0.05,
+    coverage_rate: float = 0.50,
+    population_raster: Optional[str] = None,
+    include_monte_carlo: bool = False,
+    trials: int = DEFAULT_TRIALS,
+    seed: Optional[int] = 42,
+    include_blocks: bool = False,
+    include_competitors: bool = False,
+    chunk_rows: int = EXPORT_CHUNK_ROWS
+):
+    """
+    Exportă analiza completă în Excel
+
+    Pe lângă comparația scenariilor, abonamente și parametri, pot fi incluse extragerile
+    Monte Carlo (`trials` per scenariu), grila de blocuri pentru `scenario` și locațiile
+    concurenților. `filename` poate fi și un obiect file-like.
+    """
+    rows = write_streaming_workbook(filename, _analysis_sheets(
+        subscription_distribution, participation_rate, population_density, scenario,
+        conversion_rate, coverage_rate, population_raster, include_monte_carlo, trials, seed,
+        include_blocks, include_competitors, chunk_rows
+    ))
+    if isinstance(filename, str):
+        print(f"Fișier Excel creat: {filename} ({rows:,} rânduri)")
+
+
+def export_analysis_to_bytes(subscription_distribution: dict, **kwargs) -> bytes:
+    """
+    Aceeași exportare ca `export_analysis_to_excel`, returnată ca bytes (pentru st.download_button)
+    """
+    buffer = io.BytesIO()
+    export_analysis_to_excel(subscription_distribution, filename=buffer, **kwargs)
+    return buffer.getvalue()
 
 if __name__ == "__main__":
     # Exemplu de utilizare
-    subscription_dist = {
-        'economic': 0.4,
-        'standard': 0.5,
-        'premium': 0.1
-    }
-    
     export_analysis_to_excel(
-        subscription_dist,
+        DEFAULT_SUBSCRIPTION_DISTRIBUTION,
         participation_rate=0.10,
-        population_density=1000
+        population_density=1000,
+        include_monte_carlo=True,
+        include_blocks=True,
+        include_competitors=True
     )
-
@@ -0,0 +1,279 @@
+"""
+Export columnar (Parquet / Arrow IPC) al seturilor de date din dashboard
+
+Fiecare set de date (comparația scenariilor, grila de blocuri, locațiile concurenților,
+previziunile financiare) se scrie ca tabel Arrow într-un director de export, cu un fișier
+`manifest.json` care descrie seturile, schema și fișierele lor. Seturile per scenariu sunt
+partiționate în stil Hive (`scenario=medium/part-0.parquet`), deci un notebook poate citi doar
+scenariul de care are nevoie. Formatul 'arrow' (IPC necomprimat) se citește memory-mapped,
+fără copiere (zero-copy).
+
+Necesită pyarrow (dependență opțională: `pip install pyarrow`).
+"""
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from calculations import (
+    compare_scenarios,
+    get_scenario_analysis,
+    OCCUPANCY_SCENARIOS,
+    FINANCIAL_FORECAST,
+    LOCATION
+)
+from capture import get_capture_surface
+from competitor_analysis import get_all_competitor_locations
+from geo import get_participation_blocks, DEFAULT_BLOCK_SIZE_KM, DEFAULT_GRID_SIZE
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+EXPORT_FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+# Coloana după care se partiționează seturile calculate per scenariu
+PARTITION_COLUMN = 'scenario'
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError("Exportul Parquet/Arrow necesită pyarrow (pip install pyarrow)") from error
+    return pyarrow
+
+
+def _write_table(table, path: str, export_format: str) -> None:
+    pa = _pyarrow()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if export_format == 'parquet':
+        pa.parquet.write_table(table, tmp_path, compression='zstd')
+    else:
+        # IPC necomprimat: fișierul poate fi memory-mapped și citit fără copiere
+        with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def scenario_comparison_table(
+    subscription_distribution: Dict[str, float],
+    participation_rate: float = 0.10,
+    population_density: float = 1000,
+    conversion_rate: float = 0.05,
+    coverage_rate: float = 0.50,
+    population_raster: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Comparația scenariilor (ca în dashboard), cu cheia scenariului în coloana PARTITION_COLUMN
+    """
+    comparison_df = compare_scenarios(
+        subscription_distribution, participation_rate, population_density,
+        conversion_rate, coverage_rate, population_raster
+    )
+    comparison_df.insert(0, PARTITION_COLUMN, list(OCCUPANCY_SCENARIOS.keys()))
+    return comparison_df
+
+
+def blocks_table(
+    scenario: str,
+    subscription_distribution: Dict[str, float],
+    participation_rate: float = 0.10,
+    population_density: float = 1000,
+    conversion_rate: float = 0.05,
+    coverage_rate: float = 0.50,
+    population_raster: Optional[str] = None,
+    block_size_km: float = DEFAULT_BLOCK_SIZE_KM,
+    grid_size: Optional[int] = DEFAULT_GRID_SIZE
+) -> Dict[str, np.ndarray]:
+    """
+    Grila de blocuri a hărții pentru un scenariu, ca vectori de coloane (fără copiere spre Arrow)
+
+    Ratele ('participation_rate', 'capture') sunt fracții între 0 și 1, nu procente.
+    """
+    analysis = get_scenario_analysis(
+        scenario, subscription_distribution, participation_rate, population_density,
+        conversion_rate, coverage_rate, population_raster
+    )
+    blocks = get_participation_blocks(
+        LOCATION['coordinates'],
+        analysis['influence_radius_km'],
+        analysis['total_clients'],
+        participation_rate,
+        population_density,
+        block_size_km=block_size_km,
+        grid_size=grid_size,
+        population_raster=population_raster
+    )
+    capture = get_capture_surface(blocks['lat'], blocks['lon'])
+    return {
+        'lat': blocks['lat'],
+        'lon': blocks['lon'],
+        'distance_km': blocks['distance'],
+        'population': blocks['population'],
+        'participation_rate': blocks['participation'],
+        'interested': blocks['interested'],
+        'color': blocks['color'].astype(str),
+        'capture': capture['capture'],
+        'top_competitor': capture['top_competitor_name'].astype(str)
+    }
+
+
+def competitor_locations_table() -> pd.DataFrame:
+    """
+    Toate locațiile concurenților, cu coordonatele separate în 'lat' și 'lon'
+    """
+    locations = pd.DataFrame(get_all_competitor_locations())
+    coordinates = locations.pop('coordinates').apply(lambda c: c if c else (np.nan, np.nan))
+    locations['lat'] = coordinates.str[0].astype(float)
+    locations['lon'] = coordinates.str[1].astype(float)
+    return locations
+
+
+def financial_forecast_table() -> pd.DataFrame:
+    """
+    Previziunile financiare per spațiu, preluate neschimbat din FINANCIAL_FORECAST['spaces']
+    (ocuparea este deja stocată acolo ca fracție)
+    """
+    return pd.DataFrame(FINANCIAL_FORECAST['spaces'])
+
+
+def export_datasets(
+    output_dir: str,
+    subscription_distribution: Dict[str, float],
+    participation_rate: float = 0.10,
+    population_density: float = 1000,
+    conversion_rate: float = 0.05,
+    coverage_rate: float = 0.50,
+    population_raster: Optional[str] = None,
+    scenarios: Optional[List[str]] = None,
+    export_format: str = 'parquet',
+    block_size_km: float = DEFAULT_BLOCK_SIZE_KM,
+    grid_size: Optional[int] = DEFAULT_GRID_SIZE
+) -> Dict:
+    """
+    Exportă toate seturile de date în `output_dir` și scrie manifestul
+
+    Manifestul se scrie ultimul: un director fără manifest este un export incomplet.
+
+    Args:
+        export_format: 'parquet' (comprimat, zstd) sau 'arrow' (IPC, citire zero-copy)
+        scenarios: Scenariile exportate (implicit toate din OCCUPANCY_SCENARIOS)
+
+    Returns:
+        Manifestul (dict), identic cu cel scris în MANIFEST_NAME
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Format de export necunoscut: {export_format} (disponibile: {list(EXPORT_FORMATS)})")
+    pa = _pyarrow()
+    extension = EXPORT_FORMATS[export_format]
+    scenarios = scenarios or list(OCCUPANCY_SCENARIOS.keys())
+    os.makedirs(output_dir, exist_ok=True)
+    datasets = {}
+
+    def add_file(name: str, table, scenario: Optional[str] = None) -> None:
+        directory = name if scenario is None else os.path.join(name, f"{PARTITION_COLUMN}={scenario}")
+        os.makedirs(os.path.join(output_dir, directory), exist_ok=True)
+        relative_path = os.path.join(directory, f"part-0{extension}")
+        _write_table(table, os.path.join(output_dir, relative_path), export_format)
+        dataset = datasets.setdefault(name, {
+            'partitioning': [PARTITION_COLUMN] if scenario is not None else [],
+            'schema': [{'name': field.name, 'type': str(field.type)} for field in table.schema],
+            'rows': 0,
+            'files': []
+        })
+        dataset['rows'] += table.num_rows
+        dataset['files'].append({
+            'path': relative_path.replace(os.sep, '/'),
+            'rows': table.num_rows,
+            **({PARTITION_COLUMN: scenario} if scenario is not None else {})
+        })
+
+    comparison_df = scenario_comparison_table(
+        subscription_distribution, participation_rate, population_density,
+        conversion_rate, coverage_rate, population_raster
+    )
+    for scenario in scenarios:
+        # Cheia de partiție este în calea fișierului (stil Hive), nu și în tabel
+        rows = comparison_df[comparison_df[PARTITION_COLUMN] == scenario].drop(columns=PARTITION_COLUMN)
+        add_file('scenario_comparison', pa.Table.from_pandas(rows, preserve_index=False), scenario)
+        add_file('blocks', pa.table(blocks_table(
+            scenario, subscription_distribution, participation_rate, population_density,
+            conversion_rate, coverage_rate, population_raster, block_size_km, grid_size
+        )), scenario)
+    add_file('competitor_locations', pa.Table.from_pandas(competitor_locations_table(), preserve_index=False))
+    add_file('financial_forecast', pa.Table.from_pandas(financial_forecast_table(), preserve_index=False))
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'format': export_format,
+        'parameters': {
+            'subscription_distribution': subscription_distribution,
+            'participation_rate': participation_rate,
+            'population_density': population_density,
+            'conversion_rate': conversion_rate,
+            'coverage_rate': coverage_rate,
+            'population_raster': population_raster,
+            'scenarios': scenarios,
+            'block_size_km': block_size_km,
+            'grid_size': grid_size
+        },
+        'datasets': datasets
+    }
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    with open(f"{manifest_path}.tmp", 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest, manifest_file, ensure_ascii=False, indent=2)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+    return manifest
+
+
+def load_manifest(output_dir: str) -> Dict:
+    """
+    Citește manifestul unui export
+    """
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'r', encoding='utf-8') as manifest_file:
+        return json.load(manifest_file)
+
+
+def read_dataset(output_dir: str, name: str, scenarios: Optional[List[str]] = None):
+    """
+    Citește un set de date exportat ca tabel Arrow (opțional doar unele scenarii)
+
+    `scenarios` filtrează doar seturile partiționate; celelalte se citesc întotdeauna complet.
+
+    Fișierele 'arrow' sunt memory-mapped (zero-copy); pentru seturile partiționate, coloana
+    PARTITION_COLUMN este adăugată din manifest. Pentru pandas: `read_dataset(...).to_pandas()`.
+    """
+    pa = _pyarrow()
+    manifest = load_manifest(output_dir)
+    dataset = manifest['datasets'][name]
+    tables = []
+    for file_info in dataset['files']:
+        scenario = file_info.get(PARTITION_COLUMN)
+        # Filtrul pe scenarii se aplică doar seturilor partiționate pe scenariu
+        if dataset['partitioning'] and scenarios is not None and scenario not in scenarios:
+            continue
+        path = os.path.join(output_dir, file_info['path'])
+        if manifest['format'] == 'arrow':
+            table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+        else:
+            table = pa.parquet.read_table(path)
+        if dataset['partitioning']:
+            table = table.append_column(PARTITION_COLUMN, pa.array([scenario] * table.num_rows, pa.string()))
+        tables.append(table)
+    if not tables:
+        schema = pa.schema([(field['name'], pa.type_for_alias(field['type'])) for field in dataset['schema']])
+        return schema.empty_table()
+    return pa.concat_tables(tables)
+
+if __name__ == "__main__":
+    # Exemplu de utilizare
+    from calculations import DEFAULT_SUBSCRIPTION_DISTRIBUTION
+
+    manifest = export_datasets('export_analiza', DEFAULT_SUBSCRIPTION_DISTRIBUTION)
+    for name, dataset in manifest['datasets'].items():
+        print(f"{name}: {dataset['rows']:,} rânduri în {len(dataset['files'])} fișier(e)")
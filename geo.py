@@ -0,0 +1,293 @@
+"""
+Calcule geografice vectorizate pentru harta de participare pe blocuri
+
+Grila de blocuri din jurul sălii (centre, distanțe, contururi, populație) este generată cu
+operații NumPy pe toată grila deodată și memorizată per (centru, rază, dimensiune bloc, densitate),
+astfel încât harta poate folosi mii de blocuri fără bucle Python.
+"""
+import math
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+EARTH_RADIUS_KM = 6371
+KM_PER_DEGREE_LAT = 111  # aproximare folosită pentru offset-urile grilei
+
+DEFAULT_BLOCK_SIZE_KM = 0.12  # ~0.12 km latime/înălțime per bloc
+DEFAULT_GRID_SIZE = 7  # 7x7 = 49 chenare în jurul sălii
+
+# Benzi de intensitate după distanță (fracție din rază): mai aproape = participare mai mare necesară
+# (prag, multiplicator participare, culoare, intensitate)
+INTENSITY_BANDS = [
+    (0.3, 1.3, 'green', 'Ridicată'),
+    (0.6, 1.0, 'blue', 'Medie'),
+    (0.9, 0.7, 'orange', 'Moderată'),
+    (np.inf, 0.5, 'red', 'Redusă')
+]
+
+# Limitele participării necesare per bloc (1% - 30%)
+MIN_BLOCK_PARTICIPATION = 0.01
+MAX_BLOCK_PARTICIPATION = 0.30
+
+# Precizia folosită pentru cheile de cache
+_KEY_DECIMALS = 6
+
+
+def haversine_distance(lat1, lon1, lat2, lon2):
+    """
+    Calculează distanța Haversine (km) între puncte geografice
+
+    Acceptă scalari sau vectori NumPy (broadcasting).
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(a))
+
+
+def km_per_degree_lon(latitude: float) -> float:
+    """Numărul de km pe grad de longitudine la o latitudine dată"""
+    return KM_PER_DEGREE_LAT * math.cos(math.radians(latitude))
+
+
+def _readonly(**arrays) -> Dict[str, np.ndarray]:
+    for array in arrays.values():
+        array.setflags(write=False)
+    return arrays
+
+
+@lru_cache(maxsize=64)
+def _block_grid(
+    center_lat: float,
+    center_lon: float,
+    radius_km: float,
+    block_size_km: float,
+    population_density: float,
+    grid_size: int
+) -> Dict[str, np.ndarray]:
+    # Offset-urile centrelor de bloc, centrate pe sală (+0.5 pentru centrare)
+    steps = (np.arange(grid_size) - grid_size / 2 + 0.5) * block_size_km
+    lon_scale = km_per_degree_lon(center_lat)
+    offset_lat, offset_lon = np.meshgrid(steps / KM_PER_DEGREE_LAT, steps / lon_scale, indexing='ij')
+
+    lat = (center_lat + offset_lat).ravel()
+    lon = (center_lon + offset_lon).ravel()
+    distance = haversine_distance(center_lat, center_lon, lat, lon)
+
+    # Păstrăm doar blocurile din interiorul razei de influență
+    inside = distance <= radius_km
+    lat, lon, distance = lat[inside], lon[inside], distance[inside]
+
+    # Contururile blocurilor (poligoane închise, [lat, lon]) - 5 puncte per bloc
+    half_lat = block_size_km / 2 / KM_PER_DEGREE_LAT
+    half_lon = block_size_km / 2 / lon_scale
+    corner_lat = np.array([-half_lat, half_lat, half_lat, -half_lat, -half_lat])
+    corner_lon = np.array([-half_lon, -half_lon, half_lon, half_lon, -half_lon])
+    bounds = np.stack([lat[:, None] + corner_lat, lon[:, None] + corner_lon], axis=-1)
+
+    block_area_km2 = block_size_km * block_size_km
+    population = np.full(lat.shape, int(block_area_km2 * population_density), dtype=np.int64)
+
+    return _readonly(lat=lat, lon=lon, distance=distance, bounds=bounds, population=population)
+
+
+def build_block_grid(
+    center: Tuple[float, float],
+    radius_km: float,
+    block_size_km: float = DEFAULT_BLOCK_SIZE_KM,
+    population_density: float = 1000,
+    grid_size: Optional[int] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Generează grila de blocuri din jurul unui centru, păstrând doar blocurile din interiorul razei
+
+    Rezultatul este memorizat; vectorii returnați sunt read-only.
+
+    Args:
+        center: Coordonatele (lat, lon) ale centrului
+        radius_km: Raza de influență (km)
+        block_size_km: Latura unui bloc (km)
+        population_density: Densitatea populației (oameni/km²)
+        grid_size: Numărul de blocuri pe latură; None = grila acoperă tot cercul razei
+
+    Returns:
+        Dict cu vectorii 'lat', 'lon', 'distance' (km), 'bounds' (n×5×2) și 'population'
+    """
+    if grid_size is None:
+        grid_size = max(1, int(math.ceil(2 * radius_km / block_size_km)))
+    return _block_grid(
+        round(float(center[0]), _KEY_DECIMALS),
+        round(float(center[1]), _KEY_DECIMALS),
+        round(float(radius_km), _KEY_DECIMALS),
+        round(float(block_size_km), _KEY_DECIMALS),
+        round(float(population_density), _KEY_DECIMALS),
+        int(grid_size)
+    )
+
+
+def classify_intensity(distance, radius_km: float) -> Dict[str, np.ndarray]:
+    """
+    Atribuie fiecărui bloc banda de intensitate după distanța relativă la rază
+
+    Returns:
+        Dict cu vectorii 'band' (indice în INTENSITY_BANDS), 'multiplier', 'color', 'intensity'
+    """
+    thresholds = np.array([band[0] for band in INTENSITY_BANDS[:-1]]) * radius_km
+    band = np.searchsorted(thresholds, np.asarray(distance), side='left')
+    return {
+        'band': band,
+        'multiplier': np.array([b[1] for b in INTENSITY_BANDS])[band],
+        'color': np.array([b[2] for b in INTENSITY_BANDS], dtype=object)[band],
+        'intensity': np.array([b[3] for b in INTENSITY_BANDS], dtype=object)[band]
+    }
+
+
+def compute_block_participation(
+    grid: Dict[str, np.ndarray],
+    radius_km: float,
+    total_clients_needed: int,
+    participation_rate: float,
+    population_density: float,
+    total_population_in_radius: Optional[int] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Calculează participarea necesară și populația interesată pentru fiecare bloc din grilă
+
+    Participarea medie necesară (clienți / populația din rază) este ajustată cu multiplicatorul
+    benzii de distanță și limitată între 1% și 30%. Populația din rază se calculează din densitate,
+    dacă nu este dată explicit (ex: din rasterul de populație).
+    """
+    if total_population_in_radius is None:
+        total_population_in_radius = int(math.pi * (radius_km ** 2) * population_density)
+    if total_population_in_radius > 0:
+        avg_participation_needed = total_clients_needed / total_population_in_radius
+    else:
+        avg_participation_needed = participation_rate
+
+    bands = classify_intensity(grid['distance'], radius_km)
+    participation = np.clip(
+        avg_participation_needed * bands['multiplier'],
+        MIN_BLOCK_PARTICIPATION,
+        MAX_BLOCK_PARTICIPATION
+    )
+    interested = np.trunc(grid['population'] * participation).astype(np.int64)
+
+    return {
+        **grid,
+        'participation': participation,
+        'interested': interested,
+        'color': bands['color'],
+        'intensity': bands['intensity']
+    }
+
+
+def get_participation_blocks(
+    center: Tuple[float, float],
+    radius_km: float,
+    total_clients_needed: int,
+    participation_rate: float,
+    population_density: float,
+    block_size_km: float = DEFAULT_BLOCK_SIZE_KM,
+    grid_size: Optional[int] = DEFAULT_GRID_SIZE,
+    population_raster=None
+) -> Dict[str, np.ndarray]:
+    """
+    Grila de blocuri cu participarea necesară, gata pentru hartă și tabel
+
+    Cu `population_raster` (cale sau raster încărcat, vezi population.py), populația fiecărui bloc
+    și cea din rază vin din raster în loc de densitatea uniformă.
+
+    Returns:
+        Dict cu vectorii grilei plus 'participation', 'interested', 'color', 'intensity'
+    """
+    grid = build_block_grid(center, radius_km, block_size_km, population_density, grid_size)
+    total_population_in_radius = None
+    if population_raster is not None:
+        # Import local: population.py folosește la rândul lui funcțiile din acest modul
+        from population import resolve_raster, block_population, population_within_radius
+
+        raster = resolve_raster(population_raster)
+        grid = {**grid, 'population': block_population(raster, grid['bounds'])}
+        total_population_in_radius = int(population_within_radius(raster, center[0], center[1], radius_km))
+    return compute_block_participation(
+        grid, radius_km, total_clients_needed, participation_rate, population_density, total_population_in_radius
+    )
+
+
+def blocks_to_records(blocks: Dict[str, np.ndarray]) -> List[Dict]:
+    """
+    Convertește vectorii blocurilor în listă de dict-uri (un dict per bloc)
+    """
+    return [
+        {
+            'lat': float(blocks['lat'][i]),
+            'lon': float(blocks['lon'][i]),
+            'distance': float(blocks['distance'][i]),
+            'participation': float(blocks['participation'][i]),
+            'population': int(blocks['population'][i]),
+            'interested': int(blocks['interested'][i]),
+            'color': blocks['color'][i],
+            'intensity': blocks['intensity'][i],
+            'bounds': blocks['bounds'][i].tolist(),
+            **({'capture': float(blocks['capture'][i])} if 'capture' in blocks else {})
+        }
+        for i in range(len(blocks['lat']))
+    ]
+
+
+def blocks_to_geojson(blocks: Dict[str, np.ndarray], block_size_km: float = DEFAULT_BLOCK_SIZE_KM) -> Dict:
+    """
+    Convertește blocurile într-un singur FeatureCollection GeoJSON
+
+    Un singur strat GeoJSON înlocuiește câte un poligon folium per bloc, deci harta rămâne
+    compactă și la mii de blocuri. Proprietățile fiecărui bloc poartă distanța, participarea,
+    populația și intensitatea, plus culoarea folosită la stilizare.
+    """
+    # GeoJSON folosește ordinea [lon, lat]
+    rings = np.round(blocks['bounds'][..., ::-1], 6).tolist()
+    distance = np.round(blocks['distance'], 2).tolist()
+    participation_pct = np.round(blocks['participation'] * 100, 1).tolist()
+    population = blocks['population'].tolist()
+    interested = blocks['interested'].tolist()
+    area_km2 = round(block_size_km * block_size_km, 4)
+    # Probabilitatea de captare (model Huff, vezi capture.py), dacă a fost calculată
+    capture_pct = np.round(blocks['capture'] * 100, 1).tolist() if 'capture' in blocks else [None] * len(rings)
+
+    features = [
+        {
+            'type': 'Feature',
+            'geometry': {'type': 'Polygon', 'coordinates': [rings[i]]},
+            'properties': {
+                'distance_km': distance[i],
+                'participation_pct': participation_pct[i],
+                'population': population[i],
+                'interested': interested[i],
+                'area_km2': area_km2,
+                'capture_pct': capture_pct[i],
+                'intensity': blocks['intensity'][i],
+                'color': blocks['color'][i]
+            }
+        }
+        for i in range(len(rings))
+    ]
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def blocks_to_dataframe(blocks: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    Convertește vectorii blocurilor într-un DataFrame (fără contururi)
+    """
+    return pd.DataFrame({
+        'lat': blocks['lat'],
+        'lon': blocks['lon'],
+        'distance': blocks['distance'],
+        'participation': blocks['participation'],
+        'population': blocks['population'],
+        'interested': blocks['interested'],
+        'color': blocks['color'],
+        'intensity': blocks['intensity']
+    })
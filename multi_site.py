@@ -0,0 +1,171 @@
+"""
+Analiză multi-locație (site-uri candidate și filiale)
+
+`calculations.LOCATION` descrie o singură sală. Modulul de față primește o listă de locații,
+fiecare cu capacitatea și suprafața ei, și le evaluează pe toate într-o singură trecere vectorizată:
+venituri, clienți, raza campaniei, suprapunerea zonelor de captare (canibalizare) și totalul combinat.
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from calculations import (
+    LOCATION,
+    CAPACITY_PER_HOUR,
+    HOURS_PER_DAY,
+    DAYS_PER_WEEK,
+    WEEKS_PER_MONTH,
+    TOTAL_AREA_M2,
+    OCCUPANCY_SCENARIOS,
+    DEFAULT_SUBSCRIPTION_DISTRIBUTION,
+    calculate_revenue_batch,
+    calculate_campaign_scale_batch
+)
+from competitor_analysis import calculate_market_position
+from geo import haversine_distance
+
+
+# Locația curentă ca listă cu un singur element (punctul de plecare pentru analize multi-site)
+DEFAULT_SITES = [
+    {
+        'id': 'prieteniei',
+        'name': f"Mobilis Vita - {LOCATION['address']}",
+        'coordinates': LOCATION['coordinates'],
+        'capacity_per_hour': CAPACITY_PER_HOUR,
+        'area_m2': TOTAL_AREA_M2
+    }
+]
+
+
+def site_max_capacity(capacity_per_hour) -> np.ndarray:
+    """
+    Capacitatea lunară (slot-uri) pentru una sau mai multe capacități orare, ca în `calculate_max_capacity`
+    """
+    slots = np.asarray(capacity_per_hour, dtype=np.float64) * HOURS_PER_DAY * DAYS_PER_WEEK * WEEKS_PER_MONTH
+    return np.trunc(slots).astype(np.int64)
+
+
+def circle_overlap_area(r1, r2, distance) -> np.ndarray:
+    """
+    Aria de intersecție (km²) a două cercuri de raze r1, r2 aflate la distanța dată (vectorizat)
+    """
+    r1, r2, d = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (r1, r2, distance)))
+    area = np.zeros(d.shape)
+
+    contained = d <= np.abs(r1 - r2)
+    area[contained] = np.pi * np.minimum(r1, r2)[contained] ** 2
+
+    partial = ~contained & (d < r1 + r2)
+    if partial.any():
+        a, b, dd = r1[partial], r2[partial], d[partial]
+        alpha = np.arccos(np.clip((dd ** 2 + a ** 2 - b ** 2) / (2 * dd * a), -1, 1))
+        beta = np.arccos(np.clip((dd ** 2 + b ** 2 - a ** 2) / (2 * dd * b), -1, 1))
+        kite = np.sqrt(np.clip((-dd + a + b) * (dd + a - b) * (dd - a + b) * (dd + a + b), 0, None))
+        area[partial] = a ** 2 * alpha + b ** 2 * beta - 0.5 * kite
+    return area
+
+
+def evaluate_sites(
+    sites: Optional[List[Dict]] = None,
+    scenario: str = 'medium',
+    subscription_distribution: Optional[Dict[str, float]] = None,
+    participation_rate: float = 0.10,
+    population_density: float = 1000,
+    conversion_rate: float = 0.05,
+    coverage_rate: float = 0.50
+) -> Dict:
+    """
+    Evaluează toate locațiile deodată, cu suprapunerea zonelor de captare
+
+    Fiecare locație poate suprascrie 'occupancy_rate', 'subscription_distribution' și
+    'population_density'; restul parametrilor vin din argumente. Aria comună a două zone de
+    captare se împarte egal între cele două locații (canibalizare).
+
+    Args:
+        sites: Lista de locații (dict cu 'id', 'name', 'coordinates', 'capacity_per_hour', 'area_m2')
+        scenario: Scenariul de ocupare folosit când o locație nu are 'occupancy_rate'
+        subscription_distribution: Distribuția implicită a serviciilor
+
+    Returns:
+        Dict cu 'sites' (DataFrame per locație), 'combined' (totaluri) și 'overlap_km2' (matrice S×S)
+    """
+    sites = sites or DEFAULT_SITES
+    if subscription_distribution is None:
+        subscription_distribution = DEFAULT_SUBSCRIPTION_DISTRIBUTION
+    scenario_config = OCCUPANCY_SCENARIOS[scenario]
+    default_occupancy = (scenario_config['min'] + scenario_config['max']) / 2
+
+    keys = list(subscription_distribution.keys())
+    distributions = np.array([
+        [site.get('subscription_distribution', subscription_distribution).get(k, 0) for k in keys]
+        for site in sites
+    ])
+    occupancy = np.array([site.get('occupancy_rate', default_occupancy) for site in sites], dtype=np.float64)
+    capacity_per_hour = np.array([site.get('capacity_per_hour', CAPACITY_PER_HOUR) for site in sites], dtype=np.float64)
+    density = np.array([site.get('population_density', population_density) for site in sites], dtype=np.float64)
+    area_m2 = np.array([site.get('area_m2', TOTAL_AREA_M2) for site in sites], dtype=np.float64)
+    coordinates = np.array([site['coordinates'] for site in sites], dtype=np.float64)
+
+    max_capacity = site_max_capacity(capacity_per_hour)
+    revenue_data = calculate_revenue_batch(occupancy, distributions, keys, max_capacity=max_capacity)
+    campaign = calculate_campaign_scale_batch(
+        revenue_data['total_clients'], participation_rate, density, conversion_rate, coverage_rate
+    )
+    radius = campaign['radius_km']
+    catchment_area = np.pi * radius ** 2
+
+    # Suprapunerea zonelor de captare pentru toate perechile de locații (S×S)
+    distances = haversine_distance(
+        coordinates[:, None, 0], coordinates[:, None, 1],
+        coordinates[None, :, 0], coordinates[None, :, 1]
+    )
+    overlap = circle_overlap_area(radius[:, None], radius[None, :], distances)
+    np.fill_diagonal(overlap, 0.0)
+
+    cannibalized_area = np.minimum(overlap.sum(axis=1) / 2, catchment_area)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cannibalization_rate = np.where(catchment_area > 0, cannibalized_area / catchment_area, 0.0)
+    exclusive_population = np.trunc((catchment_area - cannibalized_area) * density).astype(np.int64)
+    clients_at_risk = np.ceil(revenue_data['total_clients'] * cannibalization_rate).astype(np.int64)
+
+    sites_df = pd.DataFrame({
+        'ID': [site.get('id', f'site_{i}') for i, site in enumerate(sites)],
+        'Locație': [site.get('name', site.get('id', f'Locație {i + 1}')) for i, site in enumerate(sites)],
+        'Capacitate/Oră': capacity_per_hour.astype(int),
+        'Suprafață (mp)': area_m2,
+        'Ocupare': occupancy,
+        'Venit Total (RON)': revenue_data['total'],
+        'Clienți Totali': revenue_data['total_clients'],
+        'Venit/mp (RON)': np.round(revenue_data['total'] / np.where(area_m2 > 0, area_m2, np.nan), 2),
+        'Raza Influență (km)': np.round(radius, 2),
+        'Populație Totală': campaign['total_population'],
+        'Populație Exclusivă': exclusive_population,
+        'Canibalizare (%)': np.round(cannibalization_rate * 100, 1),
+        'Clienți la Risc': clients_at_risk
+    })
+
+    # Aria totală acoperită: incluziune-excludere de ordinul 2, limitată inferior de cea mai mare zonă
+    union_area = max(
+        catchment_area.sum() - np.triu(overlap, 1).sum(),
+        catchment_area.max() if len(sites) else 0.0
+    )
+    total_clients = int(revenue_data['total_clients'].sum())
+    combined = {
+        'sites_count': len(sites),
+        'total_revenue': int(revenue_data['total'].sum()),
+        'total_clients': total_clients,
+        'total_capacity_per_hour': int(capacity_per_hour.sum()),
+        'total_area_m2': float(area_m2.sum()),
+        'catchment_area_km2': float(union_area),
+        'overlap_area_km2': float(np.triu(overlap, 1).sum()),
+        'clients_at_risk': int(clients_at_risk.sum()),
+        'market_position': calculate_market_position(total_clients, int(capacity_per_hour.sum()))
+    }
+
+    return {
+        'sites': sites_df,
+        'combined': combined,
+        'overlap_km2': overlap,
+        'distances_km': distances
+    }
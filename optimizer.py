@@ -0,0 +1,200 @@
+"""
+Optimizare a mixului de servicii sub capacitatea sălilor
+
+Caută distribuția serviciilor din SUBSCRIPTION_TYPES care maximizează venitul per slot ocupat,
+respectând capacitatea fiecărei săli (FINANCIAL_FORECAST['capacity']['breakdown']) și un procent
+minim pentru serviciul principal ('clase_miscare'). Toate distribuțiile de pe grila simplexului
+(pas de 5%, ca slider-ele din sidebar) sunt evaluate vectorizat cu modelul exact de venit.
+"""
+from functools import lru_cache
+from itertools import combinations
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from calculations import (
+    SUBSCRIPTION_TYPES,
+    OCCUPANCY_SCENARIOS,
+    FINANCIAL_FORECAST,
+    calculate_revenue_batch
+)
+
+
+PRIMARY_SERVICE = 'clase_miscare'
+DEFAULT_STEP = 0.05
+
+# Ce sală folosește fiecare serviciu (fracțiuni din slot-urile serviciului)
+SERVICE_ROOM_USAGE = {
+    'clase_miscare': {'sala_clase': 1.0},
+    'fitness_access': {'sala_fitness': 1.0},
+    'complet': {'sala_clase': 0.5, 'sala_fitness': 0.5},
+    'family': {'sala_clase': 1.0},
+    'masaj': {'terapii_individuale': 1.0},
+    'kineto': {'terapii_individuale': 1.0}
+}
+
+
+def get_room_share_limits() -> Dict[str, float]:
+    """
+    Procentul maxim din slot-urile ocupate pe care îl poate prelua fiecare sală
+
+    Derivat din capacitatea orară a sălilor: ex. sala de clase 12 din 20 persoane/oră = 60%.
+    """
+    breakdown = FINANCIAL_FORECAST['capacity']['breakdown']
+    total = sum(breakdown.values())
+    return {room: capacity / total for room, capacity in breakdown.items()}
+
+
+@lru_cache(maxsize=8)
+def _simplex_grid(num_steps: int, num_services: int) -> np.ndarray:
+    # Stars and bars: fiecare combinație de separatori dă o compoziție a lui num_steps
+    separators = np.array(list(combinations(range(num_steps + num_services - 1), num_services - 1)))
+    bounds = np.hstack([
+        np.full((len(separators), 1), -1),
+        separators,
+        np.full((len(separators), 1), num_steps + num_services - 1)
+    ])
+    grid = (np.diff(bounds, axis=1) - 1) / num_steps
+    grid.setflags(write=False)
+    return grid
+
+
+def enumerate_distributions(step: float = DEFAULT_STEP, num_services: Optional[int] = None) -> np.ndarray:
+    """
+    Toate distribuțiile cu pasul dat care însumează 100% (matrice M×K)
+
+    Cu 6 servicii și pas de 5% rezultă 53.130 de distribuții.
+    """
+    num_steps = int(round(1 / step))
+    if num_services is None:
+        num_services = len(SUBSCRIPTION_TYPES)
+    return _simplex_grid(num_steps, num_services)
+
+
+def room_loads(distributions: np.ndarray, subscription_keys: Sequence[str]) -> Dict[str, np.ndarray]:
+    """
+    Procentul din slot-uri care ajunge în fiecare sală pentru fiecare distribuție
+    """
+    loads = {}
+    for room in FINANCIAL_FORECAST['capacity']['breakdown']:
+        usage = np.array([SERVICE_ROOM_USAGE.get(k, {}).get(room, 0.0) for k in subscription_keys])
+        loads[room] = distributions @ usage
+    return loads
+
+
+def _evaluate(
+    occupancy_rate: float,
+    step: float,
+    min_primary_share: float,
+    share_bounds: Optional[Dict[str, tuple]]
+) -> Dict:
+    keys = list(SUBSCRIPTION_TYPES.keys())
+    distributions = enumerate_distributions(step, len(keys))
+
+    # Constrângeri: capacitatea sălilor, procent minim serviciu principal, limite per serviciu
+    tolerance = 1e-9
+    feasible = distributions[:, keys.index(PRIMARY_SERVICE)] >= min_primary_share - tolerance
+    limits = get_room_share_limits()
+    for room, load in room_loads(distributions, keys).items():
+        feasible &= load <= limits[room] + tolerance
+    for sub_type, (low, high) in (share_bounds or {}).items():
+        column = distributions[:, keys.index(sub_type)]
+        feasible &= (column >= low - tolerance) & (column <= high + tolerance)
+
+    candidates = distributions[feasible]
+    result = calculate_revenue_batch(occupancy_rate, candidates, keys)
+    occupied_slots = int(result['occupied_slots'][0]) if len(candidates) else 0
+    return {
+        'keys': keys,
+        'distributions': candidates,
+        'revenue': result['total'],
+        'clients': result['total_clients'],
+        'occupied_slots': occupied_slots
+    }
+
+
+def optimize_subscription_mix(
+    occupancy_rate: Optional[float] = None,
+    min_primary_share: float = 0.4,
+    step: float = DEFAULT_STEP,
+    share_bounds: Optional[Dict[str, tuple]] = None
+) -> Dict:
+    """
+    Găsește mixul de servicii cu venitul maxim per slot ocupat
+
+    Args:
+        occupancy_rate: Rata de ocupare evaluată (default: mijlocul scenariului 'medium')
+        min_primary_share: Procentul minim pentru 'clase_miscare' (0-1)
+        step: Pasul grilei de distribuții
+        share_bounds: Limite opționale {tip_serviciu: (min, max)}
+
+    Returns:
+        Dict cu 'distribution', 'revenue', 'revenue_per_slot', 'total_clients',
+        'occupied_slots', 'candidates_evaluated' (None pentru distribuție dacă nu există soluție)
+    """
+    if occupancy_rate is None:
+        medium = OCCUPANCY_SCENARIOS['medium']
+        occupancy_rate = (medium['min'] + medium['max']) / 2
+
+    evaluated = _evaluate(occupancy_rate, step, min_primary_share, share_bounds)
+    if len(evaluated['revenue']) == 0:
+        return {
+            'distribution': None,
+            'revenue': 0,
+            'revenue_per_slot': 0,
+            'total_clients': 0,
+            'occupied_slots': evaluated['occupied_slots'],
+            'candidates_evaluated': 0
+        }
+
+    best = int(np.argmax(evaluated['revenue']))
+    revenue = int(evaluated['revenue'][best])
+    slots = evaluated['occupied_slots']
+    return {
+        'distribution': {k: float(v) for k, v in zip(evaluated['keys'], evaluated['distributions'][best])},
+        'revenue': revenue,
+        'revenue_per_slot': revenue / slots if slots > 0 else 0,
+        'total_clients': int(evaluated['clients'][best]),
+        'occupied_slots': slots,
+        'candidates_evaluated': len(evaluated['revenue'])
+    }
+
+
+def efficient_frontier(
+    occupancy_rate: Optional[float] = None,
+    step: float = DEFAULT_STEP,
+    share_bounds: Optional[Dict[str, tuple]] = None
+) -> pd.DataFrame:
+    """
+    Frontiera eficientă: venitul maxim per slot pentru fiecare procent minim de clase de mișcare
+
+    Arată cât venit se cedează pentru o pondere mai mare a serviciului principal.
+    Grila este evaluată o singură dată; fiecare punct al frontierei este un maxim filtrat.
+    """
+    if occupancy_rate is None:
+        medium = OCCUPANCY_SCENARIOS['medium']
+        occupancy_rate = (medium['min'] + medium['max']) / 2
+
+    evaluated = _evaluate(occupancy_rate, step, 0.0, share_bounds)
+    keys = evaluated['keys']
+    primary = evaluated['distributions'][:, keys.index(PRIMARY_SERVICE)]
+    slots = evaluated['occupied_slots']
+
+    rows = []
+    for min_share in np.round(np.arange(0, 1 + step / 2, step), 6):
+        mask = primary >= min_share - 1e-9
+        if not mask.any():
+            continue
+        idx = np.flatnonzero(mask)[np.argmax(evaluated['revenue'][mask])]
+        revenue = int(evaluated['revenue'][idx])
+        row = {
+            'Min. Clase Mișcare (%)': round(min_share * 100),
+            'Venit (RON)': revenue,
+            'Venit/Slot (RON)': round(revenue / slots, 2) if slots > 0 else 0,
+            'Clienți Totali': int(evaluated['clients'][idx])
+        }
+        for k, share in zip(keys, evaluated['distributions'][idx]):
+            row[f"{SUBSCRIPTION_TYPES[k]['name']} (%)"] = round(share * 100)
+        rows.append(row)
+    return pd.DataFrame(rows)
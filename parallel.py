@@ -0,0 +1,154 @@
+"""
+Evaluare paralelă pe un pool de procese, cu vectorii de intrare în memorie partajată
+
+Funcțiile vectorizate din calculations primesc vectori de lungime N și returnează vectori de
+lungime N. Pentru grile mari, vectorii de intrare se copiază o singură dată într-un bloc
+`multiprocessing.shared_memory`, iar fiecare proces evaluează o felie [start, end) și scrie
+rezultatul direct în blocul partajat de ieșire. Prin pipe circulă doar numele blocurilor și
+limitele feliilor, nu datele.
+
+Câștigul de timp față de evaluarea într-un singur proces nu a fost încă măsurat (implementarea a
+fost verificată doar pe o mașină cu un singur nucleu, unde rezultatele sunt identice cu evaluarea
+serială pentru 2 și 4 procese). Pragul PARALLEL_MIN_ROWS este o estimare, nu o valoare calibrată.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+
+# Sub acest număr de rânduri pornirea proceselor costă mai mult decât câștigul
+PARALLEL_MIN_ROWS = 200_000
+
+# Felii per proces: echilibrează încărcarea când unele felii sunt mai lente
+SHARDS_PER_WORKER = 4
+
+# Alinierea vectorilor în blocul partajat (o linie de cache)
+_ALIGNMENT = 64
+
+Layout = Dict[str, Tuple[int, str, Tuple[int, ...]]]
+
+
+def default_workers() -> int:
+    """
+    Numărul de nuclee disponibile procesului curent
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _layout(shapes: Dict[str, Tuple[np.dtype, Tuple[int, ...]]]) -> Tuple[Layout, int]:
+    # Poziția fiecărui vector în bloc: (offset, dtype, formă)
+    layout, offset = {}, 0
+    for name, (dtype, shape) in shapes.items():
+        layout[name] = (offset, np.dtype(dtype).str, tuple(shape))
+        offset += -(-int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize // _ALIGNMENT) * _ALIGNMENT
+    return layout, max(offset, 1)
+
+
+def _views(buffer, layout: Layout) -> Dict[str, np.ndarray]:
+    return {
+        name: np.ndarray(shape, dtype=np.dtype(dtype), buffer=buffer, offset=offset)
+        for name, (offset, dtype, shape) in layout.items()
+    }
+
+
+def _evaluate_shard(func: Callable, input_buffer, input_layout: Layout, output_buffer, output_layout: Layout, start: int, end: int, kwargs: Dict) -> None:
+    # Vederile în blocurile partajate există doar pe durata acestui apel (close() cere să fie eliberate)
+    inputs = _views(input_buffer, input_layout)
+    result = func(**{name: values[start:end] for name, values in inputs.items()}, **kwargs)
+    for name, values in _views(output_buffer, output_layout).items():
+        values[start:end] = result[name]
+
+
+def _run_shard(
+    func: Callable,
+    input_name: str,
+    input_layout: Layout,
+    output_name: str,
+    output_layout: Layout,
+    start: int,
+    end: int,
+    kwargs: Dict
+) -> int:
+    # Procesele din pool folosesc același resource tracker ca părintele, care face unlink() la final
+    input_block, output_block = SharedMemory(name=input_name), SharedMemory(name=output_name)
+    try:
+        _evaluate_shard(func, input_block.buf, input_layout, output_block.buf, output_layout, start, end, kwargs)
+    finally:
+        input_block.close()
+        output_block.close()
+    return end - start
+
+
+def _fill(buffer, layout: Layout, arrays: Dict[str, np.ndarray]) -> None:
+    for name, view in _views(buffer, layout).items():
+        view[...] = arrays[name]
+
+
+def _copy_out(buffer, layout: Layout) -> Dict[str, np.ndarray]:
+    return {name: view.copy() for name, view in _views(buffer, layout).items()}
+
+
+def parallel_map_arrays(
+    func: Callable[..., Dict[str, np.ndarray]],
+    inputs: Dict[str, np.ndarray],
+    workers: Optional[int] = None,
+    min_rows: int = PARALLEL_MIN_ROWS,
+    **kwargs
+) -> Dict[str, np.ndarray]:
+    """
+    Aplică o funcție vectorizată pe felii de rânduri, în paralel, cu intrări și ieșiri partajate
+
+    Args:
+        func: Funcție la nivel de modul (trebuie să poată fi trimisă altui proces) care primește
+            vectorii din `inputs` ca argumente cu nume (plus `kwargs`) și returnează un dict de
+            vectori cu aceeași primă dimensiune
+        inputs: Vectori NumPy (1D sau N×K) cu aceeași lungime N pe prima axă
+        workers: Numărul de procese (implicit toate nucleele disponibile)
+        min_rows: Sub acest N evaluarea se face direct, în procesul curent
+
+    Returns:
+        Dict-ul returnat de `func`, pentru toate cele N rânduri
+    """
+    inputs = {name: np.ascontiguousarray(values) for name, values in inputs.items()}
+    rows = len(next(iter(inputs.values()))) if inputs else 0
+    workers = workers or default_workers()
+    if workers <= 1 or rows < max(min_rows, 2):
+        return func(**inputs, **kwargs)
+
+    # Forma ieșirilor: evaluăm primul rând în procesul curent
+    sample = func(**{name: values[:1] for name, values in inputs.items()}, **kwargs)
+    output_layout, output_size = _layout({
+        name: (np.asarray(values).dtype, (rows,) + np.asarray(values).shape[1:]) for name, values in sample.items()
+    })
+    input_layout, input_size = _layout({name: (values.dtype, values.shape) for name, values in inputs.items()})
+
+    input_block = SharedMemory(create=True, size=input_size)
+    output_block = SharedMemory(create=True, size=output_size)
+    try:
+        _fill(input_block.buf, input_layout, inputs)
+
+        shards = min(rows, workers * SHARDS_PER_WORKER)
+        bounds = np.linspace(0, rows, shards + 1).astype(np.int64)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(
+                    _run_shard, func, input_block.name, input_layout, output_block.name, output_layout,
+                    int(start), int(end), kwargs
+                )
+                for start, end in zip(bounds[:-1], bounds[1:]) if end > start
+            ]
+            for future in futures:
+                future.result()
+
+        # Rezultatele se copiază din blocul partajat înainte de a-l elibera
+        return _copy_out(output_block.buf, output_layout)
+    finally:
+        input_block.close()
+        input_block.unlink()
+        output_block.close()
+        output_block.unlink()
@@ -0,0 +1,528 @@
+"""
+Raster de populație (grilă de celule) în locul densității uniforme
+
+`population_density` din sidebar presupune aceeași densitate peste tot, ceea ce subestimează
+cartierele de blocuri și supraestimează zonele industriale sau de case din Bacău. Aici încărcăm un
+raster local de populație (GeoTIFF, grilă CSV sau .npy), o singură dată, într-un vector NumPy
+memory-mapped și construim tabelul de sume pe suprafață (summed-area table). Orice sumă pe un
+dreptunghi costă apoi 4 citiri, iar populația dintr-un cerc un număr fix de dreptunghiuri.
+Pentru raza necesară unei populații țintă, fiecare locație are o curbă sortată a populației
+cumulate după distanță, pe care se caută binar. Curba se construiește doar pe fereastra de celule
+care poate conține ținta (raza de încadrare vine din tabelul de sume), nu pe tot rasterul.
+
+Distanțele folosesc peste tot aceeași proiecție plană locală (KM_PER_DEGREE_LAT pe latitudine,
+scalată cu cos(latitudinii centrului) pe longitudine), astfel încât populația dintr-o rază
+(tabelul de sume) și raza pentru o populație (curba) sunt consistente.
+
+Formate acceptate:
+- GeoTIFF cu o bandă (tag-urile ModelPixelScale / ModelTiepoint, citite cu Pillow)
+- CSV cu coloanele 'lat', 'lon', 'population' (centrele celulelor unei grile regulate)
+- .npy (rânduri de la nord la sud) cu fișierul de metadate alăturat '<nume>.npy.json'
+
+Valorile rasterului sunt numărul de locuitori per celulă.
+"""
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from geo import KM_PER_DEGREE_LAT
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Directorul cache-ului pe disc pentru rasterele convertite (ignorat de Git)
+POPULATION_CACHE_DIR = os.path.join(BASE_DIR, '.population_cache')
+
+# Rasterul folosit de dashboard: variabila de mediu POPULATION_RASTER sau primul fișier existent
+DEFAULT_RASTER_CANDIDATES = [
+    os.path.join(BASE_DIR, 'data', 'populatie_bacau.tif'),
+    os.path.join(BASE_DIR, 'data', 'populatie_bacau.csv'),
+    os.path.join(BASE_DIR, 'data', 'populatie_bacau.npy')
+]
+
+# Numărul de benzi orizontale cu care aproximăm un cerc (fiecare bandă are aria exactă a felei de cerc)
+CIRCLE_STRIPS = 32
+
+# Memoria maximă (octeți) a curbelor populație-distanță memorizate per raster (una per locație)
+DISTANCE_CURVE_CACHE_BYTES = 256 * 1024 ** 2
+
+# Raportul dintre razele candidate la căutarea razei de încadrare și la lărgirea ferestrei
+RADIUS_SEARCH_STEP = 1.1
+WINDOW_GROWTH = 1.25
+
+# Tag-uri GeoTIFF
+_TAG_PIXEL_SCALE = 33550
+_TAG_TIEPOINT = 33922
+_TAG_GDAL_NODATA = 42113
+
+_METADATA_KEYS = ('lat_top', 'lon_left', 'cell_lat', 'cell_lon')
+
+
+def find_population_raster() -> Optional[str]:
+    """
+    Returnează calea rasterului de populație disponibil, sau None dacă nu există niciunul
+    """
+    env_path = os.environ.get('POPULATION_RASTER')
+    for path in ([env_path] if env_path else []) + DEFAULT_RASTER_CANDIDATES:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def raster_cache_key(path: str) -> Tuple[str, int, int]:
+    """
+    Cheia unui fișier raster: calea absolută, data modificării și dimensiunea
+    """
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _read_geotiff(path: str) -> Tuple[np.ndarray, Dict[str, float]]:
+    from PIL import Image
+
+    with Image.open(path) as img:
+        tags = img.tag_v2
+        if _TAG_PIXEL_SCALE not in tags or _TAG_TIEPOINT not in tags:
+            raise ValueError(f"GeoTIFF fără georeferențiere (ModelPixelScale/ModelTiepoint): {path}")
+        scale = tags[_TAG_PIXEL_SCALE]
+        tiepoint = tags[_TAG_TIEPOINT]
+        nodata = tags.get(_TAG_GDAL_NODATA)
+        values = np.asarray(img, dtype=np.float64)
+
+    if nodata is not None:
+        values = np.where(values == float(str(nodata).strip('\x00 ')), 0.0, values)
+    metadata = {
+        'lat_top': float(tiepoint[4] + tiepoint[1] * scale[1]),
+        'lon_left': float(tiepoint[3] - tiepoint[0] * scale[0]),
+        'cell_lat': float(scale[1]),
+        'cell_lon': float(scale[0])
+    }
+    return values, metadata
+
+
+def _read_csv_grid(path: str) -> Tuple[np.ndarray, Dict[str, float]]:
+    df = pd.read_csv(path)
+    missing = {'lat', 'lon', 'population'} - set(df.columns)
+    if missing:
+        raise ValueError(f"Grila CSV trebuie să aibă coloanele lat, lon, population (lipsesc: {sorted(missing)})")
+
+    lats = np.unique(df['lat'].to_numpy(dtype=np.float64))
+    lons = np.unique(df['lon'].to_numpy(dtype=np.float64))
+    cell_lat = float(np.min(np.diff(lats))) if len(lats) > 1 else 0.001
+    cell_lon = float(np.min(np.diff(lons))) if len(lons) > 1 else 0.001
+
+    lat_top = float(lats.max() + cell_lat / 2)
+    lon_left = float(lons.min() - cell_lon / 2)
+    rows = np.rint((lat_top - df['lat'].to_numpy()) / cell_lat - 0.5).astype(np.int64)
+    cols = np.rint((df['lon'].to_numpy() - lon_left) / cell_lon - 0.5).astype(np.int64)
+
+    values = np.zeros((rows.max() + 1, cols.max() + 1))
+    np.add.at(values, (rows, cols), df['population'].to_numpy(dtype=np.float64))
+    return values, {'lat_top': lat_top, 'lon_left': lon_left, 'cell_lat': cell_lat, 'cell_lon': cell_lon}
+
+
+def _read_npy(path: str) -> Tuple[np.ndarray, Dict[str, float]]:
+    with open(f"{path}.json", 'r', encoding='utf-8') as meta_file:
+        metadata = json.load(meta_file)
+    return np.load(path, mmap_mode='r'), {k: float(metadata[k]) for k in _METADATA_KEYS}
+
+
+def summed_area_table(population: np.ndarray) -> np.ndarray:
+    """
+    Tabelul de sume pe suprafață: sat[i, j] = suma celulelor population[:i, :j] (dimensiune (R+1)×(C+1))
+    """
+    sat = np.zeros((population.shape[0] + 1, population.shape[1] + 1))
+    np.cumsum(population, axis=0, out=sat[1:, 1:])
+    np.cumsum(sat[1:, 1:], axis=1, out=sat[1:, 1:])
+    return sat
+
+
+def _cache_prefix(key: tuple) -> str:
+    digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(key[0]))[0]
+    return os.path.join(POPULATION_CACHE_DIR, f"{stem}_{digest}")
+
+
+def _memmap_cached(cache_path: str, build) -> np.ndarray:
+    # Vectorii mari sunt salvați o dată în cache și redeschiși memory-mapped; fără disc rămân în memorie
+    if os.path.exists(cache_path):
+        return np.load(cache_path, mmap_mode='r')
+
+    array = build()
+    try:
+        os.makedirs(POPULATION_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp.npy"
+        np.save(tmp_path, array)
+        os.replace(tmp_path, cache_path)
+        return np.load(cache_path, mmap_mode='r')
+    except OSError:
+        array.setflags(write=False)
+        return array
+
+
+def _build_raster(population: np.ndarray, metadata: Dict[str, float], source: Optional[str] = None, sat: Optional[np.ndarray] = None) -> Dict:
+    if population.ndim != 2 or min(population.shape) < 1:
+        raise ValueError("Rasterul de populație trebuie să fie o grilă 2D nevidă")
+    if sat is None:
+        sat = summed_area_table(population)
+        sat.setflags(write=False)
+    return {
+        'population': population,
+        'sat': sat,
+        'shape': population.shape,
+        'total_population': float(sat[-1, -1]),
+        'source': source,
+        'distance_curves': {},
+        **metadata
+    }
+
+
+@lru_cache(maxsize=8)
+def _load_raster(path: str, mtime_ns: int, size: int) -> Dict:
+    prefix = _cache_prefix((path, mtime_ns, size))
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.npy':
+        # Fișierul sursă este deja un vector NumPy: îl deschidem direct memory-mapped
+        population, metadata = _read_npy(path)
+    elif extension in ('.tif', '.tiff', '.csv'):
+        reader = _read_geotiff if extension != '.csv' else _read_csv_grid
+        metadata_path = f"{prefix}_meta.json"
+        if os.path.exists(f"{prefix}_population.npy") and os.path.exists(metadata_path):
+            with open(metadata_path, 'r', encoding='utf-8') as meta_file:
+                metadata = json.load(meta_file)
+            population = np.load(f"{prefix}_population.npy", mmap_mode='r')
+        else:
+            values, metadata = reader(path)
+            values = np.clip(np.nan_to_num(np.asarray(values, dtype=np.float64)), 0, None)
+            population = _memmap_cached(f"{prefix}_population.npy", lambda: values)
+            try:
+                with open(metadata_path, 'w', encoding='utf-8') as meta_file:
+                    json.dump(metadata, meta_file)
+            except OSError:
+                pass
+    else:
+        raise ValueError(f"Format raster necunoscut: {extension}")
+
+    sat = _memmap_cached(f"{prefix}_sat.npy", lambda: summed_area_table(population))
+    return _build_raster(population, metadata, source=path, sat=sat)
+
+
+def load_population_raster(path: str) -> Dict:
+    """
+    Încarcă (o singură dată per versiune a fișierului) un raster de populație
+
+    Rasterul și tabelul de sume sunt păstrate în POPULATION_CACHE_DIR ca .npy și redeschise
+    memory-mapped; la modificarea fișierului sursă cheia se schimbă și rasterul se reîncarcă.
+
+    Returns:
+        Dict cu 'population' (R×C), 'sat' ((R+1)×(C+1)), 'shape', 'total_population', 'source'
+        și georeferențierea 'lat_top', 'lon_left', 'cell_lat', 'cell_lon' (grade)
+    """
+    return _load_raster(*raster_cache_key(path))
+
+
+def raster_from_array(
+    population: np.ndarray,
+    lat_top: float,
+    lon_left: float,
+    cell_lat: float,
+    cell_lon: float
+) -> Dict:
+    """
+    Construiește un raster în memorie dintr-o grilă NumPy (rânduri de la nord la sud)
+    """
+    population = np.clip(np.nan_to_num(np.asarray(population, dtype=np.float64)), 0, None)
+    population.setflags(write=False)
+    metadata = {'lat_top': float(lat_top), 'lon_left': float(lon_left), 'cell_lat': float(cell_lat), 'cell_lon': float(cell_lon)}
+    return _build_raster(population, metadata)
+
+
+def resolve_raster(population_raster) -> Optional[Dict]:
+    """
+    Acceptă o cale către raster, un raster deja încărcat sau None
+    """
+    if population_raster is None or isinstance(population_raster, dict):
+        return population_raster
+    return load_population_raster(population_raster)
+
+
+def _integral(raster: Dict, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    # Interpolarea biliniară a tabelului de sume este exactă pentru populație uniformă în interiorul celulei
+    sat = raster['sat']
+    num_rows, num_cols = raster['shape']
+    rows = np.clip(rows, 0, num_rows)
+    cols = np.clip(cols, 0, num_cols)
+    i = np.minimum(np.floor(rows).astype(np.int64), num_rows - 1)
+    j = np.minimum(np.floor(cols).astype(np.int64), num_cols - 1)
+    fr = rows - i
+    fc = cols - j
+    return (
+        (1 - fr) * (1 - fc) * sat[i, j]
+        + fr * (1 - fc) * sat[i + 1, j]
+        + (1 - fr) * fc * sat[i, j + 1]
+        + fr * fc * sat[i + 1, j + 1]
+    )
+
+
+def population_in_rectangles(raster: Dict, lat_min, lat_max, lon_min, lon_max) -> np.ndarray:
+    """
+    Populația din dreptunghiurile [lat_min, lat_max] × [lon_min, lon_max] (vectorizat, O(1) per dreptunghi)
+    """
+    row_top = (raster['lat_top'] - np.asarray(lat_max, dtype=np.float64)) / raster['cell_lat']
+    row_bottom = (raster['lat_top'] - np.asarray(lat_min, dtype=np.float64)) / raster['cell_lat']
+    col_left = (np.asarray(lon_min, dtype=np.float64) - raster['lon_left']) / raster['cell_lon']
+    col_right = (np.asarray(lon_max, dtype=np.float64) - raster['lon_left']) / raster['cell_lon']
+    return (
+        _integral(raster, row_bottom, col_right)
+        - _integral(raster, row_top, col_right)
+        - _integral(raster, row_bottom, col_left)
+        + _integral(raster, row_top, col_left)
+    )
+
+
+def population_within_radius(raster: Dict, lat, lon, radius_km) -> np.ndarray:
+    """
+    Populația din cercul de rază `radius_km` din jurul fiecărui punct (vectorizat)
+
+    Cercul este împărțit în CIRCLE_STRIPS benzi orizontale; fiecare bandă devine un dreptunghi cu
+    aria exactă a felei de cerc, deci costul per punct este constant, indiferent de rază.
+    """
+    lat, lon, radius = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (lat, lon, radius_km)))
+    radius = radius[..., None]
+
+    # Benzile în km față de centru și aria exactă a fiecărei felii de cerc
+    edges = np.linspace(-1.0, 1.0, CIRCLE_STRIPS + 1) * radius
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ratio = np.clip(np.where(radius > 0, edges / radius, 0.0), -1, 1)
+    primitive = radius ** 2 * (ratio * np.sqrt(1 - ratio ** 2) + np.arcsin(ratio))
+    strip_height = np.diff(edges, axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        half_width = np.where(strip_height > 0, np.diff(primitive, axis=-1) / (2 * strip_height), 0.0)
+
+    lon_scale = KM_PER_DEGREE_LAT * np.cos(np.radians(lat))[..., None]
+    totals = population_in_rectangles(
+        raster,
+        lat[..., None] + edges[..., :-1] / KM_PER_DEGREE_LAT,
+        lat[..., None] + edges[..., 1:] / KM_PER_DEGREE_LAT,
+        lon[..., None] - half_width / lon_scale,
+        lon[..., None] + half_width / lon_scale
+    )
+    return totals.sum(axis=-1)
+
+
+def _km_per_degree_lon(lat: float) -> float:
+    return KM_PER_DEGREE_LAT * np.cos(np.radians(lat))
+
+
+def _half_cell_km(raster: Dict, lat: float) -> float:
+    return 0.5 * np.hypot(raster['cell_lat'] * KM_PER_DEGREE_LAT, raster['cell_lon'] * _km_per_degree_lon(lat))
+
+
+def _full_raster_radius(raster: Dict, lat: float, lon: float) -> float:
+    # Distanța până la cel mai îndepărtat colț: fereastra de această rază acoperă tot rasterul
+    num_rows, num_cols = raster['shape']
+    lat_span = np.array([raster['lat_top'] - num_rows * raster['cell_lat'], raster['lat_top']]) - lat
+    lon_span = np.array([raster['lon_left'], raster['lon_left'] + num_cols * raster['cell_lon']]) - lon
+    return float(np.hypot(
+        np.abs(lat_span).max() * KM_PER_DEGREE_LAT,
+        np.abs(lon_span).max() * _km_per_degree_lon(lat)
+    ))
+
+
+def _bounding_radius(raster: Dict, lat: float, lon: float, population: float) -> float:
+    """
+    Raza care cuprinde `population` locuitori, estimată din tabelul de sume
+
+    Razele candidate cresc geometric (RADIUS_SEARCH_STEP) până la raza întregului raster;
+    populația lor se citește vectorizat, la cost constant per rază.
+    """
+    max_radius = _full_raster_radius(raster, lat, lon)
+    if population <= 0:
+        return 0.0
+    min_radius = min(2 * _half_cell_km(raster, lat), max_radius)
+    steps = int(np.ceil(np.log(max_radius / min_radius) / np.log(RADIUS_SEARCH_STEP))) + 1 if min_radius > 0 else 1
+    radii = np.minimum(min_radius * RADIUS_SEARCH_STEP ** np.arange(steps), max_radius)
+    reached = np.flatnonzero(population_within_radius(raster, lat, lon, radii) >= population)
+    return float(radii[reached[0]]) if len(reached) else max_radius
+
+
+def _build_distance_curve(raster: Dict, lat: float, lon: float, radius_km: float) -> Dict:
+    # Celulele ferestrei care încadrează cercul de rază radius_km (sau tot rasterul)
+    num_rows, num_cols = raster['shape']
+    km_per_lon = _km_per_degree_lon(lat)
+    lat_offset = radius_km / KM_PER_DEGREE_LAT
+    lon_offset = radius_km / km_per_lon
+    row_start = max(int(np.floor((raster['lat_top'] - lat - lat_offset) / raster['cell_lat'] - 0.5)), 0)
+    row_end = min(int(np.ceil((raster['lat_top'] - lat + lat_offset) / raster['cell_lat'] - 0.5)) + 1, num_rows)
+    col_start = max(int(np.floor((lon - lon_offset - raster['lon_left']) / raster['cell_lon'] - 0.5)), 0)
+    col_end = min(int(np.ceil((lon + lon_offset - raster['lon_left']) / raster['cell_lon'] - 0.5)) + 1, num_cols)
+    row_start, col_start = min(row_start, row_end), min(col_start, col_end)
+    complete = (row_start, row_end, col_start, col_end) == (0, num_rows, 0, num_cols)
+
+    window = np.asarray(raster['population'][row_start:row_end, col_start:col_end], dtype=np.float64)
+    window_cols = col_end - col_start
+    population = window.ravel()
+    inhabited = np.flatnonzero(population > 0)
+    dy = (raster['lat_top'] - (row_start + inhabited // window_cols + 0.5) * raster['cell_lat'] - lat) * KM_PER_DEGREE_LAT
+    dx = (raster['lon_left'] + (col_start + inhabited % window_cols + 0.5) * raster['cell_lon'] - lon) * km_per_lon
+    distance = np.hypot(dy, dx)
+    population = population[inhabited]
+    if not complete:
+        # Colțurile ferestrei sunt în afara cercului și pot lipsi celule la aceeași distanță
+        inside = distance <= radius_km
+        distance, population = distance[inside], population[inside]
+
+    order = np.argsort(distance, kind='stable')
+    distance = distance[order]
+    population = population[order]
+    cumulative = np.cumsum(population) - population / 2
+
+    if complete:
+        # Capătul curbei: jumătatea de diagonală a celulei după ultimul centru, cu toată populația
+        last_distance = distance[-1] + _half_cell_km(raster, lat) if len(distance) else 0.0
+    else:
+        last_distance = radius_km
+    curve = {
+        'distance_km': np.concatenate([[0.0], distance, [last_distance]]),
+        'cumulative': np.concatenate([[0.0], cumulative, [population.sum()]]),
+        'complete': complete
+    }
+    curve['distance_km'].setflags(write=False)
+    curve['cumulative'].setflags(write=False)
+    return curve
+
+
+def _curve_covers(curve: Dict, radius_km: float, population: float) -> bool:
+    # O curbă parțială este exactă până la ultimul centru de celulă (penultimul punct)
+    if curve['complete']:
+        return True
+    return curve['distance_km'][-2] >= radius_km and curve['cumulative'][-2] >= population
+
+
+def _curve_bytes(curve: Dict) -> int:
+    return curve['distance_km'].nbytes + curve['cumulative'].nbytes
+
+
+def population_distance_curve(
+    raster: Dict,
+    lat: float,
+    lon: float,
+    min_radius_km: float = 0.0,
+    min_population: float = 0.0
+) -> Dict:
+    """
+    Curba populației cumulate în funcție de distanța față de un punct (sortată crescător)
+
+    Fiecare celulă contribuie la distanța centrului ei; pe curbă se folosește regula punctului
+    de mijloc (jumătate din celulă este socotită înainte de centrul ei), iar între puncte se
+    interpolează liniar. Curba acoperă doar fereastra de celule necesară pentru `min_radius_km`
+    și `min_population` (raza de încadrare se estimează din tabelul de sume, iar fereastra se
+    lărgește dacă ținta nu este atinsă). Curbele se memorizează în raster, în limita
+    DISTANCE_CURVE_CACHE_BYTES, și se reconstruiesc pe o fereastră mai mare doar când o
+    interogare depășește zona acoperită.
+
+    Returns:
+        Dict cu vectorii read-only 'distance_km', 'cumulative' (populația până la acea distanță)
+        și 'complete' (True dacă fereastra cuprinde tot rasterul)
+    """
+    key = (round(float(lat), 6), round(float(lon), 6))
+    curves = raster['distance_curves']
+    curve = curves.pop(key, None)
+    if curve is None or not _curve_covers(curve, min_radius_km, min_population):
+        radius = max(min_radius_km, _bounding_radius(raster, key[0], key[1], min_population))
+        if curve is not None:
+            radius = max(radius, curve['distance_km'][-1] * WINDOW_GROWTH)
+        curve = _build_distance_curve(raster, key[0], key[1], radius)
+        while not _curve_covers(curve, min_radius_km, min_population):
+            radius = max(radius * WINDOW_GROWTH, _half_cell_km(raster, key[0]))
+            curve = _build_distance_curve(raster, key[0], key[1], radius)
+
+    # Ordinea dict-ului este ordinea utilizării: se elimină întâi curbele folosite cel mai demult
+    curves[key] = curve
+    total_bytes = sum(_curve_bytes(cached) for cached in curves.values())
+    while total_bytes > DISTANCE_CURVE_CACHE_BYTES and len(curves) > 1:
+        total_bytes -= _curve_bytes(curves.pop(next(iter(curves))))
+    return curve
+
+
+def _interp_per_site(raster: Dict, lat, lon, values, to_radius: bool) -> np.ndarray:
+    lat, lon, values = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (lat, lon, values)))
+    flat_values = values.ravel()
+    result = np.empty(flat_values.shape)
+    sites, inverse = np.unique(np.stack([lat.ravel(), lon.ravel()], axis=1), axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    for site_idx, (site_lat, site_lon) in enumerate(sites):
+        mask = inverse == site_idx
+        limit = float(flat_values[mask].max())
+        if to_radius:
+            curve = population_distance_curve(raster, site_lat, site_lon, min_population=limit)
+            result[mask] = np.interp(flat_values[mask], curve['cumulative'], curve['distance_km'])
+        else:
+            curve = population_distance_curve(raster, site_lat, site_lon, min_radius_km=limit)
+            result[mask] = np.interp(flat_values[mask], curve['distance_km'], curve['cumulative'])
+    return result.reshape(values.shape)
+
+
+def radius_for_population(raster: Dict, lat, lon, target_population) -> np.ndarray:
+    """
+    Raza minimă (km) care cuprinde populația țintă în jurul fiecărui punct
+
+    Căutare binară pe curba populației cumulate a fiecărui punct (vectorizat pe ținte).
+    Dacă ținta depășește populația rasterului, se returnează raza care acoperă tot rasterul.
+    """
+    target = np.asarray(target_population, dtype=np.float64)
+    radius = _interp_per_site(raster, lat, lon, target, to_radius=True)
+    return np.where(target > 0, radius, 0.0)
+
+
+def population_at_radius(raster: Dict, lat, lon, radius_km) -> np.ndarray:
+    """
+    Populația până la distanța dată, citită de pe curba populației cumulate (inversa `radius_for_population`)
+    """
+    return _interp_per_site(raster, lat, lon, radius_km, to_radius=False)
+
+
+def block_population(raster: Dict, bounds: np.ndarray) -> np.ndarray:
+    """
+    Populația fiecărui bloc din grila hărții (contururi n×5×2 [lat, lon], ca în geo.build_block_grid)
+    """
+    bounds = np.asarray(bounds, dtype=np.float64)
+    return np.trunc(population_in_rectangles(
+        raster,
+        bounds[..., 0].min(axis=-1),
+        bounds[..., 0].max(axis=-1),
+        bounds[..., 1].min(axis=-1),
+        bounds[..., 1].max(axis=-1)
+    )).astype(np.int64)
+
+
+def campaign_scale_from_raster(
+    raster: Dict,
+    center: Tuple[float, float],
+    total_population_needed,
+    participation_rate: float
+) -> Dict[str, np.ndarray]:
+    """
+    Raza, aria și populația reală din jurul centrului pentru populația totală necesară
+
+    Returns:
+        Dict cu 'radius_km', 'area_km2', 'total_population' (populația din rază),
+        'interested_population' și 'effective_density' (oameni/km²)
+    """
+    radius = radius_for_population(raster, center[0], center[1], total_population_needed)
+    area = np.pi * radius ** 2
+    total_population = population_at_radius(raster, center[0], center[1], radius)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        effective_density = np.where(area > 0, total_population / area, 0.0)
+    return {
+        'radius_km': radius,
+        'area_km2': area,
+        'total_population': total_population,
+        'interested_population': total_population * participation_rate,
+        'effective_density': effective_density
+    }
@@ -0,0 +1,152 @@
+"""
+Cronometrarea randării dashboard-ului (secțiuni, apeluri de calcul, hartă, grafice, imagini)
+
+Fiecare măsurătoare se adaugă într-un depozit de timpi (un dict simplu, păstrat în
+st.session_state), cu ultimele ROLLING_SAMPLES valori per nume, din care se calculează
+percentilele afișate în panoul de debug. Fiecare măsurătoare este emisă și ca linie de log
+structurată (JSON) pe logger-ul TIMING_LOGGER; cu variabila de mediu RENDER_TIMING_LOG=1
+liniile se scriu pe stderr.
+
+Modulul nu depinde de Streamlit: depozitul este un dict, iar funcțiile cronometrate sunt
+învelite explicit cu `timed_function`, iar blocurile de cod se cronometrează cu `timed`.
+"""
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterable, Iterator, List
+
+import numpy as np
+
+
+# Câte măsurători recente se păstrează per nume (fereastra percentilelor)
+ROLLING_SAMPLES = 200
+
+PERCENTILES = (50, 90, 99)
+
+# Cheia depozitului în st.session_state
+TIMINGS_KEY = 'render_timings'
+
+TIMING_LOGGER = 'mobilis_vita.timing'
+LOG_ENV_VAR = 'RENDER_TIMING_LOG'
+
+logger = logging.getLogger(TIMING_LOGGER)
+
+
+def configure_logging() -> None:
+    """
+    Scrie liniile de timp pe stderr dacă RENDER_TIMING_LOG este activă (o singură dată per proces)
+    """
+    if os.environ.get(LOG_ENV_VAR, '').lower() not in ('1', 'true', 'da'):
+        return
+    if not any(getattr(handler, '_render_timing', False) for handler in logger.handlers):
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        handler._render_timing = True
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+def new_timing_store() -> Dict:
+    """
+    Un depozit de timpi gol
+
+    Returns:
+        Dict cu 'runs' (numărul de rerun-uri începute) și 'timings' (nume → {'kind', 'samples'})
+    """
+    return {'runs': 0, 'timings': {}}
+
+
+def start_run(store: Dict) -> int:
+    """
+    Marchează începutul unui rerun; numărul lui apare în liniile de log
+    """
+    store['runs'] += 1
+    return store['runs']
+
+
+def record_timing(store: Dict, name: str, kind: str, seconds: float) -> None:
+    """
+    Adaugă o măsurătoare în depozit și o emite ca linie de log structurată
+    """
+    timing = store['timings'].get(name)
+    if timing is None:
+        timing = store['timings'][name] = {'kind': kind, 'samples': deque(maxlen=ROLLING_SAMPLES)}
+    timing['samples'].append(seconds)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({
+            'event': 'render_timing',
+            'run': store['runs'],
+            'kind': kind,
+            'name': name,
+            'ms': round(seconds * 1000, 3)
+        }, ensure_ascii=False))
+
+
+@contextmanager
+def timed(store: Dict, name: str, kind: str = 'section') -> Iterator[None]:
+    """
+    Cronometrează blocul `with` (timpul se înregistrează și dacă blocul aruncă o excepție)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(store, name, kind, time.perf_counter() - start)
+
+
+def timed_function(func: Callable, store: Dict, name: str, kind: str = 'call') -> Callable:
+    """
+    Învelește o funcție astfel încât fiecare apel să fie cronometrat sub `name`
+
+    Funcția învelită păstrează numele sub care se cronometrează în atributul `timing_name`.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record_timing(store, name, kind, time.perf_counter() - start)
+    wrapper.timing_name = name
+    return wrapper
+
+
+def untimed_functions(namespace: Dict, modules: Iterable[str]) -> List[str]:
+    """
+    Funcțiile din namespace care provin din modulele date și nu au fost învelite cu `timed_function`
+
+    Verificare pentru lista explicită de funcții cronometrate: un import nou dintr-un modul
+    cronometrat, fără învelirea lui, apare aici.
+    """
+    modules = set(modules)
+    return sorted(
+        name for name, value in namespace.items()
+        if callable(value) and not isinstance(value, type)
+        and getattr(value, '__module__', None) in modules
+        and not hasattr(value, 'timing_name')
+    )
+
+
+def timing_summary(store: Dict) -> List[Dict]:
+    """
+    Percentilele timpilor din fereastra recentă, în milisecunde, sortate descrescător după p50
+
+    Returns:
+        Listă de dict-uri cu 'name', 'kind', 'count', 'last_ms', 'p50_ms', 'p90_ms', 'p99_ms'
+    """
+    rows = []
+    for name, timing in store['timings'].items():
+        samples = np.fromiter(timing['samples'], dtype=np.float64) * 1000
+        if not len(samples):
+            continue
+        row = {'name': name, 'kind': timing['kind'], 'count': len(samples), 'last_ms': samples[-1]}
+        for percentile, value in zip(PERCENTILES, np.percentile(samples, PERCENTILES)):
+            row[f"p{percentile}_ms"] = value
+        rows.append(row)
+    return sorted(rows, key=lambda row: row['p50_ms'], reverse=True)
@@ -0,0 +1,186 @@
+"""
+Analiză de sensibilitate (tornado) pentru intrările analizei de scenariu
+
+Fiecare intrare a `get_scenario_analysis` (ocupare, rată participare, densitate, conversie,
+acoperire), fiecare preț din SUBSCRIPTION_TYPES și fiecare pondere din distribuție este
+perturbată în jos și în sus. Toate variantele sunt evaluate într-o singură trecere vectorizată,
+iar rezultatul conține elasticitățile venitului, clienților și razei campaniei.
+"""
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from calculations import (
+    OCCUPANCY_SCENARIOS,
+    SUBSCRIPTION_TYPES,
+    calculate_revenue_batch,
+    calculate_campaign_scale_batch
+)
+
+
+DEFAULT_PERTURBATION = 0.10  # ±10%
+
+# Intrările care sunt rate (limitate la [0, 1] după perturbare)
+RATE_PARAMETERS = {'occupancy_rate', 'participation_rate', 'conversion_rate', 'coverage_rate'}
+
+PARAMETER_LABELS = {
+    'occupancy_rate': 'Rată Ocupare',
+    'participation_rate': 'Rată Participare',
+    'population_density': 'Densitate Populație',
+    'conversion_rate': 'Rată Conversie',
+    'coverage_rate': 'Rată Acoperire'
+}
+
+
+def _shift_share(distribution: np.ndarray, index: int, factor: float) -> np.ndarray:
+    """
+    Modifică ponderea unui serviciu cu `factor` și renormalizează proporțional celelalte ponderi
+    """
+    shifted = distribution.copy()
+    new_share = min(distribution[index] * factor, 1.0)
+    others = distribution.sum() - distribution[index]
+    if others > 0:
+        shifted *= (1.0 - new_share) / others
+    shifted[index] = new_share
+    return shifted
+
+
+def sensitivity_analysis(
+    scenario: str,
+    subscription_distribution: Dict[str, float],
+    participation_rate: float = 0.10,
+    population_density: float = 1000,
+    conversion_rate: float = 0.05,
+    coverage_rate: float = 0.50,
+    perturbation: float = DEFAULT_PERTURBATION,
+    population_raster=None
+) -> pd.DataFrame:
+    """
+    Calculează sensibilitatea venitului, clienților și razei la fiecare intrare
+
+    Elasticitatea este variația relativă a rezultatului împărțită la variația relativă a intrării
+    (diferență centrată între varianta de jos și cea de sus). Ponderile egale cu 0 și ratele
+    deja la limită au variație efectivă 0 și deci elasticitate 0.
+
+    Args:
+        scenario: 'reduced', 'medium', sau 'high'
+        subscription_distribution: Distribuția serviciilor
+        perturbation: Perturbarea relativă aplicată fiecărei intrări (ex: 0.10 = ±10%)
+        population_raster: Calea sau rasterul de populație (vezi population.py); raza se
+            calculează pe populația reală, deci densitatea uniformă nu mai influențează raza
+
+    Returns:
+        DataFrame cu o linie per intrare, sortat descrescător după impactul asupra venitului
+    """
+    scenario_config = OCCUPANCY_SCENARIOS[scenario]
+    keys = list(subscription_distribution.keys())
+    base_distribution = np.array([subscription_distribution[k] for k in keys], dtype=np.float64)
+    base_prices = np.array([SUBSCRIPTION_TYPES[k]['price'] if k in SUBSCRIPTION_TYPES else 0 for k in keys], dtype=np.float64)
+    base_inputs = {
+        'occupancy_rate': (scenario_config['min'] + scenario_config['max']) / 2,
+        'participation_rate': participation_rate,
+        'population_density': population_density,
+        'conversion_rate': conversion_rate,
+        'coverage_rate': coverage_rate
+    }
+
+    # Rândul 0 = cazul de bază; apoi câte 2 rânduri (jos, sus) per intrare
+    parameters: List[Dict] = []
+    for name, value in base_inputs.items():
+        parameters.append({'name': name, 'label': PARAMETER_LABELS[name], 'kind': 'input', 'base': value})
+    for idx, k in enumerate(keys):
+        if k in SUBSCRIPTION_TYPES:
+            parameters.append({'name': f'price_{k}', 'label': f"Preț {SUBSCRIPTION_TYPES[k]['name']}", 'kind': 'price', 'index': idx, 'base': base_prices[idx]})
+    for idx, k in enumerate(keys):
+        label = SUBSCRIPTION_TYPES[k]['name'] if k in SUBSCRIPTION_TYPES else k
+        parameters.append({'name': f'share_{k}', 'label': f"Pondere {label}", 'kind': 'share', 'index': idx, 'base': base_distribution[idx]})
+
+    num_rows = 1 + 2 * len(parameters)
+    inputs = {name: np.full(num_rows, float(value)) for name, value in base_inputs.items()}
+    distributions = np.tile(base_distribution, (num_rows, 1))
+    prices = np.tile(base_prices, (num_rows, 1))
+    input_values = np.zeros((len(parameters), 2))
+
+    for p_idx, param in enumerate(parameters):
+        for side, factor in enumerate((1 - perturbation, 1 + perturbation)):
+            row = 1 + 2 * p_idx + side
+            if param['kind'] == 'input':
+                value = param['base'] * factor
+                if param['name'] in RATE_PARAMETERS:
+                    value = min(max(value, 0.0), 1.0)
+                inputs[param['name']][row] = value
+            elif param['kind'] == 'price':
+                value = param['base'] * factor
+                prices[row, param['index']] = value
+            else:
+                distributions[row] = _shift_share(base_distribution, param['index'], factor)
+                value = distributions[row, param['index']]
+            input_values[p_idx, side] = value
+
+    revenue_data = calculate_revenue_batch(inputs['occupancy_rate'], distributions, keys, prices=prices)
+    campaign = calculate_campaign_scale_batch(
+        revenue_data['total_clients'],
+        inputs['participation_rate'],
+        inputs['population_density'],
+        inputs['conversion_rate'],
+        inputs['coverage_rate'],
+        population_raster=population_raster
+    )
+    outputs = {
+        'revenue': revenue_data['total'].astype(np.float64),
+        'clients': revenue_data['total_clients'].astype(np.float64),
+        'radius_km': campaign['radius_km']
+    }
+
+    base_values = np.array([p['base'] for p in parameters], dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        input_change = (input_values[:, 1] - input_values[:, 0]) / base_values
+
+    rows = []
+    for p_idx, param in enumerate(parameters):
+        row = {
+            'Parametru': param['label'],
+            'Cheie': param['name'],
+            'Valoare Bază': param['base'],
+            'Valoare Jos': input_values[p_idx, 0],
+            'Valoare Sus': input_values[p_idx, 1]
+        }
+        for metric, label in (('revenue', 'Venit'), ('clients', 'Clienți'), ('radius_km', 'Rază')):
+            base_output = outputs[metric][0]
+            low_output = outputs[metric][1 + 2 * p_idx]
+            high_output = outputs[metric][2 + 2 * p_idx]
+            change = input_change[p_idx]
+            if base_output != 0 and np.isfinite(change) and change != 0:
+                elasticity = ((high_output - low_output) / base_output) / change
+            else:
+                elasticity = 0.0
+            row[f'{label} Bază'] = base_output
+            row[f'{label} Jos'] = low_output
+            row[f'{label} Sus'] = high_output
+            row[f'Elasticitate {label}'] = round(float(elasticity), 4)
+        rows.append(row)
+
+    result = pd.DataFrame(rows)
+    result['Impact Venit'] = (result['Venit Sus'] - result['Venit Jos']).abs()
+    return result.sort_values('Impact Venit', ascending=False).reset_index(drop=True)
+
+
+def tornado_data(sensitivity_df: pd.DataFrame, metric: str = 'Venit', top: int = 10) -> pd.DataFrame:
+    """
+    Pregătește datele pentru graficul tornado: variația față de bază pentru cele mai influente intrări
+
+    Args:
+        sensitivity_df: Rezultatul `sensitivity_analysis`
+        metric: 'Venit', 'Clienți' sau 'Rază'
+        top: Numărul de intrări afișate
+    """
+    elasticity = sensitivity_df[f'Elasticitate {metric}']
+    ordered = sensitivity_df.assign(_impact=elasticity.abs()).sort_values('_impact', ascending=False).head(top)
+    return pd.DataFrame({
+        'Parametru': ordered['Parametru'],
+        'Bază': ordered[f'{metric} Bază'],
+        'Jos': ordered[f'{metric} Jos'],
+        'Sus': ordered[f'{metric} Sus'],
+        'Elasticitate': ordered[f'Elasticitate {metric}']
+    }).iloc[::-1].reset_index(drop=True)
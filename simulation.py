@@ -0,0 +1,235 @@
+"""
+Simulare Monte Carlo pentru scenariile de ocupare
+
+`get_scenario_analysis` reduce fiecare scenariu din OCCUPANCY_SCENARIOS la mijlocul intervalului.
+Modulul de față extrage aleator ocuparea, zgomotul din distribuția serviciilor, rata de conversie
+și rata de acoperire, evaluează toate încercările vectorizat și returnează benzi de percentile
+pentru venit, clienți și raza campaniei.
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence
+
+from calculations import (
+    OCCUPANCY_SCENARIOS,
+    DESIRED_MONTHLY_REVENUE,
+    calculate_revenue_batch,
+    calculate_campaign_scale_batch
+)
+
+
+DEFAULT_TRIALS = 100_000
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+# Configurația implicită a distribuțiilor de probabilitate
+# Tipuri suportate: 'fixed', 'uniform', 'triangular', 'normal' (trunchiată la [low, high]), 'beta'
+# Pentru ocupare, 'scenario' înseamnă uniform între min și max din OCCUPANCY_SCENARIOS
+DEFAULT_SIMULATION_CONFIG = {
+    'occupancy': {'type': 'scenario'},
+    'distribution_concentration': 200,  # Dirichlet: mai mare = zgomot mai mic în mixul de servicii
+    'conversion_rate': {'type': 'triangular', 'low': 0.03, 'mode': 0.05, 'high': 0.08},
+    'coverage_rate': {'type': 'triangular', 'low': 0.35, 'mode': 0.50, 'high': 0.65},
+    'participation_rate': {'type': 'fixed', 'value': 0.10},
+    'population_density': {'type': 'fixed', 'value': 1000}
+}
+
+
+def simulation_config(
+    participation_rate: float,
+    population_density: float,
+    conversion_rate: float,
+    coverage_rate: float
+) -> Dict:
+    """
+    Configurația simulării pentru parametrii din sidebar
+
+    Participarea și densitatea rămân fixe; conversia și acoperirea variază triunghiular ±40% în
+    jurul valorilor date.
+    """
+    return {
+        'participation_rate': {'type': 'fixed', 'value': participation_rate},
+        'population_density': {'type': 'fixed', 'value': population_density},
+        'conversion_rate': {
+            'type': 'triangular',
+            'low': conversion_rate * 0.6,
+            'mode': conversion_rate,
+            'high': min(conversion_rate * 1.4, 1.0)
+        },
+        'coverage_rate': {
+            'type': 'triangular',
+            'low': coverage_rate * 0.6,
+            'mode': coverage_rate,
+            'high': min(coverage_rate * 1.4, 1.0)
+        }
+    }
+
+
+def sample_parameter(spec: Dict, size: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Extrage `size` valori conform specificației unei distribuții
+
+    Args:
+        spec: Dict cu 'type' și parametrii distribuției (ex: {'type': 'uniform', 'low': 0.5, 'high': 0.75})
+        size: Numărul de valori
+        rng: Generatorul NumPy folosit
+
+    Returns:
+        Vector NumPy cu valorile extrase
+    """
+    kind = spec.get('type', 'fixed')
+    if kind == 'fixed':
+        return np.full(size, float(spec['value']))
+    if kind == 'uniform':
+        return rng.uniform(spec['low'], spec['high'], size)
+    if kind == 'triangular':
+        return rng.triangular(spec['low'], spec['mode'], spec['high'], size)
+    if kind == 'normal':
+        values = rng.normal(spec['mean'], spec['std'], size)
+        return np.clip(values, spec.get('low', -np.inf), spec.get('high', np.inf))
+    if kind == 'beta':
+        low, high = spec.get('low', 0.0), spec.get('high', 1.0)
+        return low + (high - low) * rng.beta(spec['a'], spec['b'], size)
+    raise ValueError(f"Tip de distribuție necunoscut: {kind}")
+
+
+def sample_distributions(
+    base_distribution: Sequence[float],
+    concentration: Optional[float],
+    size: int,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Extrage distribuții de servicii în jurul distribuției de bază (Dirichlet)
+
+    Serviciile cu procentaj 0 rămân la 0. Dacă `concentration` este None, distribuția nu variază.
+    """
+    base = np.asarray(base_distribution, dtype=np.float64)
+    base = base / base.sum() if base.sum() > 0 else base
+    if not concentration:
+        return np.broadcast_to(base, (size, base.size))
+
+    active = base > 0
+    draws = np.zeros((size, base.size))
+    gamma = rng.standard_gamma(concentration * base[active], size=(size, int(active.sum())))
+    draws[:, active] = gamma / gamma.sum(axis=1, keepdims=True)
+    return draws
+
+
+def run_monte_carlo(
+    scenario: str,
+    subscription_distribution: Dict[str, float],
+    config: Optional[Dict] = None,
+    trials: int = DEFAULT_TRIALS,
+    seed: Optional[int] = None,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    population_raster=None
+) -> Dict:
+    """
+    Rulează simularea Monte Carlo pentru un scenariu de ocupare
+
+    Args:
+        scenario: 'reduced', 'medium', sau 'high'
+        subscription_distribution: Distribuția de bază a serviciilor
+        config: Suprascrieri pentru DEFAULT_SIMULATION_CONFIG
+        trials: Numărul de încercări
+        seed: Seed pentru reproductibilitate
+        percentiles: Percentilele raportate
+        population_raster: Calea sau rasterul de populație (vezi population.py); raza campaniei
+            se calculează pe populația reală în locul densității uniforme
+
+    Returns:
+        Dict cu benzile de percentile pentru 'revenue', 'clients', 'radius_km',
+        probabilitatea de a atinge venitul dorit și vectorii brute ('draws')
+    """
+    settings = {**DEFAULT_SIMULATION_CONFIG, **(config or {})}
+    rng = np.random.default_rng(seed)
+    scenario_config = OCCUPANCY_SCENARIOS[scenario]
+
+    occupancy_spec = settings['occupancy']
+    if occupancy_spec.get('type') == 'scenario':
+        occupancy_spec = {'type': 'uniform', 'low': scenario_config['min'], 'high': scenario_config['max']}
+    occupancy = sample_parameter(occupancy_spec, trials, rng)
+
+    keys = list(subscription_distribution.keys())
+    distributions = sample_distributions(
+        [subscription_distribution[k] for k in keys],
+        settings['distribution_concentration'],
+        trials,
+        rng
+    )
+    conversion = sample_parameter(settings['conversion_rate'], trials, rng)
+    coverage = sample_parameter(settings['coverage_rate'], trials, rng)
+    participation = sample_parameter(settings['participation_rate'], trials, rng)
+    density = sample_parameter(settings['population_density'], trials, rng)
+
+    revenue_data = calculate_revenue_batch(occupancy, distributions, keys)
+    campaign = calculate_campaign_scale_batch(
+        revenue_data['total_clients'], participation, density, conversion, coverage,
+        population_raster=population_raster
+    )
+
+    draws = {
+        'occupancy': occupancy,
+        'conversion_rate': conversion,
+        'coverage_rate': coverage,
+        'revenue': revenue_data['total'],
+        'clients': revenue_data['total_clients'],
+        'radius_km': campaign['radius_km']
+    }
+
+    return {
+        'scenario': scenario_config['name'],
+        'trials': trials,
+        'percentiles': list(percentiles),
+        'revenue': _summarize(draws['revenue'], percentiles),
+        'clients': _summarize(draws['clients'], percentiles),
+        'radius_km': _summarize(draws['radius_km'], percentiles),
+        'prob_target_revenue': float(np.mean(draws['revenue'] >= DESIRED_MONTHLY_REVENUE)),
+        'draws': draws
+    }
+
+
+def _summarize(values: np.ndarray, percentiles: Sequence[float]) -> Dict[str, float]:
+    bands = np.percentile(values, percentiles)
+    summary = {f'p{p:g}': float(v) for p, v in zip(percentiles, bands)}
+    summary['mean'] = float(np.mean(values))
+    summary['std'] = float(np.std(values))
+    return summary
+
+
+def simulate_all_scenarios(
+    subscription_distribution: Dict[str, float],
+    config: Optional[Dict] = None,
+    trials: int = DEFAULT_TRIALS,
+    seed: Optional[int] = None,
+    scenarios: Optional[List[str]] = None,
+    population_raster=None
+) -> pd.DataFrame:
+    """
+    Rulează simularea pentru toate scenariile și returnează un DataFrame cu benzile P5/P50/P95
+    """
+    rows = []
+    for offset, scenario in enumerate(scenarios or list(OCCUPANCY_SCENARIOS.keys())):
+        result = run_monte_carlo(
+            scenario,
+            subscription_distribution,
+            config,
+            trials,
+            None if seed is None else seed + offset,
+            percentiles=(5, 50, 95),
+            population_raster=population_raster
+        )
+        rows.append({
+            'Scenariu': result['scenario'],
+            'Venit P5 (RON)': round(result['revenue']['p5']),
+            'Venit P50 (RON)': round(result['revenue']['p50']),
+            'Venit P95 (RON)': round(result['revenue']['p95']),
+            'Clienți P5': round(result['clients']['p5']),
+            'Clienți P50': round(result['clients']['p50']),
+            'Clienți P95': round(result['clients']['p95']),
+            'Raza P5 (km)': round(result['radius_km']['p5'], 2),
+            'Raza P50 (km)': round(result['radius_km']['p50'], 2),
+            'Raza P95 (km)': round(result['radius_km']['p95'], 2),
+            'Prob. Venit Dorit (%)': round(result['prob_target_revenue'] * 100, 1)
+        })
+    return pd.DataFrame(rows)
@@ -0,0 +1,432 @@
+"""
+Metrici social media actualizate incremental (snapshot-uri Instagram zilnice)
+
+`get_social_media_summary` parcurgea toți concurenții la fiecare randare. Aici agregatele
+(sume, numărători, medii, ferestre glisante) se actualizează la fiecare snapshot adăugat:
+un snapshot nou scade contribuția vechii valori a concurentului și o adaugă pe cea nouă, deci
+rezumatul este o citire O(categorii), iar tendințele nu recitesc istoricul.
+
+Valorile de pornire sunt cele din datele concurenților (social_media.instagram); snapshot-urile
+datate se adaugă într-un fișier JSON Lines (`data/social_snapshots.jsonl` sau variabila de mediu
+SOCIAL_SNAPSHOTS), câte unul pe linie:
+
+    {"date": "2026-10-01", "competitor_id": "redgym", "followers": 3550, "engagement_rate": 3.3, "posts_per_week": 4}
+
+La fiecare apel se citesc doar liniile adăugate de la apelul anterior. Liniile invalide (JSON
+greșit, concurent necunoscut, dată mai veche decât ultimul snapshot al concurentului) sunt
+ignorate și raportate în log.
+
+Ferestrele glisante se raportează la cea mai recentă dată din toate snapshot-urile, nu la data
+fiecărui concurent: un concurent fără snapshot-uri noi iese din fereastră odată cu trecerea
+timpului.
+
+Seria zilnică are, pentru fiecare dată, agregatul valorilor „la acea dată” (ultima valoare a
+fiecărui concurent cu data ≤ data punctului), deci nu depinde de ordinea în care liniile
+concurenților diferiți ajung în fișier.
+"""
+import copy
+import json
+import logging
+import os
+import threading
+from collections import deque
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from competitor_store import BASE_DIR, get_competitor_store, get_store_version
+
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(BASE_DIR, 'data', 'social_snapshots.jsonl')
+
+# Ferestrele glisante (zile) menținute pentru fiecare concurent și categorie
+ROLLING_WINDOWS_DAYS = (7, 30)
+
+_LOADED: Dict[str, Dict] = {}
+_LOCK = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+def get_snapshot_path() -> str:
+    """Calea fișierului cu snapshot-uri (variabila de mediu SOCIAL_SNAPSHOTS are prioritate)"""
+    return os.environ.get('SOCIAL_SNAPSHOTS', DEFAULT_SNAPSHOT_PATH)
+
+
+def _empty_aggregate() -> Dict:
+    return {
+        'total_followers': 0,
+        'competitors_count': 0,
+        'engagement_sum': 0.0,
+        'engagement_count': 0,
+        'posts_sum': 0.0,
+        'posts_count': 0
+    }
+
+
+def _empty_window() -> Dict:
+    return {
+        'followers_growth': 0,
+        'engagement_sum': 0.0,
+        'engagement_count': 0,
+        'posts_sum': 0.0,
+        'posts_count': 0
+    }
+
+
+def _add_values(aggregate: Dict, values: Dict, sign: int) -> None:
+    # Aceleași reguli ca rezumatul inițial: valorile 0 nu intră în medii
+    aggregate['total_followers'] += sign * values['followers']
+    aggregate['competitors_count'] += sign
+    if values['engagement_rate'] > 0:
+        aggregate['engagement_sum'] += sign * values['engagement_rate']
+        aggregate['engagement_count'] += sign
+    if values['posts_per_week'] > 0:
+        aggregate['posts_sum'] += sign * values['posts_per_week']
+        aggregate['posts_count'] += sign
+
+
+def _add_window(aggregate: Dict, window: Dict, sign: int) -> None:
+    entries = window['entries']
+    if not entries:
+        return
+    aggregate['followers_growth'] += sign * (entries[-1][1]['followers'] - entries[0][1]['followers'])
+    for key in ('engagement_sum', 'engagement_count', 'posts_sum', 'posts_count'):
+        aggregate[key] += sign * window[key]
+
+
+def _expire_window(window: Dict, current_day: int, days: int) -> None:
+    entries = window['entries']
+    while entries and entries[0][0] <= current_day - days:
+        _, expired = entries.popleft()
+        _add_values(window, expired, -1)
+
+
+def _push_window(window: Dict, day: int, values: Dict, days: int, current_day: int) -> None:
+    # Deque ordonat după zi, cu sume curente; fiecare intrare se adaugă și se scoate o singură dată
+    entries = window['entries']
+    if entries and entries[-1][0] == day:
+        _, replaced = entries.pop()
+        _add_values(window, replaced, -1)
+    entries.append((day, values))
+    _add_values(window, values, 1)
+    _expire_window(window, current_day, days)
+
+
+def _expire_competitors(store: Dict, current_day: int) -> None:
+    # Data cea mai recentă a avansat: ferestrele tuturor concurenților scot intrările prea vechi
+    for competitor in store['competitors'].values():
+        for days, window in competitor['windows'].items():
+            entries = window['entries']
+            if entries and entries[0][0] <= current_day - days:
+                category_window = store['windows'][competitor['category']][days]
+                _add_window(category_window, window, -1)
+                _expire_window(window, current_day, days)
+                _add_window(category_window, window, 1)
+
+
+def _series_point(store: Dict, category: str, day_iso: str) -> None:
+    # Punct nou: agregatul la data anterioară cea mai apropiată (seria rămâne sortată după dată)
+    series = store['series'][category]
+    if day_iso in series:
+        return
+    if not series or day_iso > next(reversed(series)):
+        earlier = series[next(reversed(series))] if series else store['series_base'][category]
+        series[day_iso] = dict(earlier)
+        return
+    # Dată mai veche decât ultimul punct (linie întârziată): rar, seria se reordonează
+    earlier = store['series_base'][category]
+    for point_date, aggregate in series.items():
+        if point_date > day_iso:
+            break
+        earlier = aggregate
+    points = sorted([*series.items(), (day_iso, dict(earlier))])
+    series.clear()
+    series.update(points)
+
+
+def _add_series(series: Dict, values: Dict, sign: int, since: Optional[str]) -> None:
+    # Contribuția unui concurent la punctele de la `since` încolo (toate, dacă since este None)
+    for point_date in reversed(series):
+        if since is not None and point_date < since:
+            break
+        _add_values(series[point_date], values, sign)
+
+
+def _shift_series(store: Dict, competitor: Dict, category: str, values: Dict, since: Optional[str]) -> None:
+    # Înlocuiește contribuția concurentului la serie începând cu data `since`; la schimbarea
+    # categoriei și vechea categorie primește un punct la acea dată (concurentul iese din ea)
+    previous = competitor['series_values']
+    if since is not None:
+        if previous is not None:
+            _series_point(store, previous[0], since)
+        _series_point(store, category, since)
+    if since is None:
+        if previous is not None:
+            _add_values(store['series_base'][previous[0]], previous[1], -1)
+        _add_values(store['series_base'][category], values, 1)
+    if previous is not None:
+        _add_series(store['series'][previous[0]], previous[1], -1, since)
+    _add_series(store['series'][category], values, 1, since)
+    competitor['series_values'] = (category, values)
+
+
+def _mean(total: float, count: int) -> float:
+    return total / count if count else 0
+
+
+def _normalize_values(values: Dict) -> Dict:
+    # Conversia aruncă ValueError/TypeError pentru valori nenumerice, înainte de orice modificare
+    return {
+        'followers': int(values.get('followers', 0) or 0),
+        'engagement_rate': float(values.get('engagement_rate', 0) or 0),
+        'posts_per_week': float(values.get('posts_per_week', 0) or 0)
+    }
+
+
+def new_metrics_store(categories: Iterable[str] = ()) -> Dict:
+    """
+    Un depozit de metrici gol, cu câte un agregat pentru fiecare categorie dată
+
+    Returns:
+        Dict cu 'latest' (id → ultimele valori), 'categories' (agregate curente), 'competitors'
+        (ferestrele glisante per concurent), 'windows' (ferestrele per categorie), 'series'
+        (categorie → {dată ISO: agregatul la acea dată}), 'series_base' (agregatul valorilor fără
+        dată, valabil înaintea primului punct), 'last_day' (cea mai recentă zi, ordinal) și 'snapshots_count'
+    """
+    store = {
+        'latest': {},
+        'competitors': {},
+        'categories': {},
+        'windows': {},
+        'series': {},
+        'series_base': {},
+        'last_day': None,
+        'snapshots_count': 0
+    }
+    for category in categories:
+        _ensure_category(store, category)
+    return store
+
+
+def _ensure_category(store: Dict, category: str) -> None:
+    if category not in store['categories']:
+        store['categories'][category] = _empty_aggregate()
+        store['windows'][category] = {days: _empty_window() for days in ROLLING_WINDOWS_DAYS}
+        store['series'][category] = {}
+        store['series_base'][category] = _empty_aggregate()
+
+
+def apply_snapshot(store: Dict, snapshot: Dict) -> None:
+    """
+    Adaugă un snapshot și actualizează agregatele în O(ferestre); când data cea mai recentă
+    avansează, ferestrele celorlalți concurenți se actualizează o dată, în O(concurenți)
+
+    Args:
+        snapshot: Dict cu 'competitor_id', 'category' și valorile 'followers', 'engagement_rate',
+            'posts_per_week'; 'date' (ISO) este opțională - fără dată snapshot-ul actualizează
+            doar valorile curente, nu și ferestrele; în serie contează pentru toate datele doar
+            dacă concurentul nu are încă snapshot-uri datate
+
+    Raises:
+        ValueError: Snapshot datat mai vechi decât ultimul snapshot datat al concurentului
+    """
+    competitor_id = snapshot['competitor_id']
+    category = snapshot['category']
+    values = _normalize_values(snapshot)
+    day = date.fromisoformat(snapshot['date']).toordinal() if snapshot.get('date') else None
+    _ensure_category(store, category)
+
+    competitor = store['competitors'].setdefault(competitor_id, {
+        'category': category,
+        'last_day': None,
+        'series_values': None,
+        'windows': {days: {**_empty_aggregate(), 'entries': deque()} for days in ROLLING_WINDOWS_DAYS}
+    })
+    if day is not None and competitor['last_day'] is not None and day < competitor['last_day']:
+        raise ValueError(f"Snapshot-ul din {snapshot['date']} pentru '{competitor_id}' este mai vechi decât ultimul înregistrat")
+
+    # Valoarea curentă: se scade contribuția veche (din categoria veche) și se adaugă cea nouă
+    previous = store['latest'].get(competitor_id)
+    if previous is not None:
+        _add_values(store['categories'][previous['category']], previous['values'], -1)
+    _add_values(store['categories'][category], values, 1)
+    store['latest'][competitor_id] = {'category': category, 'values': values, 'date': snapshot.get('date')}
+    store['snapshots_count'] += 1
+
+    if day is None:
+        if competitor['last_day'] is None:
+            _shift_series(store, competitor, category, values, None)
+        return
+    competitor['last_day'] = day
+    if store['last_day'] is None or day > store['last_day']:
+        store['last_day'] = day
+        _expire_competitors(store, day)
+    for days, window in competitor['windows'].items():
+        _add_window(store['windows'][competitor['category']][days], window, -1)
+        _push_window(window, day, values, days, store['last_day'])
+        _add_window(store['windows'][category][days], window, 1)
+    competitor['category'] = category
+
+    # Snapshot-ul contează pentru data lui și pentru toate punctele ulterioare ale seriei
+    _shift_series(store, competitor, category, values, date.fromordinal(day).isoformat())
+
+
+def metrics_summary(store: Dict) -> Dict:
+    """
+    Rezumatul curent (același format ca `get_social_media_summary`), citit din agregate în O(categorii)
+    """
+    summary = {
+        'total_followers': 0,
+        'total_competitors_with_instagram': 0,
+        'avg_engagement_rate': 0,
+        'avg_posts_per_week': 0,
+        'by_category': {}
+    }
+    engagement_sum = posts_sum = 0.0
+    engagement_count = posts_count = 0
+    for category, aggregate in store['categories'].items():
+        summary['by_category'][category] = {
+            'total_followers': aggregate['total_followers'],
+            'competitors_count': aggregate['competitors_count'],
+            'avg_engagement': _mean(aggregate['engagement_sum'], aggregate['engagement_count']),
+            'avg_posts': _mean(aggregate['posts_sum'], aggregate['posts_count'])
+        }
+        summary['total_followers'] += aggregate['total_followers']
+        summary['total_competitors_with_instagram'] += aggregate['competitors_count']
+        engagement_sum += aggregate['engagement_sum']
+        engagement_count += aggregate['engagement_count']
+        posts_sum += aggregate['posts_sum']
+        posts_count += aggregate['posts_count']
+
+    summary['avg_engagement_rate'] = _mean(engagement_sum, engagement_count)
+    summary['avg_posts_per_week'] = _mean(posts_sum, posts_count)
+    return summary
+
+
+def metrics_trends(store: Dict, window_days: int = ROLLING_WINDOWS_DAYS[0]) -> Dict[str, Dict]:
+    """
+    Tendințele pe categorii: fereastra glisantă cerută și seria zilnică a valorilor agregate
+
+    Fereastra cuprinde ultimele `window_days` zile până la cea mai recentă dată din toate
+    snapshot-urile ('last_day' al depozitului).
+
+    Returns:
+        Dict categorie → {'followers_growth', 'avg_engagement', 'avg_posts' (pe fereastră),
+        'series' (listă de rezumate zilnice, ordonate după dată)}
+    """
+    if window_days not in ROLLING_WINDOWS_DAYS:
+        raise ValueError(f"Fereastra de {window_days} zile nu este menținută (disponibile: {ROLLING_WINDOWS_DAYS})")
+    trends = {}
+    for category, windows in store['windows'].items():
+        window = windows[window_days]
+        trends[category] = {
+            'followers_growth': window['followers_growth'],
+            'avg_engagement': _mean(window['engagement_sum'], window['engagement_count']),
+            'avg_posts': _mean(window['posts_sum'], window['posts_count']),
+            'series': [
+                {
+                    'date': day,
+                    'total_followers': aggregate['total_followers'],
+                    'competitors_count': aggregate['competitors_count'],
+                    'avg_engagement': _mean(aggregate['engagement_sum'], aggregate['engagement_count']),
+                    'avg_posts': _mean(aggregate['posts_sum'], aggregate['posts_count'])
+                }
+                for day, aggregate in store['series'][category].items()
+            ]
+        }
+    return trends
+
+
+def _baseline_store() -> Dict:
+    competitor_store = get_competitor_store()
+    store = new_metrics_store(competitor_store['extended'])
+    for category, competitor in competitor_store['with_instagram']:
+        apply_snapshot(store, {
+            'competitor_id': competitor.get('id') or competitor['name'],
+            'category': category,
+            **competitor['social_media']['instagram']
+        })
+    return store
+
+
+def _read_new_snapshots(state: Dict, path: str) -> None:
+    # Se citesc doar liniile complete adăugate după ultimul offset
+    with open(path, 'rb') as snapshot_file:
+        snapshot_file.seek(state['offset'])
+        for line in snapshot_file:
+            if not line.endswith(b'\n'):
+                break
+            state['offset'] += len(line)
+            if not line.strip():
+                continue
+            # O linie invalidă nu oprește citirea celorlalte (și nici randarea dashboard-ului)
+            try:
+                snapshot = json.loads(line)
+                if not snapshot.get('category'):
+                    snapshot['category'] = state['category_of'][snapshot['competitor_id']]
+                apply_snapshot(state['store'], snapshot)
+            except (ValueError, KeyError, TypeError, AttributeError) as error:
+                logger.warning("Snapshot ignorat în %s (octetul %d): %r", path, state['offset'] - len(line), error)
+
+
+def _current_state() -> Dict:
+    # Se apelează doar sub _LOCK
+    path = os.path.abspath(get_snapshot_path())
+    competitor_version = get_store_version()
+    size = os.path.getsize(path) if os.path.exists(path) else 0
+    state = _LOADED.get(path)
+    if state is None or state['competitor_version'] != competitor_version or size < state['offset']:
+        state = {
+            'store': _baseline_store(),
+            'offset': 0,
+            'competitor_version': competitor_version,
+            'category_of': get_competitor_store()['category_of']
+        }
+        _LOADED[path] = state
+    if size > state['offset']:
+        _read_new_snapshots(state, path)
+    return state
+
+
+def read_social_metrics(reader: Callable[..., T], *args) -> T:
+    """
+    Aplică `reader(store, *args)` pe depozitul curent, sub lacăt (fără copierea depozitului)
+
+    Depozitul se reconstruiește doar când se schimbă datele concurenților sau fișierul de
+    snapshot-uri este rescris (devine mai mic); altfel se aplică numai snapshot-urile noi.
+    `reader` trebuie să returneze valori noi, nu referințe în depozit (ex: `metrics_summary`).
+    """
+    with _LOCK:
+        return reader(_current_state()['store'], *args)
+
+
+def get_social_metrics_store() -> Dict:
+    """
+    O copie a depozitului de metrici curent: valorile din datele concurenților plus snapshot-urile
+    din fișier
+
+    Copia este făcută sub lacăt, deci nu se modifică dacă alt apel aplică între timp snapshot-uri
+    noi. Pentru citiri repetate (rezumat, tendințe) `read_social_metrics` evită copierea.
+    """
+    return read_social_metrics(copy.deepcopy)
+
+
+def get_social_metrics_version() -> Tuple[Tuple[str, int, int], str, int]:
+    """
+    Versiunea datelor din spatele metricilor: versiunea datelor concurenților, fișierul de
+    snapshot-uri și dimensiunea lui (crește la fiecare snapshot adăugat)
+    """
+    path = os.path.abspath(get_snapshot_path())
+    return get_store_version(), path, os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def append_snapshots(snapshots: List[Dict], path: Optional[str] = None) -> None:
+    """
+    Adaugă snapshot-uri la sfârșitul fișierului JSON Lines (preluate la următorul apel)
+    """
+    path = path or get_snapshot_path()
+    lines = ''.join(json.dumps(snapshot, ensure_ascii=False) + '\n' for snapshot in snapshots)
+    with open(path, 'a', encoding='utf-8') as snapshot_file:
+        snapshot_file.write(lines)
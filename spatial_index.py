@@ -0,0 +1,285 @@
+"""
+Index spațial (KD-tree) peste locațiile concurenților
+
+`get_all_competitor_locations` aplatizează toate locațiile la fiecare apel, iar interogările de tip
+"concurenți în raza r" se făceau parcurgând lista. Aici construim o singură dată un KD-tree pe
+coordonatele proiectate local (km) ale tuturor locațiilor din EXTENDED_COMPETITOR_DATA, plus câte
+un arbore per categorie, și îl refolosim între rerun-uri până la modificarea fișierului de date.
+Proiecția servește doar la împărțirea arborelui; ramurile se elimină cu o margine inferioară
+Haversine a dreptunghiului lat/lon al nodului, deci rezultatele sunt exacte la orice întindere
+(oraș, regiune, țară).
+"""
+import heapq
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from competitor_analysis import get_all_competitor_locations
+from competitor_store import get_store_version
+from geo import EARTH_RADIUS_KM, KM_PER_DEGREE_LAT, haversine_distance, km_per_degree_lon
+
+
+LEAF_SIZE = 16
+
+DEFAULT_DENSITY_RADIUS_KM = 1.0
+
+# Toleranța (km) scăzută din marginea inferioară: punctele aflate exact la distanța căutată nu sunt
+# eliminate din cauza erorilor de rotunjire
+_BOUND_TOLERANCE_KM = 1e-9
+
+
+def _project(index: Dict, lat, lon) -> Tuple[np.ndarray, np.ndarray]:
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    return (lon - index['origin'][1]) * index['lon_scale'], (lat - index['origin'][0]) * KM_PER_DEGREE_LAT
+
+
+def build_spatial_index(lat, lon, leaf_size: int = LEAF_SIZE) -> Dict:
+    """
+    Construiește un KD-tree static peste puncte geografice
+
+    Nodurile sunt păstrate în vectori: fiecare nod acoperă intervalul [start, end) din permutarea
+    'order' și are un dreptunghi de încadrare în grade (lat_min, lon_min, lat_max, lon_max) folosit
+    la tăierea ramurilor.
+
+    Returns:
+        Dict cu 'lat', 'lon', 'x', 'y', 'order' și vectorii nodurilor ('start', 'end', 'left',
+        'right', 'bbox', 'geo_bbox'); 'left' = -1 pentru frunze
+    """
+    lat = np.asarray(lat, dtype=np.float64).ravel()
+    lon = np.asarray(lon, dtype=np.float64).ravel()
+    origin = (float(lat.mean()), float(lon.mean())) if len(lat) else (0.0, 0.0)
+    index = {'lat': lat, 'lon': lon, 'origin': origin, 'lon_scale': km_per_degree_lon(origin[0])}
+    x, y = _project(index, lat, lon)
+    order = np.arange(len(lat))
+    nodes = {'start': [], 'end': [], 'left': [], 'right': [], 'bbox': [], 'geo_bbox': []}
+
+    def _split(start: int, end: int) -> int:
+        node = len(nodes['start'])
+        members = order[start:end]
+        for key, value in (('start', start), ('end', end), ('left', -1), ('right', -1)):
+            nodes[key].append(value)
+        nodes['bbox'].append((x[members].min(), y[members].min(), x[members].max(), y[members].max()) if end > start else (0, 0, 0, 0))
+        nodes['geo_bbox'].append((lat[members].min(), lon[members].min(), lat[members].max(), lon[members].max()) if end > start else (0, 0, 0, 0))
+
+        if end - start > leaf_size:
+            # Împărțim după axa cu întinderea mai mare, la mediană
+            x_min, y_min, x_max, y_max = nodes['bbox'][node]
+            coords = x if x_max - x_min >= y_max - y_min else y
+            order[start:end] = members[np.argsort(coords[members], kind='stable')]
+            middle = (start + end) // 2
+            nodes['left'][node] = _split(start, middle)
+            nodes['right'][node] = _split(middle, end)
+        return node
+
+    _split(0, len(lat))
+    index.update({
+        'x': x,
+        'y': y,
+        'order': order,
+        'start': np.array(nodes['start']),
+        'end': np.array(nodes['end']),
+        'left': np.array(nodes['left']),
+        'right': np.array(nodes['right']),
+        'bbox': np.array(nodes['bbox'], dtype=np.float64).reshape(-1, 4),
+        'geo_bbox': np.array(nodes['geo_bbox'], dtype=np.float64).reshape(-1, 4)
+    })
+    for value in index.values():
+        if isinstance(value, np.ndarray):
+            value.setflags(write=False)
+    return index
+
+
+def _lower_bound_km(geo_bbox: np.ndarray, lat, lon) -> np.ndarray:
+    # Margine inferioară a distanței Haversine de la punct(e) la un dreptunghi lat/lon; 0 în interior.
+    # hav(d) = hav(Δφ) + cos φ1 · cos φ2 · hav(Δλ), iar fiecare termen este cel puțin valoarea lui
+    # pentru cea mai mică diferență de latitudine/longitudine și cel mai mic cos φ2 din dreptunghi.
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    dlat = np.radians(np.maximum(np.maximum(geo_bbox[..., 0] - lat, 0), lat - geo_bbox[..., 2]))
+    dlon = np.radians(np.minimum(np.maximum(np.maximum(geo_bbox[..., 1] - lon, 0), lon - geo_bbox[..., 3]), 180))
+    min_cos = np.minimum(np.cos(np.radians(geo_bbox[..., 0])), np.cos(np.radians(geo_bbox[..., 2])))
+    a = np.sin(dlat / 2) ** 2 + np.cos(np.radians(lat)) * np.maximum(min_cos, 0) * np.sin(dlon / 2) ** 2
+    return np.maximum(EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(np.clip(a, 0, 1))) - _BOUND_TOLERANCE_KM, 0)
+
+
+def query_radius(index: Dict, lat: float, lon: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Punctele aflate la cel mult `radius_km` de (lat, lon)
+
+    Returns:
+        (indici în ordinea originală a punctelor, distanțe Haversine în km), sortate după distanță
+    """
+    if len(index['lat']) == 0:
+        return np.array([], dtype=np.int64), np.array([])
+    candidates = []
+    stack = [0]
+    while stack:
+        node = stack.pop()
+        if _lower_bound_km(index['geo_bbox'][node], lat, lon) > radius_km:
+            continue
+        if index['left'][node] < 0:
+            candidates.append(index['order'][index['start'][node]:index['end'][node]])
+        else:
+            stack.extend((index['left'][node], index['right'][node]))
+
+    found = np.concatenate(candidates) if candidates else np.array([], dtype=np.int64)
+    distances = haversine_distance(lat, lon, index['lat'][found], index['lon'][found])
+    inside = distances <= radius_km
+    found, distances = found[inside], distances[inside]
+    ranking = np.argsort(distances, kind='stable')
+    return found[ranking], distances[ranking]
+
+
+def query_nearest(index: Dict, lat: float, lon: float, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cele mai apropiate `k` puncte de (lat, lon) (căutare best-first în arbore)
+
+    Returns:
+        (indici în ordinea originală a punctelor, distanțe Haversine în km), sortate după distanță
+    """
+    k = min(int(k), len(index['lat']))
+    if k <= 0:
+        return np.array([], dtype=np.int64), np.array([])
+    best: List[float] = []  # max-heap (distanță negativă) cu cele mai mici k distanțe Haversine
+    visited = []
+    queue = [(0.0, 0)]
+    while queue:
+        bound, node = heapq.heappop(queue)
+        if len(best) == k and bound > -best[0]:
+            break
+        if index['left'][node] < 0:
+            members = index['order'][index['start'][node]:index['end'][node]]
+            distances = haversine_distance(lat, lon, index['lat'][members], index['lon'][members])
+            visited.append((members, distances))
+            for distance in distances:
+                if len(best) < k:
+                    heapq.heappush(best, -distance)
+                elif distance < -best[0]:
+                    heapq.heappushpop(best, -distance)
+        else:
+            for child in (index['left'][node], index['right'][node]):
+                heapq.heappush(queue, (float(_lower_bound_km(index['geo_bbox'][child], lat, lon)), int(child)))
+
+    members = np.concatenate([m for m, _ in visited])
+    distances = np.concatenate([d for _, d in visited])
+    ranking = np.argsort(distances, kind='stable')[:k]
+    return members[ranking], distances[ranking]
+
+
+def count_within_radius(index: Dict, lat, lon, radius_km: float, weights=None) -> Dict[str, np.ndarray]:
+    """
+    Numărul de puncte (și suma ponderilor) în raza dată pentru fiecare punct de interogare
+
+    Parcurge frunzele arborelui, vectorizat pe toate interogările: pentru fiecare frunză se calculează
+    distanțe exacte doar pentru interogările al căror cerc atinge dreptunghiul frunzei.
+
+    Returns:
+        Dict cu 'count' și 'weight' (vectori de lungimea interogărilor)
+    """
+    lat = np.asarray(lat, dtype=np.float64).ravel()
+    lon = np.asarray(lon, dtype=np.float64).ravel()
+    weights = np.ones(len(index['lat'])) if weights is None else np.asarray(weights, dtype=np.float64)
+    count = np.zeros(len(lat), dtype=np.int64)
+    weight = np.zeros(len(lat))
+    if len(index['lat']) == 0 or len(lat) == 0:
+        return {'count': count, 'weight': weight}
+
+    for node in np.flatnonzero(index['left'] < 0):
+        near = np.flatnonzero(_lower_bound_km(index['geo_bbox'][node], lat, lon) <= radius_km)
+        if len(near) == 0:
+            continue
+        members = index['order'][index['start'][node]:index['end'][node]]
+        inside = haversine_distance(
+            lat[near, None], lon[near, None], index['lat'][members], index['lon'][members]
+        ) <= radius_km
+        count[near] += inside.sum(axis=1)
+        weight[near] += inside @ weights[members]
+    return {'count': count, 'weight': weight}
+
+
+@lru_cache(maxsize=1)
+def _competitor_index(store_version: Tuple[str, int, int]) -> Dict:
+    locations = [loc for loc in get_all_competitor_locations() if loc.get('coordinates')]
+    coordinates = np.array([loc['coordinates'] for loc in locations], dtype=np.float64).reshape(-1, 2)
+    capacity = np.array([loc.get('capacity', 0) or 0 for loc in locations], dtype=np.float64)
+    categories = np.array([loc['category_key'] for loc in locations], dtype=object)
+
+    by_category = {}
+    for category in dict.fromkeys(categories):
+        members = np.flatnonzero(categories == category)
+        by_category[category] = (members, build_spatial_index(coordinates[members, 0], coordinates[members, 1]))
+
+    return {
+        'locations': locations,
+        'capacity': capacity,
+        'all': build_spatial_index(coordinates[:, 0], coordinates[:, 1]),
+        'by_category': by_category
+    }
+
+
+def get_competitor_index() -> Dict:
+    """
+    Indexul spațial al tuturor locațiilor concurenților (reconstruit doar când se schimbă datele concurenților)
+
+    Returns:
+        Dict cu 'locations' (lista din `get_all_competitor_locations`, doar cele cu coordonate),
+        'capacity', 'all' (arborele global) și 'by_category' {cheie categorie: (indici, arbore)}
+    """
+    return _competitor_index(get_store_version())
+
+
+def _resolve(category: Optional[str]) -> Tuple[Dict, Optional[np.ndarray], Dict]:
+    competitor_index = get_competitor_index()
+    if category is None:
+        return competitor_index, None, competitor_index['all']
+    if category not in competitor_index['by_category']:
+        return competitor_index, np.array([], dtype=np.int64), build_spatial_index([], [])
+    members, tree = competitor_index['by_category'][category]
+    return competitor_index, members, tree
+
+
+def _to_records(competitor_index: Dict, members: Optional[np.ndarray], found: np.ndarray, distances: np.ndarray) -> List[Dict]:
+    positions = found if members is None else members[found]
+    return [
+        {**competitor_index['locations'][position], 'distance_km': float(distance)}
+        for position, distance in zip(positions, distances)
+    ]
+
+
+def competitors_within(lat: float, lon: float, radius_km: float, category: Optional[str] = None) -> List[Dict]:
+    """
+    Locațiile concurenților aflate la cel mult `radius_km` km, sortate după distanță
+
+    Args:
+        category: Cheia categoriei ('fitness', 'kineto', 'masaj', 'terapii') sau None pentru toate
+    """
+    competitor_index, members, tree = _resolve(category)
+    return _to_records(competitor_index, members, *query_radius(tree, lat, lon, radius_km))
+
+
+def nearest_competitors(lat: float, lon: float, k: int = 3, category: Optional[str] = None) -> List[Dict]:
+    """
+    Cele mai apropiate `k` locații ale concurenților (opțional dintr-o singură categorie)
+    """
+    competitor_index, members, tree = _resolve(category)
+    return _to_records(competitor_index, members, *query_nearest(tree, lat, lon, k))
+
+
+def competitor_density_per_block(
+    lat,
+    lon,
+    radius_km: float = DEFAULT_DENSITY_RADIUS_KM,
+    category: Optional[str] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Numărul de locații concurente și capacitatea lor simultană în raza dată de fiecare bloc
+
+    Returns:
+        Dict cu 'count' și 'capacity' (vectori de lungimea blocurilor)
+    """
+    competitor_index, members, tree = _resolve(category)
+    capacity = competitor_index['capacity'] if members is None else competitor_index['capacity'][members]
+    density = count_within_radius(tree, lat, lon, radius_km, weights=capacity)
+    return {'count': density['count'], 'capacity': density['weight']}